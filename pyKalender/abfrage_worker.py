@@ -0,0 +1,234 @@
+# abfrage_worker.py
+"""
+Dieses Modul definiert den `AbfrageWorker`, der Datenbankabfragen in einem eigenen Thread ausführt.
+
+Der Worker öffnet eine eigene SQLite-Verbindung zur Datenbankdatei und arbeitet die
+Aufträge nacheinander ab. Die Ergebnisse werden stapelweise mit `wx.CallAfter` an den
+Hauptthread übergeben, sodass die Oberfläche während langer Abfragen bedienbar bleibt
+und Listen schon während des Ladens gefüllt werden können.
+"""
+
+import queue
+import sqlite3
+import threading
+from time import perf_counter
+
+import wx
+
+import datenbank
+import messung
+
+
+class AbfrageAuftrag:
+    """
+    Ein einzelner Abfrageauftrag für den `AbfrageWorker`.
+
+    Nach dem Abbrechen werden keine Rückrufe mehr an den Hauptthread übergeben.
+
+    Attributes:
+        sql (str): Die SQL-Abfrage.
+        parameter (tuple): Die Parameter der Abfrage.
+        stapelgroesse (int): Die Anzahl der Zeilen pro Stapel.
+        anzahl (int): Die Anzahl der bisher gelieferten Zeilen.
+    """
+
+    def __init__(self, sql, parameter, bei_stapel, bei_ende, bei_fehler, stapelgroesse):
+        """
+        Initialisiert den Auftrag.
+
+        Args:
+            sql (str): Die SQL-Abfrage.
+            parameter (tuple): Die Parameter der Abfrage.
+            bei_stapel (callable): Rückruf `bei_stapel(zeilen)` für jeden geladenen Stapel.
+            bei_ende (callable): Rückruf `bei_ende(anzahl)` nach dem letzten Stapel.
+            bei_fehler (callable): Rückruf `bei_fehler(fehler)` bei einem Datenbankfehler.
+            stapelgroesse (int): Die Anzahl der Zeilen pro Stapel.
+        """
+
+        self.sql = sql
+        self.parameter = parameter
+        self.bei_stapel = bei_stapel
+        self.bei_ende = bei_ende
+        self.bei_fehler = bei_fehler
+        self.stapelgroesse = stapelgroesse
+        self.anzahl = 0
+        self.abgebrochen = threading.Event()
+
+    def ist_abgebrochen(self):
+        """Liefert True, wenn der Auftrag abgebrochen wurde."""
+
+        return self.abgebrochen.is_set()
+
+    def _liefere(self, callback, *args):
+        """Ruft einen Rückruf im Hauptthread auf, sofern der Auftrag nicht abgebrochen wurde."""
+
+        if callback is not None and not self.ist_abgebrochen():
+            callback(*args)
+
+
+class AbfrageWorker(threading.Thread):
+    """
+    Ein Hintergrund-Thread mit eigener Datenbankverbindung für lang laufende Abfragen.
+
+    Attributes:
+        db_datei (str): Der Pfad zur SQLite-Datenbankdatei.
+        db_conn (sqlite3.Connection): Die Verbindung des Workers; nur im Worker-Thread verwendet.
+        fehler (sqlite3.Error): Der Fehler beim Öffnen der Verbindung oder None; danach
+            erhalten alle Aufträge sofort `bei_fehler`.
+    """
+
+    def __init__(self, db_datei):
+        """
+        Initialisiert den Worker und startet den Thread.
+
+        Args:
+            db_datei (str): Der Pfad zur SQLite-Datenbankdatei.
+        """
+
+        super().__init__(daemon=True)
+        self.db_datei = db_datei
+        self.db_conn = None
+        self.auftraege = queue.Queue()
+        self.aktueller_auftrag = None
+        self.fehler = None
+        # Schützt `aktueller_auftrag` zusammen mit `interrupt`, damit ein Abbruch nicht den
+        # nächsten Auftrag trifft, den der Worker gerade beginnt
+        self.sperre = threading.Lock()
+        self.start()
+
+    def ausfuehren(self, sql, parameter=(), bei_stapel=None, bei_ende=None, bei_fehler=None, stapelgroesse=1000):
+        """
+        Reiht eine Abfrage zur Ausführung im Hintergrund ein.
+
+        Args:
+            sql (str): Die SQL-Abfrage.
+            parameter (tuple): Die Parameter der Abfrage.
+            bei_stapel (callable): Rückruf `bei_stapel(zeilen)` für jeden geladenen Stapel.
+            bei_ende (callable): Rückruf `bei_ende(anzahl)` nach dem letzten Stapel.
+            bei_fehler (callable): Rückruf `bei_fehler(fehler)` bei einem Datenbankfehler.
+            stapelgroesse (int): Die Anzahl der Zeilen pro Stapel.
+
+        Returns:
+            AbfrageAuftrag: Der Auftrag, z. B. zum Abbrechen.
+        """
+
+        auftrag = AbfrageAuftrag(sql, parameter, bei_stapel, bei_ende, bei_fehler, stapelgroesse)
+        with self.sperre:
+            if self.fehler is None:
+                self.auftraege.put(auftrag)
+                return auftrag
+        wx.CallAfter(auftrag._liefere, auftrag.bei_fehler, self.fehler)
+        return auftrag
+
+    def abbrechen(self, auftrag):
+        """
+        Bricht einen Auftrag ab.
+
+        Läuft der Auftrag gerade, wird die laufende SQLite-Anweisung unterbrochen.
+
+        Args:
+            auftrag (AbfrageAuftrag): Der abzubrechende Auftrag.
+        """
+
+        auftrag.abgebrochen.set()
+        with self.sperre:
+            if self.aktueller_auftrag is auftrag and self.db_conn is not None:
+                self.db_conn.interrupt()
+
+    def beenden(self):
+        """Bricht den laufenden Auftrag ab und beendet den Thread nach dem Abarbeiten der Warteschlange."""
+
+        auftrag = self.aktueller_auftrag
+        if auftrag is not None:
+            self.abbrechen(auftrag)
+        self.auftraege.put(None)
+
+    def run(self):
+        """Arbeitet die Aufträge im Worker-Thread ab."""
+
+        try:
+            self.db_conn = datenbank.verbinde(self.db_datei)
+        except sqlite3.Error as e:
+            self._verwerfe_auftraege(e)
+            return
+        verfolgt = False
+        try:
+            while True:
+                auftrag = self.auftraege.get()
+                if auftrag is None:
+                    break
+                if auftrag.ist_abgebrochen():
+                    continue
+                # Die SQL-Messung wird in der Oberfläche umgeschaltet und hier übernommen,
+                # da die Rückrufe im Thread der Verbindung gesetzt werden müssen
+                if verfolgt != messung.sql_verfolgung:
+                    verfolgt = messung.sql_verfolgung
+                    messung.verfolge(self.db_conn, verfolgt)
+                with self.sperre:
+                    self.aktueller_auftrag = auftrag
+                self._bearbeite(auftrag)
+                with self.sperre:
+                    self.aktueller_auftrag = None
+        finally:
+            if verfolgt:
+                messung.verfolge(self.db_conn, False)
+            self.db_conn.close()
+
+    def _verwerfe_auftraege(self, fehler):
+        """
+        Meldet den Fehler beim Öffnen der Verbindung an alle wartenden und künftigen Aufträge.
+
+        Ohne Verbindung kann kein Auftrag ausgeführt werden; statt dass die Oberfläche
+        endlos auf Ergebnisse wartet, erhält jeder Auftrag sofort `bei_fehler`.
+        """
+
+        with self.sperre:
+            self.fehler = fehler
+        while True:
+            try:
+                auftrag = self.auftraege.get_nowait()
+            except queue.Empty:
+                break
+            if auftrag is not None:
+                wx.CallAfter(auftrag._liefere, auftrag.bei_fehler, fehler)
+
+    def _bearbeite(self, auftrag):
+        """
+        Führt einen Auftrag aus und liefert die Ergebnisse stapelweise an den Hauptthread.
+
+        Wird die Anweisung unterbrochen, ohne dass dieser Auftrag abgebrochen wurde (ein Abbruch
+        des vorherigen Auftrags kam zu spät), wird sie einmal wiederholt, sofern noch keine
+        Zeilen geliefert wurden.
+        """
+
+        for versuch in range(2):
+            try:
+                self._fuehre_aus(auftrag)
+                return
+            except sqlite3.Error as e:
+                if auftrag.ist_abgebrochen():
+                    return
+                if versuch == 0 and auftrag.anzahl == 0 and str(e) == "interrupted":
+                    continue
+                wx.CallAfter(auftrag._liefere, auftrag.bei_fehler, e)
+                return
+
+    def _fuehre_aus(self, auftrag):
+        """Führt die Anweisung eines Auftrags einmal aus."""
+
+        beginn = perf_counter()
+        cursor = self.db_conn.cursor()
+        try:
+            cursor.execute(auftrag.sql, auftrag.parameter)
+            while not auftrag.ist_abgebrochen():
+                zeilen = cursor.fetchmany(auftrag.stapelgroesse)
+                if not zeilen:
+                    break
+                auftrag.anzahl += len(zeilen)
+                wx.CallAfter(auftrag._liefere, auftrag.bei_stapel, zeilen)
+        finally:
+            # Anweisung freigeben, damit Schreibzugriffe nicht blockiert werden
+            cursor.close()
+        messung.erfasse("Hintergrund: Abfrage", perf_counter() - beginn)
+        messung.zaehle("Zeilen: Hintergrund", auftrag.anzahl)
+        wx.CallAfter(auftrag._liefere, auftrag.bei_ende, auftrag.anzahl)
@@ -0,0 +1,61 @@
+# aenderungen.py
+"""
+Dieses Modul verteilt Änderungsmeldungen für die Tabelle `Entries`.
+
+Dialoge, die Einträge hinzufügen, bearbeiten oder löschen, melden die Änderung mit `melde`.
+Ansichten, die Einträge anzeigen, registrieren sich mit `abonniere` und können so genau
+die betroffene Zeile aktualisieren, statt die ganze Tabelle neu zu laden.
+"""
+
+HINZUGEFUEGT = "hinzugefuegt"
+GEAENDERT = "geaendert"
+GELOESCHT = "geloescht"
+# Viele Einträge auf einmal (z. B. Import); Ansichten laden neu statt einzelne Zeilen nachzuführen
+IMPORTIERT = "importiert"
+# Serientermine (Modul `wiederholungen`) wurden angelegt, gelöscht oder um Ausnahmen ergänzt;
+# die Tabelle `Entries` ist unverändert, Ansichten blenden nur die Vorkommen neu ein
+WIEDERHOLUNGEN = "wiederholungen"
+# Ein Kalender wurde hinzugefügt oder entfernt (`kalender_quellen`); Ansichten laden neu
+KALENDER = "kalender"
+
+_abonnenten = []
+
+
+def abonniere(callback):
+    """
+    Registriert einen Rückruf für Änderungsmeldungen.
+
+    Args:
+        callback (callable): Wird als `callback(db_conn, aktion, entry_id, alter_schluessel)`
+            aufgerufen.
+    """
+
+    if callback not in _abonnenten:
+        _abonnenten.append(callback)
+
+
+def kuendige(callback):
+    """
+    Entfernt einen zuvor registrierten Rückruf.
+
+    Args:
+        callback (callable): Der Rückruf, der nicht mehr benachrichtigt werden soll.
+    """
+
+    if callback in _abonnenten:
+        _abonnenten.remove(callback)
+
+
+def melde(db_conn, aktion, entry_id, alter_schluessel=None):
+    """
+    Benachrichtigt alle Abonnenten über eine Änderung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die Verbindung, über die geändert wurde.
+        aktion (str): HINZUGEFUEGT, GEAENDERT, GELOESCHT, IMPORTIERT, WIEDERHOLUNGEN oder KALENDER.
+        entry_id (int): Die ID des betroffenen Eintrags; None bei IMPORTIERT, WIEDERHOLUNGEN und KALENDER.
+        alter_schluessel (tuple): (DateKey, TimeKey, ID) vor der Änderung; None beim Hinzufügen.
+    """
+
+    for callback in list(_abonnenten):
+        callback(db_conn, aktion, entry_id, alter_schluessel)
@@ -0,0 +1,369 @@
+# agenda_panel.py
+"""
+Modul mit der Tagesansicht 'AgendaPanel' für das Hauptfenster.
+
+Das Panel zeigt nur die Einträge des im Hauptfenster gewählten Tages. Sie werden über den
+Index auf `DateKey` gelesen, ohne die übrige Tabelle zu berühren. Die Nachbartage werden im
+`AbfrageWorker` mit einer einzigen Bereichsabfrage vorausgeladen, sodass das Blättern mit
+den Pfeiltasten ohne Datenbankzugriff im Hauptthread auskommt.
+
+Sind weitere Kalender hinzugefügt (`kalender_quellen`), liest dieselbe Abfrage die Einträge
+aller Kalender als `UNION ALL`; jeder Eintrag wird dann mit seinem Kalender gekennzeichnet.
+
+Termine von Serien (`wiederholungen`) werden nur für den angezeigten Tag berechnet und nach
+der Uhrzeit zwischen die Einträge sortiert. Die Entf-Taste lässt einen Serientermin aus oder
+löscht die ganze Serie.
+"""
+
+import datetime
+import heapq
+from collections import OrderedDict
+
+import wx
+
+import aenderungen
+import kalender_quellen
+import messung
+import wiederholungen
+
+
+def loesche_serientermin(parent, db_conn, termin):
+    """
+    Fragt, ob nur ein Termin einer Serie oder die ganze Serie gelöscht werden soll, und löscht.
+
+    :param parent: Das Elternfenster der Rückfrage.
+    :param db_conn: Die SQLite-Datenbankverbindung.
+    :param termin: Das `wiederholungen.Vorkommen`.
+    """
+
+    import sqlite3
+
+    dialog = wx.MessageDialog(parent, f"{termin.regel.beschreibung()}: Nur den Termin am {termin.date} "
+                              "oder die ganze Serie löschen?", "Serientermin löschen",
+                              wx.YES_NO | wx.CANCEL | wx.ICON_QUESTION)
+    dialog.SetYesNoLabels("Nur diesen Termin", "Ganze Serie")
+    antwort = dialog.ShowModal()
+    dialog.Destroy()
+    try:
+        if antwort == wx.ID_YES:
+            wiederholungen.ausnahme_hinzufuegen(db_conn, termin.regel.regel_id, termin.datum)
+        elif antwort == wx.ID_NO:
+            wiederholungen.loeschen(db_conn, termin.regel.regel_id)
+    except sqlite3.Error as e:
+        wx.MessageBox(f"Fehler beim Löschen des Serientermins: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+
+
+class AgendaPanel(wx.Panel):
+    """
+    Ein Panel mit den Einträgen eines einzelnen Tages.
+
+    Attributes:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung oder None.
+        worker (AbfrageWorker): Lädt die Nachbartage im Hintergrund vor.
+        tag (datetime.date): Der angezeigte Tag oder None.
+    """
+
+    # Anzahl der Tage vor und nach dem angezeigten Tag, die vorausgeladen werden
+    VORAUS_TAGE = 3
+    # Anzahl der Tage, die höchstens zwischengespeichert werden
+    MAX_TAGE = 64
+
+    VORSCHAU_LAENGE = 200
+
+    # Abfrage je Kalender für `kalender_quellen.vereinige`
+    ABFRAGE = (
+        "SELECT DateKey, ID, Time, substr(AdditionalInfo, 1, {laenge}), TimeKey, {{quelle}} AS Quelle "
+        "FROM {{schema}}.Entries WHERE DateKey {bedingung}"
+    )
+    SORTIERUNG = " ORDER BY DateKey, TimeKey, ID, Quelle"
+
+    def __init__(self, parent):
+        """
+        Initialisiert das Panel ohne Datenbankverbindung.
+
+        :param parent: Das Elternfenster.
+        """
+
+        super().__init__(parent)
+
+        self.db_conn = None
+        self.worker = None
+        self.auftrag = None
+        self.tag = None
+        self.tage = OrderedDict()
+        self.eintrag_ids = []
+        # Wird bei jeder Änderung erhöht, damit veraltete Vorausladungen verworfen werden
+        self.generation = 0
+        # True, solange nach Änderungsmeldungen ein Neuladen aussteht
+        self.neu_laden_geplant = False
+
+        self.initialize_ui()
+
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+    def initialize_ui(self):
+        """Initialisiert die Benutzeroberfläche des Panels."""
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.titel_label = wx.StaticText(self, label="Einträge")
+        sizer.Add(self.titel_label, 0, wx.BOTTOM | wx.EXPAND, 5)
+
+        self.listview = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.listview.InsertColumn(0, "Uhrzeit", width=70)
+        self.listview.InsertColumn(1, "Eintrag", width=330)
+        self.listview.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_item_activated)
+        self.listview.Bind(wx.EVT_LIST_KEY_DOWN, self.on_list_key_down)
+        sizer.Add(self.listview, 1, wx.EXPAND)
+
+        self.SetSizer(sizer)
+
+    def verbinde(self, db_conn, worker=None):
+        """
+        Setzt die Datenbankverbindung nach dem Öffnen einer Datei.
+
+        :param db_conn: Die SQLite-Datenbankverbindung.
+        :param worker: Optionaler `AbfrageWorker` für das Vorausladen der Nachbartage.
+        """
+
+        self.trenne()
+        self.db_conn = db_conn
+        self.worker = worker
+        aenderungen.abonniere(self.on_eintraege_geaendert)
+        if self.tag is not None:
+            self.zeige_tag(self.tag)
+
+    def trenne(self):
+        """Löst die Datenbankverbindung vor dem Schließen der Datei und leert die Anzeige."""
+
+        aenderungen.kuendige(self.on_eintraege_geaendert)
+        self.verwerfe()
+        self.db_conn = None
+        self.worker = None
+        self.zeige_eintraege([])
+
+    def verwerfe(self):
+        """Verwirft alle zwischengespeicherten Tage und eine laufende Vorausladung."""
+
+        self.generation += 1
+        self.tage.clear()
+        if self.auftrag is not None:
+            self.worker.abbrechen(self.auftrag)
+            self.auftrag = None
+
+    def zeige_tag(self, tag):
+        """
+        Zeigt die Einträge eines Tages an und lädt die Nachbartage voraus.
+
+        :param tag: Der Tag als `datetime.date` oder None für ein ungültiges Datum.
+        """
+
+        self.tag = tag
+        if tag is None:
+            self.titel_label.SetLabel("Einträge")
+            self.zeige_eintraege([])
+            return
+
+        self.titel_label.SetLabel(f"Einträge am {tag.strftime('%d.%m.%Y')}")
+        if self.db_conn is None:
+            self.zeige_eintraege([])
+            return
+
+        # Erst hier, damit der Programmstart ohne geöffnete Datei sqlite3 nicht lädt
+        import sqlite3
+
+        schluessel = tag.isoformat()
+        try:
+            if schluessel in self.tage:
+                self.tage.move_to_end(schluessel)
+            else:
+                self.speichere_tag(schluessel, self.lade_tag(schluessel))
+            # Serientermine werden nicht zwischengespeichert, sondern nur für diesen Tag berechnet
+            termine = list(wiederholungen.vorkommen(self.db_conn, tag, tag))
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Laden der Einträge: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+        self.zeige_eintraege(self.tage[schluessel], termine)
+        self.lade_nachbartage(tag)
+
+    def abfrage(self, bedingung):
+        """Baut die Abfrage über alle Kalender für eine Bedingung auf `DateKey`."""
+
+        vorlage = self.ABFRAGE.format(laenge=self.VORSCHAU_LAENGE, bedingung=bedingung)
+        return kalender_quellen.vereinige(self.db_conn, vorlage) + self.SORTIERUNG
+
+    def lade_tag(self, schluessel):
+        """
+        Liest die Einträge eines Tages mit einer Punktabfrage über den Index.
+
+        :param schluessel: Der Tag als ISO-Datum.
+        :return: Tupel (ID, Time, Vorschau, TimeKey, Quelle) in Reihenfolge der Uhrzeit.
+        """
+
+        with messung.stoppuhr("Agenda: Tag laden"):
+            cursor = self.db_conn.cursor()
+            cursor.execute(self.abfrage("= :tag"), {"tag": schluessel})
+            zeilen = [zeile[1:] for zeile in cursor.fetchall()]
+            cursor.close()
+        messung.zaehle("Zeilen: Agenda", len(zeilen))
+        return zeilen
+
+    def speichere_tag(self, schluessel, zeilen):
+        """Legt die Einträge eines Tages im Zwischenspeicher ab und verdrängt die ältesten Tage."""
+
+        self.tage[schluessel] = zeilen
+        self.tage.move_to_end(schluessel)
+        while len(self.tage) > self.MAX_TAGE:
+            self.tage.popitem(last=False)
+
+    def lade_nachbartage(self, tag):
+        """Lädt die noch nicht zwischengespeicherten Nachbartage im Hintergrund."""
+
+        if self.worker is None:
+            return
+        nachbarn = [tag + datetime.timedelta(days=abstand)
+                    for abstand in range(-self.VORAUS_TAGE, self.VORAUS_TAGE + 1)]
+        fehlend = [nachbar.isoformat() for nachbar in nachbarn if nachbar.isoformat() not in self.tage]
+        if not fehlend:
+            return
+
+        if self.auftrag is not None:
+            self.worker.abbrechen(self.auftrag)
+        generation = self.generation
+        zeilen = []
+        self.auftrag = self.worker.ausfuehren(
+            self.abfrage("BETWEEN :von AND :bis"),
+            {"von": fehlend[0], "bis": fehlend[-1]},
+            bei_stapel=zeilen.extend,
+            bei_ende=lambda anzahl: self.on_nachbartage_geladen(generation, fehlend, zeilen),
+            bei_fehler=self.on_nachbartage_fehler,
+        )
+
+    def on_nachbartage_geladen(self, generation, schluessel_liste, zeilen):
+        """
+        Übernimmt die vorausgeladenen Tage in den Zwischenspeicher.
+
+        :param generation: Der Stand von `generation` beim Start der Abfrage.
+        :param schluessel_liste: Die angefragten Tage als ISO-Datum.
+        :param zeilen: Tupel (DateKey, ID, Time, Vorschau, TimeKey, Quelle) aller angefragten Tage.
+        """
+
+        self.auftrag = None
+        if generation != self.generation:
+            return
+        tage = {schluessel: [] for schluessel in schluessel_liste}
+        for zeile in zeilen:
+            if zeile[0] in tage:
+                tage[zeile[0]].append(zeile[1:])
+        aktueller_tag = self.tag.isoformat() if self.tag is not None else None
+        for schluessel, eintraege in tage.items():
+            # Bereits vorhandene Tage sind mindestens so aktuell wie die Vorausladung
+            if schluessel not in self.tage and schluessel != aktueller_tag:
+                self.speichere_tag(schluessel, eintraege)
+
+    def on_nachbartage_fehler(self, fehler):
+        """Verwirft eine fehlgeschlagene Vorausladung; die Tage werden dann bei Bedarf direkt gelesen."""
+
+        self.auftrag = None
+
+    def zeige_eintraege(self, zeilen, termine=()):
+        """
+        Füllt die Liste mit den Einträgen und Serienterminen eines Tages.
+
+        :param zeilen: Tupel (ID, Time, Vorschau, TimeKey, Quelle) in Reihenfolge der Uhrzeit.
+        :param termine: `wiederholungen.Vorkommen` des Tages in Reihenfolge der Uhrzeit.
+        """
+
+        self.listview.DeleteAllItems()
+        # Enthält (Quelle, ID) eines Eintrags bzw. das `Vorkommen` eines Serientermins je Zeile
+        self.eintrag_ids = []
+        zusammengefuehrt = self.db_conn is not None and kalender_quellen.zusammengefuehrt(self.db_conn)
+        zeilen = ((time_key, time, vorschau, (quelle, entry_id)) for entry_id, time, vorschau, time_key, quelle in zeilen)
+        serie = ((termin.time_key, termin.time, termin.additional_info, termin) for termin in termine)
+        for _, time, vorschau, eintrag in heapq.merge(zeilen, serie, key=lambda zeile: zeile[0]):
+            index = self.listview.InsertItem(self.listview.GetItemCount(), time)
+            if isinstance(eintrag, wiederholungen.Vorkommen):
+                vorschau = f"{wiederholungen.KENNZEICHEN} " + (vorschau or "")[:self.VORSCHAU_LAENGE]
+                quelle = kalender_quellen.HAUPT
+            else:
+                quelle = eintrag[0]
+            if zusammengefuehrt:
+                vorschau = f"[{kalender_quellen.bezeichnung(self.db_conn, quelle)}] {vorschau or ''}"
+            self.listview.SetItem(index, 1, (vorschau or "").replace("\n", " "))
+            self.eintrag_ids.append(eintrag)
+
+    def on_eintraege_geaendert(self, db_conn, aktion, entry_id, alter_schluessel):
+        """
+        Verwirft den Zwischenspeicher nach einer Änderung und liest den angezeigten Tag neu.
+
+        Gelesen wird erst nach dem aktuellen Ereignis, sodass viele Meldungen hintereinander
+        (z. B. beim Löschen mehrerer Einträge) nur einmal neu laden.
+        """
+
+        if db_conn is self.db_conn:
+            self.verwerfe()
+            if not self.neu_laden_geplant:
+                self.neu_laden_geplant = True
+                wx.CallAfter(self.lade_neu)
+
+    def lade_neu(self):
+        """Zeigt den aktuellen Tag nach gesammelten Änderungsmeldungen neu an."""
+
+        # Das Panel kann inzwischen zerstört worden sein
+        if not self:
+            return
+        self.neu_laden_geplant = False
+        if self.db_conn is not None and self.tag is not None:
+            self.zeige_tag(self.tag)
+
+    def on_item_activated(self, event):
+        """Öffnet ein Fenster mit dem vollständigen Inhalt des gewählten Eintrags."""
+
+        import sqlite3
+        from eintraganzeigen import EntryContentDialog
+
+        index = event.GetIndex()
+        if index < 0 or index >= len(self.eintrag_ids):
+            return
+
+        if isinstance(self.eintrag_ids[index], wiederholungen.Vorkommen):
+            dialog = EntryContentDialog(self, title="Serientermin anzeigen", content=self.eintrag_ids[index].inhalt())
+            dialog.Show()
+            return
+
+        try:
+            eintrag = kalender_quellen.lade(self.db_conn, *self.eintrag_ids[index])
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Laden des Eintrags: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        if eintrag is None:
+            wx.MessageBox("Eintrag nicht gefunden.", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        dialog = EntryContentDialog(self, title="Eintrag anzeigen", content=eintrag.inhalt())
+        dialog.Show()
+
+    def on_list_key_down(self, event):
+        """Lässt mit der Entf-Taste den gewählten Serientermin aus oder löscht die ganze Serie."""
+
+        index = event.GetIndex()
+        if event.GetKeyCode() != wx.WXK_DELETE or not 0 <= index < len(self.eintrag_ids):
+            event.Skip()
+            return
+        termin = self.eintrag_ids[index]
+        if not isinstance(termin, wiederholungen.Vorkommen):
+            event.Skip()
+            return
+
+        loesche_serientermin(self, self.db_conn, termin)
+
+    def on_destroy(self, event):
+        """Meldet das Panel von den Änderungsmeldungen ab und bricht eine laufende Vorausladung ab."""
+
+        if event.GetEventObject() is self:
+            aenderungen.kuendige(self.on_eintraege_geaendert)
+            if self.auftrag is not None:
+                self.worker.abbrechen(self.auftrag)
+                self.auftrag = None
+        event.Skip()
@@ -6,40 +6,124 @@ zur Anzeige und Verwaltung von Einträgen in einer SQLite-Datenbank.
 Dieses Modul enthält eine benutzerdefinierte Klasse `AlleAnzeigenDialog`, die ein Dialogfenster
 erstellt, das eine Liste von Einträgen aus einer SQLite-Datenbank anzeigt und es dem Benutzer ermöglicht,
 Einträge zu bearbeiten oder zu löschen.
+
+Serientermine (`wiederholungen`) erscheinen in einer eigenen Liste unter den Einträgen. Sie
+werden nur für den Zeitraum der gerade sichtbaren Zeilen berechnet, sobald die virtuelle
+ListView neue Zeilen anfordert (`EVT_LIST_CACHE_HINT`).
+
+Sind weitere Kalender hinzugefügt (`kalender_quellen`), zeigt die Liste die Einträge aller
+Kalender mit einer zusätzlichen Spalte "Kalender". Bearbeitet und gelöscht werden können nur
+Einträge der geöffneten Datei.
+
+In der Liste lassen sich mehrere Einträge auswählen. Sie werden mit einer Anweisung in einer
+Transaktion gelöscht bzw. bearbeitet (`eintraege.loeschen_mehrere`, `MehrfachBearbeitungsDialog`)
+und danach mit einer einzigen Meldung bestätigt.
+
+Strg+Z und Strg+Y machen Änderungen über das `journal` rückgängig bzw. wiederholen sie; die
+Liste folgt dabei wie bei jeder anderen Änderung den Änderungsmeldungen.
 """
 
 import wx
 import sqlite3
-from datetime import datetime
-
+from datetime import date, datetime
+from itertools import islice
+from time import perf_counter
+
+import aenderungen
+import eintraege
+import journal
+import kalender_quellen
+import messung
+import wiederholungen
+from agenda_panel import loesche_serientermin
 from eintraganzeigen import EntryContentDialog
 from eintragbearbeiten import BearbeitungsDialog
+from eintrags_cache import EintragsCache
+
+
+class EintragsListCtrl(wx.ListCtrl):
+    """Eine virtuelle ListView, die ihre Zeilen bei Bedarf aus einem `EintragsCache` liest."""
+
+    def __init__(self, parent, style):
+        """
+        Initialisiert die virtuelle ListView.
+
+        :param parent: Das Elternfenster.
+        :param style: Zusätzliche Stilflags für das ListCtrl.
+        """
+
+        super().__init__(parent, style=style | wx.LC_VIRTUAL)
+        self.cache = None
+        # Bezeichnungen der Kalender je Nummer, solange die Spalte "Kalender" angezeigt wird
+        self.quellen = None
+
+    def OnGetItemText(self, item, column):
+        """Liefert den Text einer Zelle aus dem Cache."""
+
+        if self.cache is None:
+            return ""
+        zeile = self.cache.zeile(item)
+        if zeile is None:
+            return ""
+
+        datum_schluessel = zeile[0]
+        date, day_of_week, time, additional_info = zeile[-4:]
+        if column == 0:
+            # Datum mit führenden Nullen anzeigen
+            if datum_schluessel:
+                return f"{datum_schluessel[8:10]}.{datum_schluessel[5:7]}.{datum_schluessel[0:4]}"
+            return date
+        if column == 1:
+            return day_of_week
+        if column == 2:
+            return time
+        if column == 4:
+            return self.quellen.get(self.cache.quelle(zeile), "") if self.quellen else ""
+        return additional_info
+
 
 class AlleAnzeigenDialog(wx.Dialog):
     """Ein benutzerdefiniertes Dialogfenster zum Anzeigen und Verwalten von Einträgen."""
 
-    def __init__(self, parent, db_conn, db_datei):
+    # Höchstzahl der Serientermine, die für den sichtbaren Zeitraum angezeigt werden
+    MAX_SERIENTERMINE = 500
+
+    def __init__(self, parent, db_conn, db_datei, worker=None):
         """
         Initialisiert den Dialog.
 
         :param parent: Das Elternfenster.
         :param db_conn: Die SQLite-Datenbankverbindung.
         :param db_datei: Der Dateipfad zur SQLite-Datenbank.
+        :param worker: Optionaler `AbfrageWorker`, der die Liste im Hintergrund lädt.
         """
 
         super().__init__(parent, title="Alle anzeigen")
 
         self.db_conn = db_conn
         self.db_datei = db_datei
+        self.worker = worker
+        self.cache = None
+        self.auftrag = None
+        self.ladebeginn = None
+        # (von, bis) der angezeigten Serientermine und die Termine selbst
+        self.serien_zeitraum = None
+        self.serientermine = []
+        # True, solange nach Änderungsmeldungen ein Neuladen aussteht
+        self.neu_laden_geplant = False
 
         self.initialize_ui()
 
-        # ListView einmalig füllen und sortieren
+        # ListView einmalig füllen
         self.update_listview()
 
         # Tastatur-Handler für das Dialogfenster hinzufügen
         self.Bind(wx.EVT_CHAR_HOOK, self.on_key_pressed)
 
+        # Änderungen an Einträgen direkt in der Liste nachführen
+        aenderungen.abonniere(self.on_eintraege_geaendert)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
 
     def initialize_ui(self):
         """Initialisiert die Benutzeroberfläche des Dialogs."""
@@ -49,13 +133,36 @@ class AlleAnzeigenDialog(wx.Dialog):
         label = wx.StaticText(self, label="Vorhandene Einträge:")
         sizer.Add(label, 0, wx.ALL | wx.EXPAND, 10)
 
-        self.listview = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.listview = EintragsListCtrl(self, style=wx.LC_REPORT)
         self.listview.InsertColumn(0, "Datum", width=150)
         self.listview.InsertColumn(1, "Wochentag", width=150)
         self.listview.InsertColumn(2, "Uhrzeit", width=100)
         self.listview.InsertColumn(3, "Zusätzliche Informationen", width=200)
+        self.listview.Bind(wx.EVT_LIST_CACHE_HINT, self.on_cache_hint)
         sizer.Add(self.listview, 1, wx.ALL | wx.EXPAND, 10)
 
+        self.serien_label = wx.StaticText(self, label="Serientermine:")
+        sizer.Add(self.serien_label, 0, wx.LEFT | wx.RIGHT | wx.EXPAND, 10)
+        self.serien_liste = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL, size=(-1, 120))
+        self.serien_liste.InsertColumn(0, "Datum", width=150)
+        self.serien_liste.InsertColumn(1, "Wochentag", width=150)
+        self.serien_liste.InsertColumn(2, "Uhrzeit", width=100)
+        self.serien_liste.InsertColumn(3, "Serie", width=200)
+        self.serien_liste.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_serientermin_activated)
+        self.serien_liste.Bind(wx.EVT_LIST_KEY_DOWN, self.on_serien_key_down)
+        sizer.Add(self.serien_liste, 0, wx.ALL | wx.EXPAND, 10)
+
+        # Fortschrittsanzeige für das Laden im Hintergrund
+        self.lade_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.lade_label = wx.StaticText(self, label="")
+        self.lade_sizer.Add(self.lade_label, 1, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.lade_gauge = wx.Gauge(self, range=100, style=wx.GA_HORIZONTAL)
+        self.lade_sizer.Add(self.lade_gauge, 1, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.abbrechen_btn = wx.Button(self, label="Abbrechen")
+        self.abbrechen_btn.Bind(wx.EVT_BUTTON, self.on_abbrechen)
+        self.lade_sizer.Add(self.abbrechen_btn, 0, wx.ALL, 5)
+        sizer.Add(self.lade_sizer, 0, wx.LEFT | wx.RIGHT | wx.EXPAND, 10)
+
         self.checkbox = wx.CheckBox(self, label="Alle anzeigen")
         self.checkbox.Bind(wx.EVT_CHECKBOX, self.on_checkbox_toggle)
         sizer.Add(self.checkbox, 0, wx.ALL | wx.EXPAND, 10)
@@ -77,85 +184,300 @@ class AlleAnzeigenDialog(wx.Dialog):
 
         Wenn die CheckBox aktiviert ist, werden alle Einträge angezeigt.
         Andernfalls werden nur Einträge ab dem aktuellen Datum angezeigt.
+        Die ListView ist virtuell: Geladen werden nur die sichtbaren Seiten.
         """
 
-        self.listview.DeleteAllItems()
-
         try:
-            cursor = self.db_conn.cursor()
-            select_query = "SELECT Date, DayOfWeek, Time, AdditionalInfo FROM Entries"
-
-            if not self.checkbox.GetValue():
+            if self.checkbox.GetValue():
+                ab_datum = None
+            else:
                 # Nur Einträge ab dem heutigen Datum laden
-                today = datetime.today().date()
-                cursor.execute(select_query)
-                rows = cursor.fetchall()
-
-                for row in rows:
-                    str_date, day_of_week, str_time, additional_info = row
-                    entry_date = datetime.strptime(str_date, "%d.%m.%Y").date()
-
-                    if entry_date >= today:
-                        # Datum mit führenden Nullen anzeigen
-                        formatted_date = entry_date.strftime("%d.%m.%Y")
-                        index = self.listview.InsertItem(self.listview.GetItemCount(), formatted_date)
-                        self.listview.SetItem(index, 1, day_of_week)
-                        self.listview.SetItem(index, 2, str_time)
-                        self.listview.SetItem(index, 3, additional_info)
+                ab_datum = datetime.today().date().strftime("%Y-%m-%d")
+
+            if self.auftrag is not None:
+                self.worker.abbrechen(self.auftrag)
+                self.auftrag = None
+
+            # Spalte "Kalender" nur anzeigen, wenn weitere Kalender hinzugefügt sind
+            if kalender_quellen.zusammengefuehrt(self.db_conn):
+                self.listview.quellen = {quelle: kalender_quellen.bezeichnung(self.db_conn, quelle)
+                                         for quelle in kalender_quellen.quellen(self.db_conn)}
+                if self.listview.GetColumnCount() == 4:
+                    self.listview.InsertColumn(4, "Kalender", width=120)
             else:
-                cursor.execute(select_query)
-                rows = cursor.fetchall()
+                self.listview.quellen = None
+                if self.listview.GetColumnCount() > 4:
+                    self.listview.DeleteColumn(4)
+
+            # Mit Worker wird die Liste im Hintergrund gezählt und stapelweise gefüllt
+            self.ladebeginn = perf_counter()
+            self.cache = EintragsCache(self.db_conn, ab_datum, zaehlen=self.worker is None)
+            self.listview.cache = self.cache
+            self.listview.SetItemCount(self.cache.anzahl)
+            self.listview.Refresh()
+
+            if self.worker is not None:
+                query, parameter = self.cache.schluessel_abfrage()
+                self.auftrag = self.worker.ausfuehren(
+                    query, parameter,
+                    bei_stapel=self.on_stapel_geladen,
+                    bei_ende=self.on_laden_beendet,
+                    bei_fehler=self.on_laden_fehler,
+                    stapelgroesse=EintragsCache.SEITENGROESSE * 25,
+                )
+            self.zeige_ladefortschritt(self.auftrag is not None)
+
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Laden der Einträge aus der Datenbank: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+
+    def zeige_ladefortschritt(self, anzeigen):
+        """Blendet die Fortschrittsanzeige für das Laden im Hintergrund ein oder aus."""
+
+        self.lade_label.SetLabel("Lade Einträge..." if anzeigen else "")
+        self.lade_sizer.ShowItems(anzeigen)
+        self.Layout()
+
+    def on_stapel_geladen(self, schluessel_liste):
+        """Erweitert die Liste um einen im Hintergrund geladenen Stapel."""
+
+        self.cache.ergaenze_schluessel(schluessel_liste)
+        self.listview.SetItemCount(self.cache.anzahl)
+        self.lade_label.SetLabel(f"Lade Einträge... {self.cache.anzahl}")
+        self.lade_gauge.Pulse()
+
+    def on_laden_beendet(self, anzahl):
+        """Blendet die Fortschrittsanzeige aus, wenn alle Einträge geladen sind."""
+
+        self.auftrag = None
+        self.zeige_ladefortschritt(False)
+        # Dauer vom Öffnen bzw. Umschalten bis zur vollständig gefüllten Liste
+        messung.erfasse("Liste: vollständig geladen", perf_counter() - self.ladebeginn)
 
-                for row in rows:
-                    str_date, day_of_week, str_time, additional_info = row
-                    formatted_date = datetime.strptime(str_date, "%d.%m.%Y").strftime("%d.%m.%Y")
-                    index = self.listview.InsertItem(self.listview.GetItemCount(), formatted_date)
-                    self.listview.SetItem(index, 1, day_of_week)
-                    self.listview.SetItem(index, 2, str_time)
-                    self.listview.SetItem(index, 3, additional_info)
+    def on_laden_fehler(self, fehler):
+        """Meldet einen Fehler beim Laden im Hintergrund."""
 
-            cursor.close()
-            self.sort_listview_by_datetime()
+        self.auftrag = None
+        self.zeige_ladefortschritt(False)
+        wx.MessageBox(f"Fehler beim Laden der Einträge aus der Datenbank: {str(fehler)}", "Fehler", wx.OK | wx.ICON_ERROR)
 
+    def on_abbrechen(self, event):
+        """
+        Bricht das Laden im Hintergrund ab.
+
+        Die bis dahin geladenen Einträge bleiben in der Liste sichtbar.
+        """
+
+        if self.auftrag is not None:
+            self.worker.abbrechen(self.auftrag)
+            self.auftrag = None
+        self.zeige_ladefortschritt(False)
+        self.lade_sizer.Show(self.lade_label)
+        self.lade_label.SetLabel(f"Laden abgebrochen, {self.cache.anzahl} Einträge geladen.")
+        self.Layout()
+
+    def on_eintraege_geaendert(self, db_conn, aktion, entry_id, alter_schluessel):
+        """
+        Führt eine gemeldete Änderung in der ListView nach, ohne die Liste neu zu laden.
+
+        Die alte Zeile wird an ihrer sortierten Position entfernt und die neue Fassung
+        an ihrer neuen Position eingefügt.
+        """
+
+        if db_conn is not self.db_conn or self.cache is None:
+            return
+
+        if aktion == aenderungen.WIEDERHOLUNGEN:
+            # Nur die Serien haben sich geändert; die Einträge bleiben, wie sie sind
+            self.serien_zeitraum = None
+            oben = self.listview.GetTopItem()
+            self.zeige_serientermine(oben, oben + self.listview.GetCountPerPage())
+            return
+
+        if self.auftrag is not None or aktion in (aenderungen.IMPORTIERT, aenderungen.KALENDER):
+            # Die Liste wird noch geladen oder es kamen viele Einträge hinzu; neu laden statt einzelne
+            # Zeilen verschieben, bei vielen Meldungen hintereinander nur einmal
+            if not self.neu_laden_geplant:
+                self.neu_laden_geplant = True
+                wx.CallAfter(self.lade_neu)
+            return
+
+        try:
+            if alter_schluessel is not None:
+                self.cache.entferne(alter_schluessel)
+            if aktion != aenderungen.GELOESCHT:
+                zeile = self.cache.lade_zeile(entry_id)
+                if zeile is not None:
+                    self.cache.einfuegen(zeile)
         except sqlite3.Error as e:
-            wx.MessageBox(f"Fehler beim Laden der Einträge aus der Datenbank: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            wx.MessageBox(f"Fehler beim Aktualisieren der Liste: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        self.listview.SetItemCount(self.cache.anzahl)
+        self.listview.Refresh()
 
-    def sort_listview_by_datetime(self):
+    def lade_neu(self):
+        """Lädt die Liste nach gesammelten Änderungsmeldungen neu."""
+
+        # Der Dialog kann inzwischen geschlossen worden sein
+        if not self:
+            return
+        self.neu_laden_geplant = False
+        self.update_listview()
+
+    def on_cache_hint(self, event):
+        """Berechnet die Serientermine für den Zeitraum der Zeilen, die die ListView gerade anfordert."""
+
+        self.zeige_serientermine(event.GetCacheFrom(), event.GetCacheTo())
+        event.Skip()
+
+    def zeige_serientermine(self, von_index, bis_index):
         """
-        Sortiert die Einträge in der ListView nach Datum und Uhrzeit.
+        Füllt die Liste der Serientermine für den Zeitraum zwischen zwei Zeilen der ListView.
+
+        Die erste Zeile der Liste beginnt den Zeitraum bei heute bzw., wenn alle Einträge
+        angezeigt werden, bei der ersten Serie; die Termine werden nur neu berechnet, wenn sich
+        der Zeitraum geändert hat.
 
-        Verwendet die Daten in der ListView und aktualisiert die Anzeige entsprechend.
+        :param von_index: Die erste sichtbare Zeile.
+        :param bis_index: Die letzte sichtbare Zeile.
         """
 
+        if self.cache is None or self.cache.anzahl == 0:
+            zeitraum = None
+        else:
+            bis_index = min(bis_index, self.cache.anzahl - 1)
+            try:
+                erste = self.cache.zeile(max(von_index, 0))
+                letzte = self.cache.zeile(bis_index)
+            except sqlite3.Error:
+                return
+            if erste is None or letzte is None or not letzte[0]:
+                zeitraum = None
+            else:
+                # Einträge mit ungültigem Datum ("") stehen am Anfang und begrenzen nichts
+                von = date.fromisoformat(erste[0]) if erste[0] else date.min
+                if von_index <= 0:
+                    von = date.today() if not self.checkbox.GetValue() else date.min
+                zeitraum = (von, date.fromisoformat(letzte[0]))
+
+        if zeitraum == self.serien_zeitraum:
+            return
+        self.serien_zeitraum = zeitraum
+
         try:
-            # Erstellen einer Liste von Tupeln (Datum, Uhrzeit, Zeilenindex, Wochentag, Zusätzliche Informationen)
-            items_data = [
-                (
-                    datetime.strptime(self.listview.GetItemText(i, 0), "%d.%m.%Y"),  # Datum
-                    datetime.strptime(self.listview.GetItemText(i, 2), "%H:%M"),       # Uhrzeit
-                    i,  # Zeilenindex
-                    self.listview.GetItemText(i, 1),  # Wochentag
-                    self.listview.GetItemText(i, 3)   # Zusätzliche Informationen
-                )
-                for i in range(self.listview.GetItemCount())
-            ]
+            if zeitraum is None:
+                self.serientermine = []
+            else:
+                self.serientermine = list(islice(wiederholungen.vorkommen(self.db_conn, *zeitraum),
+                                                 self.MAX_SERIENTERMINE))
+        except sqlite3.Error as e:
+            self.serientermine = []
+            wx.MessageBox(f"Fehler beim Laden der Serientermine: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
 
-            # Sortiere die Listeneinträge nach Datum und Uhrzeit
-            items_data.sort(key=lambda x: (x[0], x[1]))
+        if zeitraum is None or zeitraum[0] == date.min:
+            self.serien_label.SetLabel("Serientermine:")
+        else:
+            self.serien_label.SetLabel(f"Serientermine vom {eintraege.datum_text(zeitraum[0])} "
+                                       f"bis {eintraege.datum_text(zeitraum[1])}:")
+        self.serien_liste.DeleteAllItems()
+        for termin in self.serientermine:
+            index = self.serien_liste.InsertItem(self.serien_liste.GetItemCount(), termin.date)
+            self.serien_liste.SetItem(index, 1, termin.day_of_week)
+            self.serien_liste.SetItem(index, 2, termin.time)
+            self.serien_liste.SetItem(index, 3, termin.regel.beschreibung())
+
+    def on_serientermin_activated(self, event):
+        """Öffnet ein Fenster mit dem vollständigen Inhalt des gewählten Serientermins."""
+
+        index = event.GetIndex()
+        if 0 <= index < len(self.serientermine):
+            dialog = EntryContentDialog(self, title="Serientermin anzeigen", content=self.serientermine[index].inhalt())
+            dialog.Show()
+
+    def on_serien_key_down(self, event):
+        """Lässt mit der Entf-Taste den gewählten Serientermin aus oder löscht die ganze Serie."""
+
+        index = event.GetIndex()
+        if event.GetKeyCode() == wx.WXK_DELETE and 0 <= index < len(self.serientermine):
+            loesche_serientermin(self, self.db_conn, self.serientermine[index])
+        else:
+            event.Skip()
+
+    def on_destroy(self, event):
+        """Meldet den Dialog beim Schließen von den Änderungsmeldungen ab."""
+
+        if event.GetEventObject() is self:
+            aenderungen.kuendige(self.on_eintraege_geaendert)
+            if self.auftrag is not None:
+                self.worker.abbrechen(self.auftrag)
+                self.auftrag = None
+        event.Skip()
+
+    def get_selected_row(self):
+        """
+        Liefert die Zeile des ausgewählten Eintrags aus dem Cache.
+
+        Returns:
+            tuple: Die Zeile oder None, wenn kein Eintrag ausgewählt ist.
+        """
+
+        selected_index = self.listview.GetFirstSelected()
+        if selected_index == -1:
+            return None
+        return self.cache.zeile(selected_index)
+
+    def get_selected_id(self):
+        """
+        Liefert die ID des ausgewählten Eintrags aus dem Cache.
 
-            # Lösche alle Einträge in der ListView
-            self.listview.DeleteAllItems()
+        Returns:
+            int: Die ID oder None, wenn kein Eintrag ausgewählt ist.
+        """
+
+        row = self.get_selected_row()
+        if row is None:
+            return None
+        return row[2]
+
+    def get_selected_rows(self):
+        """
+        Liefert die Zeilen aller ausgewählten Einträge aus dem Cache.
 
-            # Füge die sortierten Einträge wieder hinzu
-            for item in items_data:
-                formatted_date = item[0].strftime("%d.%m.%Y")
-                index = self.listview.InsertItem(self.listview.GetItemCount(), formatted_date)
-                self.listview.SetItem(index, 1, item[3])  # Wochentag
-                self.listview.SetItem(index, 2, item[1].strftime("%H:%M"))  # Uhrzeit
-                self.listview.SetItem(index, 3, item[4])  # Zusätzliche Informationen
+        :return: Liste der Zeilen in der Reihenfolge der Liste.
+        """
+
+        rows = []
+        index = self.listview.GetFirstSelected()
+        while index != -1:
+            row = self.cache.zeile(index)
+            if row is not None:
+                rows.append(row)
+            index = self.listview.GetNextSelected(index)
+        return rows
 
-        except Exception as e:
-            wx.MessageBox(f"Fehler beim Sortieren der Listeneinträge: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+    def hebe_auswahl_auf(self):
+        """Hebt die Auswahl auf, bevor sich die Positionen der Zeilen verschieben."""
+
+        index = self.listview.GetFirstSelected()
+        while index != -1:
+            self.listview.Select(index, False)
+            index = self.listview.GetNextSelected(index)
+
+    def hinweis_schreibgeschuetzt(self, row):
+        """
+        Weist darauf hin, wenn eine Zeile zu einem hinzugefügten Kalender gehört.
+
+        :param row: Die Zeile aus dem Cache.
+        :return: True, wenn der Eintrag nur angezeigt und nicht geändert werden kann.
+        """
+
+        quelle = self.cache.quelle(row)
+        if quelle == kalender_quellen.HAUPT:
+            return False
+        name = kalender_quellen.bezeichnung(self.db_conn, quelle)
+        wx.MessageBox(f"Der Eintrag gehört zum hinzugefügten Kalender '{name}' und kann nur angezeigt werden.\n"
+                      "Öffnen Sie diesen Kalender, um den Eintrag zu ändern.", "Information", wx.OK | wx.ICON_INFORMATION)
+        return True
 
     def on_checkbox_toggle(self, event):
         """Behandelt das Ereignis, wenn die CheckBox umgeschaltet wird."""
@@ -166,21 +488,24 @@ class AlleAnzeigenDialog(wx.Dialog):
         """
         Behandelt das Ereignis, wenn der Bearbeiten-Button geklickt wird.
 
-        Öffnet ein Bearbeitungsdialogfenster für den ausgewählten Eintrag.
+        Öffnet ein Bearbeitungsdialogfenster für den ausgewählten Eintrag, bei mehreren
+        ausgewählten Einträgen den Dialog zum gemeinsamen Bearbeiten.
         """
 
-        selected_index = self.listview.GetFirstSelected()
-        if selected_index != -1:
-            date = self.listview.GetItemText(selected_index)
-            day_of_week = self.listview.GetItem(selected_index, 1).GetText()
-            time = self.listview.GetItem(selected_index, 2).GetText()
-            additional_info = self.listview.GetItem(selected_index, 3).GetText()
-
-            # Öffne Bearbeitungsform mit den ausgewählten Eintragsdetails
-            edit_dialog = BearbeitungsDialog(self, self.db_conn, date, day_of_week, time, additional_info)
+        if self.listview.GetSelectedItemCount() > 1:
+            self.on_edit_entries()
+            return
+
+        row = self.get_selected_row()
+        if row is not None and self.hinweis_schreibgeschuetzt(row):
+            return
+        entry_id = self.get_selected_id()
+        if entry_id is not None:
+            # Öffne Bearbeitungsform für den ausgewählten Eintrag
+            with messung.stoppuhr("Dialog: Bearbeiten öffnen"):
+                edit_dialog = BearbeitungsDialog(self, self.db_conn, entry_id)
             edit_dialog.ShowModal()
             edit_dialog.Destroy()
-            self.update_listview()
         else:
             wx.MessageBox("Bitte wählen Sie einen Eintrag aus der Liste zum Bearbeiten aus.", "Information", wx.OK | wx.ICON_INFORMATION)
 
@@ -188,27 +513,24 @@ class AlleAnzeigenDialog(wx.Dialog):
         """
         Behandelt das Ereignis, wenn der Löschen-Button geklickt wird.
 
-        Löscht den ausgewählten Eintrag aus der ListView und der Datenbank.
+        Löscht den ausgewählten Eintrag aus der ListView und der Datenbank, bei mehreren
+        ausgewählten Einträgen alle nach einer Rückfrage.
         """
 
-        selected_index = self.listview.GetFirstSelected()
-        if selected_index != -1:
-            date = self.listview.GetItemText(selected_index)
-            time = self.listview.GetItem(selected_index, 2).GetText()
+        if self.listview.GetSelectedItemCount() > 1:
+            self.on_delete_entries()
+            return
 
+        row = self.get_selected_row()
+        if row is not None and self.hinweis_schreibgeschuetzt(row):
+            return
+        entry_id = self.get_selected_id()
+        if entry_id is not None:
             try:
-                cursor = self.db_conn.cursor()
-                delete_query = "DELETE FROM Entries WHERE Date = ? AND Time = ?"
-                cursor.execute(delete_query, (date, time))
-                self.db_conn.commit()
-
-                if cursor.rowcount > 0:
-                    self.listview.DeleteItem(selected_index)
+                if eintraege.loeschen(self.db_conn, entry_id):
                     wx.MessageBox("Eintrag erfolgreich gelöscht.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
                 else:
                     wx.MessageBox("Löschen fehlgeschlagen: Eintrag nicht gefunden.", "Fehler", wx.OK | wx.ICON_ERROR)
-
-                cursor.close()
             except sqlite3.Error as e:
                 wx.MessageBox(f"Fehler beim Löschen des Eintrags: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
 
@@ -216,11 +538,80 @@ class AlleAnzeigenDialog(wx.Dialog):
             wx.MessageBox("Bitte wählen Sie einen Eintrag aus der Liste zum Löschen aus.", "Information", wx.OK | wx.ICON_INFORMATION)
 
 
+    def ausgewaehlte_ids(self):
+        """
+        Liefert die IDs aller ausgewählten Einträge der geöffneten Datei.
+
+        :return: Liste der IDs oder None, wenn ein Eintrag zu einem hinzugefügten Kalender gehört.
+        """
+
+        rows = self.get_selected_rows()
+        for row in rows:
+            if self.hinweis_schreibgeschuetzt(row):
+                return None
+        return [row[2] for row in rows]
+
+    def on_edit_entries(self):
+        """Ändert Uhrzeit und/oder Text aller ausgewählten Einträge in einer Transaktion."""
+
+        from mehrfachbearbeiten_dialog import MehrfachBearbeitungsDialog
+
+        entry_ids = self.ausgewaehlte_ids()
+        if not entry_ids:
+            return
+        dialog = MehrfachBearbeitungsDialog(self, self.db_conn, entry_ids)
+        if dialog.ShowModal() == wx.ID_OK:
+            self.hebe_auswahl_auf()
+        dialog.Destroy()
+
+    def on_delete_entries(self):
+        """Löscht alle ausgewählten Einträge nach einer Rückfrage in einer Transaktion."""
+
+        entry_ids = self.ausgewaehlte_ids()
+        if not entry_ids:
+            return
+        if wx.MessageBox(f"{len(entry_ids)} Einträge löschen?", "Löschen",
+                         wx.YES_NO | wx.NO_DEFAULT | wx.ICON_QUESTION) != wx.YES:
+            return
+
+        self.hebe_auswahl_auf()
+        try:
+            with messung.stoppuhr("Liste: mehrere löschen"):
+                anzahl = eintraege.loeschen_mehrere(self.db_conn, entry_ids)
+            wx.MessageBox(f"{anzahl} von {len(entry_ids)} Einträgen gelöscht.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Löschen der Einträge: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+
+    def spiele_journal_ein(self, rueckgaengig):
+        """
+        Macht die letzte Änderung rückgängig oder wiederholt sie.
+
+        :param rueckgaengig: True für Rückgängig, False für Wiederholen.
+        """
+
+        eintrags_journal = journal.von(self.db_conn)
+        if eintrags_journal is None:
+            return
+        try:
+            if rueckgaengig:
+                eintrags_journal.rueckgaengig(self.db_conn)
+            else:
+                eintrags_journal.wiederholen(self.db_conn)
+        except ValueError as e:
+            wx.MessageBox(f"Die Änderung kann nicht mehr eingespielt werden: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Einspielen der Änderung: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+
     def on_key_pressed(self, event):
         """Behandelt das Tastaturereignis für das Dialogfenster."""
 
         key_code = event.GetKeyCode()
 
+        if key_code != wx.WXK_ESCAPE and wx.Window.FindFocus() is self.serien_liste:
+            # Die Liste der Serientermine behandelt Entf und Enter selbst
+            event.Skip()
+            return
+
         if key_code == wx.WXK_ESCAPE:
             # ESC-Taste zum Schließen des Dialogfensters
             self.Close()
@@ -237,6 +628,11 @@ class AlleAnzeigenDialog(wx.Dialog):
             # Enter-Taste zum Anzeigen der Inhalte des ausgewählten Eintrags
             self.show_entry_contents()
 
+        elif event.ControlDown() and key_code in (ord("Z"), ord("Y")):
+            # Strg+Z zum Rückgängigmachen, Strg+Y zum Wiederholen der letzten Änderung
+            self.spiele_journal_ein(rueckgaengig=key_code == ord("Z"))
+            return
+
         else:
             event.Skip()  # Weitergabe des Ereignisses an das Standardverhalten
 
@@ -247,15 +643,19 @@ class AlleAnzeigenDialog(wx.Dialog):
     def show_entry_contents(self):
         """Öffnet ein Fenster, das die Inhalte des ausgewählten Eintrags anzeigt."""
 
-        selected_index = self.listview.GetFirstSelected()
-        if selected_index != -1:
-            date = self.listview.GetItemText(selected_index)
-            day_of_week = self.listview.GetItem(selected_index, 1).GetText()
-            time = self.listview.GetItem(selected_index, 2).GetText()
-            additional_info = self.listview.GetItem(selected_index, 3).GetText()
-
-            content = f"{date}\n{day_of_week}, {time}\n\n{additional_info}"
-            dialog = EntryContentDialog(self, title="Eintrag anzeigen", content=content)
+        row = self.get_selected_row()
+        if row is not None:
+            try:
+                eintrag = kalender_quellen.lade(self.db_conn, self.cache.quelle(row), row[2])
+            except sqlite3.Error as e:
+                wx.MessageBox(f"Fehler beim Laden des Eintrags: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+                return
+
+            if eintrag is None:
+                wx.MessageBox("Eintrag nicht gefunden.", "Fehler", wx.OK | wx.ICON_ERROR)
+                return
+
+            dialog = EntryContentDialog(self, title="Eintrag anzeigen", content=eintrag.inhalt())
             dialog.Show()
         else:
             wx.MessageBox("Bitte wählen Sie einen Eintrag aus der Liste aus.", "Information", wx.OK | wx.ICON_INFORMATION)
@@ -0,0 +1,10 @@
+# benchmark/__init__.py
+"""
+Benchmarks für die Datenbankpfade der Kalenderanwendung.
+
+Die Skripte laufen ohne wxPython und werden aus dem Verzeichnis `pyKalender` gestartet,
+z. B. `python -m benchmark.listenaktualisierung`. `benchmark.suite` misst alle Pfade für
+mehrere Datenbankgrößen und schreibt die Ergebnisse als JSON, um Verschlechterungen zu
+erkennen. Nur `benchmark.startzeit` startet die Anwendung selbst als eigenen Prozess und
+braucht dafür wxPython bzw. das gepackte Programm.
+"""
@@ -0,0 +1,149 @@
+# benchmark/daten.py
+"""
+Erzeugt synthetische Kalenderdatenbanken für die Benchmarks.
+
+Die Texte folgen grob der Verteilung echter Kalender: überwiegend kurze Einträge mit
+einer Zeile, ein Teil mit einigen Zeilen Notizen und wenige lange Einträge mit mehreren
+Kilobyte (z. B. eingefügte E-Mails). Für große Datenbanken werden die Texte aus einem
+festen Vorrat gezogen und mit einer laufenden Nummer versehen, sodass auch eine Million
+Zeilen in vertretbarer Zeit entstehen.
+
+Dieselben Argumente ergeben dieselbe Datei; mit `vorlage` werden erzeugte Dateien in einem
+Verzeichnis zwischengespeichert und bei weiteren Läufen wiederverwendet.
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+from datetime import date, timedelta
+
+import datenbank
+from eintraege import WOCHENTAGE
+
+WOERTER = ["Termin", "Besprechung", "Arzt", "Geburtstag", "Projekt", "Einkauf", "Anruf",
+           "Team", "Bericht", "Urlaub", "Zahnarzt", "Schule", "Sport", "Abgabe", "Feier",
+           "Müller", "Straße", "Rückruf", "Übergabe", "Kindergarten", "Werkstatt", "Reise"]
+
+# Anteil der Texte je Längenklasse: (Anteil, Zeilen, Wörter je Zeile)
+TEXTKLASSEN = [(0.70, (1, 1), (2, 8)), (0.25, (2, 8), (4, 14)), (0.05, (20, 80), (8, 16))]
+
+TEXTVORRAT = 5000
+
+# Schema-Varianten: "aktuell" ist nach `datenbank.migriere_schema` migriert, "alt" ist die
+# ursprüngliche Tabelle des C#-Kalenders ohne ID (Schema-Version 0)
+SCHEMAS = ("aktuell", "alt")
+
+# Zeitraum, über den sich die Einträge verteilen; fest, damit die Dateien reproduzierbar sind
+BEGINN = date(2020, 1, 1)
+TAGE = 10 * 365
+
+
+def _texte(rnd):
+    """Erzeugt den Vorrat an Texten mit realistischer Längenverteilung."""
+
+    texte = []
+    for _ in range(TEXTVORRAT):
+        auswahl = rnd.random()
+        for anteil, (min_zeilen, max_zeilen), (min_woerter, max_woerter) in TEXTKLASSEN:
+            if auswahl < anteil:
+                break
+            auswahl -= anteil
+        zeilen = [
+            " ".join(rnd.choice(WOERTER) for _ in range(rnd.randint(min_woerter, max_woerter)))
+            for _ in range(rnd.randint(min_zeilen, max_zeilen))
+        ]
+        texte.append("\n".join(zeilen))
+    return texte
+
+
+def zeilen(anzahl, seed=1):
+    """
+    Liefert `anzahl` zufällige Einträge als Tupel (Date, DayOfWeek, Time, AdditionalInfo).
+
+    Args:
+        anzahl (int): Die Anzahl der Einträge.
+        seed (int): Startwert des Zufallsgenerators für reproduzierbare Daten.
+
+    Yields:
+        tuple: Die Spalten eines Eintrags wie in der Tabelle `Entries`.
+    """
+
+    rnd = random.Random(seed)
+    texte = _texte(rnd)
+    tage = [BEGINN + timedelta(days=index) for index in range(TAGE)]
+    datum_texte = [(tag.strftime("%d.%m.%Y"), WOCHENTAGE[tag.weekday()]) for tag in tage]
+    zeiten = [f"{stunde:02d}:{minute:02d}" for stunde in range(24) for minute in range(0, 60, 5)]
+    for nummer in range(anzahl):
+        datum, wochentag = datum_texte[rnd.randrange(TAGE)]
+        yield datum, wochentag, rnd.choice(zeiten), f"{rnd.choice(texte)} Nr. {nummer}"
+
+
+def erzeuge_datenbank(pfad, anzahl, seed=1, schema="aktuell"):
+    """
+    Legt eine Datenbank mit `anzahl` zufälligen Einträgen an.
+
+    Args:
+        pfad (str): Der Pfad der neuen Datenbankdatei.
+        anzahl (int): Die Anzahl der Einträge.
+        seed (int): Startwert des Zufallsgenerators für reproduzierbare Daten.
+        schema (str): "aktuell" für eine migrierte Datei wie nach dem Öffnen in der
+            Anwendung, "alt" für die ursprüngliche Tabelle ohne `ID`.
+    """
+
+    if schema not in SCHEMAS:
+        raise ValueError(f"Unbekanntes Schema: '{schema}'")
+
+    db_conn = sqlite3.connect(pfad)
+    if schema == "alt":
+        db_conn.execute("CREATE TABLE Entries (Date TEXT, DayOfWeek TEXT, Time TEXT, AdditionalInfo TEXT)")
+    else:
+        db_conn.execute("CREATE TABLE Entries (ID INTEGER PRIMARY KEY AUTOINCREMENT, Date TEXT, DayOfWeek TEXT, Time TEXT, AdditionalInfo TEXT)")
+    db_conn.executemany("INSERT INTO Entries (Date, DayOfWeek, Time, AdditionalInfo) VALUES (?, ?, ?, ?)",
+                        zeilen(anzahl, seed))
+    db_conn.commit()
+    if schema == "aktuell":
+        datenbank.migriere_schema(db_conn)
+    db_conn.close()
+
+
+def vorlage(verzeichnis, anzahl, seed=1, schema="aktuell"):
+    """
+    Liefert den Pfad einer erzeugten Datenbank und legt sie nur bei Bedarf an.
+
+    Args:
+        verzeichnis (str): Das Verzeichnis für die zwischengespeicherten Dateien.
+        anzahl (int): Die Anzahl der Einträge.
+        seed (int): Startwert des Zufallsgenerators.
+        schema (str): "aktuell" oder "alt".
+
+    Returns:
+        str: Der Pfad der Datei; sie darf nicht verändert werden, siehe `kopie`.
+    """
+
+    # Die Schema-Version ist Teil des Namens, damit nach einer neuen Migration neu erzeugt wird
+    version = datenbank.SCHEMA_VERSION if schema == "aktuell" else 0
+    pfad = os.path.join(verzeichnis, f"kalender_{schema}_v{version}_{anzahl}_{seed}.db")
+    if not os.path.exists(pfad):
+        temp_pfad = pfad + ".tmp"
+        if os.path.exists(temp_pfad):
+            os.remove(temp_pfad)
+        erzeuge_datenbank(temp_pfad, anzahl, seed, schema)
+        os.replace(temp_pfad, pfad)
+    return pfad
+
+
+def kopie(quelle, ziel):
+    """Kopiert eine Vorlage für eine Messung, die die Datei verändert."""
+
+    loesche(ziel)
+    shutil.copyfile(quelle, ziel)
+    return ziel
+
+
+def loesche(pfad):
+    """Löscht eine Datenbankdatei samt WAL- und SHM-Datei."""
+
+    for endung in ("", "-wal", "-shm"):
+        if os.path.exists(pfad + endung):
+            os.remove(pfad + endung)
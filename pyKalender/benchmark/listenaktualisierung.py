@@ -0,0 +1,88 @@
+# benchmark/listenaktualisierung.py
+"""
+Misst die Aktualisierung der Liste in `AlleAnzeigenDialog` vorher und nachher.
+
+"vorher" bildet den früheren Ablauf nach: alle Zeilen mit `fetchall()` laden, jedes Datum
+mit `strptime` prüfen, danach alle Zeilen erneut parsen und sortieren. Die Kosten für
+`InsertItem`/`SetItem` im `wx.ListCtrl` sind dabei nicht enthalten, der alte Ablauf war in
+der Anwendung also noch langsamer.
+
+"nachher" ist der heutige Ablauf: ein `EintragsCache` mit gefiltertem Zählen und dem Laden
+der ersten sichtbaren Seite über den Index.
+
+Aufruf aus dem Verzeichnis `pyKalender`:
+    python -m benchmark.listenaktualisierung [Anzahl ...]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmark.daten import erzeuge_datenbank
+from eintrags_cache import EintragsCache
+
+# Anzahl der Zeilen, die eine ListView beim Öffnen sichtbar darstellt
+SICHTBARE_ZEILEN = 50
+
+
+def vorher(db_conn):
+    """Früherer Ablauf von `update_listview` und `sort_listview_by_datetime` ohne wx."""
+
+    today = datetime.today().date()
+    cursor = db_conn.cursor()
+    cursor.execute("SELECT Date, DayOfWeek, Time, AdditionalInfo FROM Entries")
+    rows = cursor.fetchall()
+
+    items = []
+    for str_date, day_of_week, str_time, additional_info in rows:
+        entry_date = datetime.strptime(str_date, "%d.%m.%Y").date()
+        if entry_date >= today:
+            items.append((entry_date.strftime("%d.%m.%Y"), day_of_week, str_time, additional_info))
+
+    items_data = [
+        (datetime.strptime(item[0], "%d.%m.%Y"), datetime.strptime(item[2], "%H:%M"), i, item[1], item[3])
+        for i, item in enumerate(items)
+    ]
+    items_data.sort(key=lambda x: (x[0], x[1]))
+    return [(item[0].strftime("%d.%m.%Y"), item[3], item[1].strftime("%H:%M"), item[4]) for item in items_data]
+
+
+def nachher(db_conn):
+    """Heutiger Ablauf: Zählen und erste sichtbare Seite über den Index laden."""
+
+    cache = EintragsCache(db_conn, datetime.today().date().strftime("%Y-%m-%d"))
+    return [cache.zeile(i) for i in range(min(SICHTBARE_ZEILEN, cache.anzahl))]
+
+
+def messe(funktion, db_conn, wiederholungen=3):
+    """Liefert die beste Laufzeit in Millisekunden aus mehreren Wiederholungen."""
+
+    beste = None
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion(db_conn)
+        dauer = (time.perf_counter() - start) * 1000
+        beste = dauer if beste is None else min(beste, dauer)
+    return beste
+
+
+def main(argv):
+    groessen = [int(arg) for arg in argv] or [10_000, 100_000, 1_000_000]
+
+    print(f"{'Einträge':>10} {'vorher (ms)':>14} {'nachher (ms)':>14}")
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        for anzahl in groessen:
+            pfad = os.path.join(verzeichnis, f"kalender_{anzahl}.db")
+            erzeuge_datenbank(pfad, anzahl)
+            db_conn = sqlite3.connect(pfad)
+            dauer_vorher = messe(vorher, db_conn)
+            dauer_nachher = messe(nachher, db_conn)
+            db_conn.close()
+            print(f"{anzahl:>10} {dauer_vorher:>14.1f} {dauer_nachher:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
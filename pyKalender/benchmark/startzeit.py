@@ -0,0 +1,121 @@
+# benchmark/startzeit.py
+"""
+Misst die Zeit vom Programmstart bis zum ersten Zeichnen des Hauptfensters.
+
+Die Anwendung wird mehrfach als eigener Prozess mit `--startzeit DATEI` gestartet (siehe
+`main.py`): Sie schreibt nach dem ersten Zeichnen ihre Messwerte in DATEI und beendet sich.
+Als Zeit bis zum Fenster gilt die Dauer vom Start des Prozesses bis zum Erscheinen der
+Datei. Sie umfasst damit auch den Start des Interpreters bzw. beim gepackten Programm das
+Entpacken durch den PyInstaller-Bootloader, was die Messung innerhalb der Anwendung nicht
+sehen kann. Zusätzlich werden die Startmessungen der Anwendung ("Start: ...") als Median
+ausgegeben.
+
+Liegt der Median über dem Ziel, endet das Skript mit Rückgabewert 1. Der erste Lauf wird
+nicht gewertet, da er Dateien erst in den Cache des Betriebssystems lädt.
+
+Aufruf aus dem Verzeichnis `pyKalender`:
+    python -m benchmark.startzeit [--programm dist/main/main.exe] [--wiederholungen 5]
+        [--ziel-ms 1500] [--json ergebnis.json]
+
+Ohne `--programm` wird `main.py` mit dem aktuellen Interpreter gestartet; dafür muss
+wxPython installiert sein.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ziel für den Median der Zeit bis zum Fenster beim gepackten Programm (main.spec im
+# Modus "schnellstart") auf einem üblichen Büro-PC
+ZIEL_MS = 1500
+
+# Höchstdauer eines Starts, danach gilt er als fehlgeschlagen
+ZEITLIMIT = 60
+
+# Abstand, in dem auf die Ergebnisdatei geprüft wird
+PRUEFINTERVALL = 0.005
+
+
+def starte(befehl, datei):
+    """
+    Startet die Anwendung einmal und wartet auf ihre Messwerte.
+
+    Returns:
+        tuple: (Zeit bis zum Fenster in Millisekunden, Messwerte der Anwendung als dict).
+
+    Raises:
+        RuntimeError: Wenn die Anwendung keine Messwerte schreibt.
+    """
+
+    if os.path.exists(datei):
+        os.remove(datei)
+    beginn = time.perf_counter()
+    prozess = subprocess.Popen(befehl + ["--startzeit", datei])
+    try:
+        while not os.path.exists(datei):
+            if prozess.poll() is not None or time.perf_counter() - beginn > ZEITLIMIT:
+                raise RuntimeError(f"Die Anwendung hat keine Startzeit geschrieben (Rückgabewert {prozess.poll()})")
+            time.sleep(PRUEFINTERVALL)
+        bis_fenster = (time.perf_counter() - beginn) * 1000
+        # Die Anwendung beendet sich nach dem Schreiben; erst dann ist die Datei vollständig
+        prozess.wait(ZEITLIMIT)
+    finally:
+        if prozess.poll() is None:
+            prozess.kill()
+    with open(datei, encoding="utf-8") as f:
+        return bis_fenster, json.load(f)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="benchmark.startzeit", description="Misst die Zeit bis zum Hauptfenster.")
+    parser.add_argument("--programm", help="Gepacktes Programm, z. B. dist/main/main.exe; Standard: main.py")
+    parser.add_argument("--wiederholungen", type=int, default=5, help="Gewertete Starts, Standard 5")
+    parser.add_argument("--ziel-ms", type=float, default=ZIEL_MS, help=f"Ziel für den Median, Standard {ZIEL_MS}")
+    parser.add_argument("--json", help="Ergebnisse als JSON in diese Datei schreiben")
+    args = parser.parse_args(argv)
+
+    befehl = [args.programm] if args.programm else [sys.executable, "main.py"]
+
+    zeiten = []
+    startmessungen = {}
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        datei = os.path.join(verzeichnis, "startzeit.json")
+        for lauf in range(args.wiederholungen + 1):
+            bis_fenster, daten = starte(befehl, datei)
+            if lauf == 0:
+                print(f"Aufwärmen: {bis_fenster:.0f} ms (nicht gewertet)", flush=True)
+                continue
+            zeiten.append(bis_fenster)
+            for wert in daten["zeiten"]:
+                if wert["name"].startswith("Start: "):
+                    startmessungen.setdefault(wert["name"], []).append(wert["summe_ms"])
+            print(f"Lauf {lauf}: {bis_fenster:.0f} ms", flush=True)
+
+    median = statistics.median(zeiten)
+    print(f"\nBis zum Fenster: min {min(zeiten):.0f} ms, Median {median:.0f} ms, Ziel {args.ziel_ms:.0f} ms")
+    for name, werte in sorted(startmessungen.items(), key=lambda eintrag: statistics.median(eintrag[1])):
+        print(f"  {name:<36} {statistics.median(werte):>8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "befehl": befehl,
+                "bis_fenster_ms": zeiten,
+                "median_ms": round(median, 1),
+                "ziel_ms": args.ziel_ms,
+                "startmessungen_ms": {name: round(statistics.median(werte), 3) for name, werte in startmessungen.items()},
+            }, f, ensure_ascii=False, indent=2)
+
+    if median > args.ziel_ms:
+        print(f"Ziel verfehlt: {median:.0f} ms > {args.ziel_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,267 @@
+# benchmark/suite.py
+"""
+Misst die Datenbankpfade der Anwendung ohne Oberfläche und schreibt die Ergebnisse als JSON.
+
+Jede Messung ruft denselben Code auf wie die Dialoge:
+
+- liste_oeffnen: `EintragsCache` ab heute zählen und die erste sichtbare Seite laden
+  (`AlleAnzeigenDialog.update_listview`)
+- liste_sortiert: alle Sortierschlüssel in Listenreihenfolge lesen, wie der `AbfrageWorker`
+  die Liste im Hintergrund füllt (die Sortierung erfolgt über den Index)
+- bearbeiten_laden: Einträge über die ID laden (`BearbeitungsDialog.load_entry`)
+- hinzufuegen, aendern, loeschen: einzelne Änderungen mit Commit über `eintraege`
+- migration: eine Datei im alten Schema ohne ID auf den aktuellen Stand bringen
+- statistik: Kennzahlen und Monatsverteilung (`StatistikDialog`)
+- suche: Volltextsuche nach einem häufigen Wort (`SuchenDialog`)
+
+Schreibende Messungen laufen jeweils auf einer frischen Kopie der Vorlage. Ausgewiesen
+werden Minimum und Median mehrerer Wiederholungen. Mit `--vergleich` wird gegen eine frühere
+Ergebnisdatei geprüft; ist eine Messung um mehr als die Toleranz langsamer, endet das
+Skript mit Rückgabewert 1, sodass es sich in eine automatische Prüfung einbinden lässt.
+
+Aufruf aus dem Verzeichnis `pyKalender`:
+    python -m benchmark.suite [--groessen 1000 10000 100000 1000000] [--json ergebnis.json]
+        [--vergleich basis.json] [--toleranz 1.3] [--vorlagen VERZEICHNIS] [--nur liste_oeffnen ...]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+import datenbank
+import eintraege
+import statistik
+import suche
+from benchmark.daten import kopie, loesche, vorlage
+from eintrags_cache import EintragsCache
+
+STANDARD_GROESSEN = [1_000, 10_000, 100_000, 1_000_000]
+
+# Anzahl der Operationen je Wiederholung bei Einzelzugriffen
+OPERATIONEN = 200
+
+# Anzahl der Zeilen, die eine ListView beim Öffnen sichtbar darstellt
+SICHTBARE_ZEILEN = 50
+
+# Unterschiede unterhalb dieser Dauer gelten beim Vergleich nie als Verschlechterung
+MIN_ABWEICHUNG_MS = 1.0
+
+
+def liste_oeffnen(db_conn, umgebung):
+    """Zählen ab heute und erste sichtbare Seite laden."""
+
+    cache = EintragsCache(db_conn, date.today().isoformat())
+    for index in range(min(SICHTBARE_ZEILEN, cache.anzahl)):
+        cache.zeile(index)
+
+
+def liste_sortiert(db_conn, umgebung):
+    """Alle Sortierschlüssel in Listenreihenfolge stapelweise lesen."""
+
+    cache = EintragsCache(db_conn, zaehlen=False)
+    query, parameter = cache.schluessel_abfrage()
+    cursor = db_conn.cursor()
+    cursor.execute(query, parameter)
+    while True:
+        zeilen = cursor.fetchmany(EintragsCache.SEITENGROESSE * 25)
+        if not zeilen:
+            break
+        cache.ergaenze_schluessel(zeilen)
+    cursor.close()
+
+
+def bearbeiten_laden(db_conn, umgebung):
+    """Zufällige Einträge über die ID laden."""
+
+    for entry_id in umgebung["ids"]:
+        eintraege.lade(db_conn, entry_id)
+
+
+def hinzufuegen(db_conn, umgebung):
+    """Einzelne Einträge mit Commit hinzufügen."""
+
+    for nummer in range(OPERATIONEN):
+        date_text = f"{nummer % 28 + 1:02d}.{nummer % 12 + 1:02d}.2030"
+        eintraege.hinzufuegen(db_conn, date_text, eintraege.wochentag(date_text), "12:00", f"Benchmark {nummer}")
+
+
+def aendern(db_conn, umgebung):
+    """Einzelne Einträge mit Commit ändern."""
+
+    for nummer, entry_id in enumerate(umgebung["ids"]):
+        eintraege.aendern(db_conn, entry_id, "15.06.2031", "Sonntag", f"{nummer % 24:02d}:00", "geändert")
+
+
+def loeschen(db_conn, umgebung):
+    """Einzelne Einträge mit Commit löschen."""
+
+    for entry_id in umgebung["ids"]:
+        eintraege.loeschen(db_conn, entry_id)
+
+
+def migration(db_conn, umgebung):
+    """Datei im alten Schema ohne ID migrieren."""
+
+    datenbank.migriere_schema(db_conn)
+
+
+def statistik_lesen(db_conn, umgebung):
+    """Kennzahlen und Monatsverteilung lesen."""
+
+    statistik.sammle_statistik(db_conn, umgebung["pfad"])
+    statistik.monatsverteilung(db_conn)
+
+
+def volltextsuche(db_conn, umgebung):
+    """Volltextsuche nach einem häufigen Wort."""
+
+    suche.suche(db_conn, "Zahnarzt")
+
+
+# Name, Funktion, Schema der Vorlage, verändert die Datei
+MESSUNGEN = [
+    ("liste_oeffnen", liste_oeffnen, "aktuell", False),
+    ("liste_sortiert", liste_sortiert, "aktuell", False),
+    ("bearbeiten_laden", bearbeiten_laden, "aktuell", False),
+    ("hinzufuegen", hinzufuegen, "aktuell", True),
+    ("aendern", aendern, "aktuell", True),
+    ("loeschen", loeschen, "aktuell", True),
+    ("migration", migration, "alt", True),
+    ("statistik", statistik_lesen, "aktuell", False),
+    ("suche", volltextsuche, "aktuell", False),
+]
+
+
+def _zufaellige_ids(pfad, seed):
+    """Wählt reproduzierbar `OPERATIONEN` vorhandene IDs aus."""
+
+    db_conn = sqlite3.connect(pfad)
+    hoechste_id = db_conn.execute("SELECT MAX(ID) FROM Entries").fetchone()[0]
+    db_conn.close()
+    rnd = random.Random(seed)
+    return rnd.sample(range(1, hoechste_id + 1), min(OPERATIONEN, hoechste_id))
+
+
+def messe(name, funktion, schema, veraendert, anzahl, verzeichnis, vorlagen, wiederholungen):
+    """
+    Führt eine Messung mehrfach aus.
+
+    Returns:
+        dict: Das Ergebnis mit Minimum und Median in Millisekunden.
+    """
+
+    quelle = vorlage(vorlagen, anzahl, schema=schema)
+    umgebung = {"pfad": quelle}
+    if schema == "aktuell":
+        umgebung["ids"] = _zufaellige_ids(quelle, seed=anzahl)
+
+    zeiten = []
+    arbeitskopie = os.path.join(verzeichnis, "arbeitskopie.db")
+    for _ in range(wiederholungen):
+        pfad = kopie(quelle, arbeitskopie) if veraendert else quelle
+        umgebung["pfad"] = pfad
+        db_conn = datenbank.verbinde(pfad)
+        try:
+            beginn = time.perf_counter()
+            funktion(db_conn, umgebung)
+            zeiten.append((time.perf_counter() - beginn) * 1000)
+        finally:
+            db_conn.close()
+        if veraendert:
+            loesche(arbeitskopie)
+
+    return {
+        "messung": name,
+        "anzahl": anzahl,
+        "schema": schema,
+        "wiederholungen": wiederholungen,
+        "min_ms": round(min(zeiten), 3),
+        "median_ms": round(statistics.median(zeiten), 3),
+    }
+
+
+def vergleiche(ergebnisse, basis, toleranz):
+    """
+    Vergleicht die Ergebnisse mit einer früheren Ergebnisdatei.
+
+    Returns:
+        list: Meldungen zu Messungen, die um mehr als die Toleranz langsamer sind.
+    """
+
+    frueher = {(wert["messung"], wert["anzahl"]): wert["min_ms"] for wert in basis["ergebnisse"]}
+    meldungen = []
+    for wert in ergebnisse:
+        alt = frueher.get((wert["messung"], wert["anzahl"]))
+        if alt is None:
+            continue
+        if wert["min_ms"] > alt * toleranz and wert["min_ms"] - alt > MIN_ABWEICHUNG_MS:
+            meldungen.append(f"{wert['messung']} ({wert['anzahl']}): {alt:.1f} ms -> {wert['min_ms']:.1f} ms")
+    return meldungen
+
+
+def umgebungsdaten():
+    """Beschreibt die Laufzeitumgebung für die Ergebnisdatei."""
+
+    return {
+        "zeitpunkt": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "system": platform.platform(),
+        "prozessor": platform.processor() or platform.machine(),
+        "profil": datenbank.STANDARD_PROFIL,
+        "schema_version": datenbank.SCHEMA_VERSION,
+    }
+
+
+def main(argv):
+    namen = [name for name, _, _, _ in MESSUNGEN]
+    parser = argparse.ArgumentParser(prog="benchmark.suite", description="Misst die Datenbankpfade der Anwendung.")
+    parser.add_argument("--groessen", type=int, nargs="+", default=STANDARD_GROESSEN, help="Anzahl der Einträge")
+    parser.add_argument("--wiederholungen", type=int, default=3, help="Wiederholungen je Messung, Standard 3")
+    parser.add_argument("--nur", nargs="+", choices=namen, metavar="MESSUNG", help=f"Nur diese Messungen: {', '.join(namen)}")
+    parser.add_argument("--json", help="Ergebnisse als JSON in diese Datei schreiben")
+    parser.add_argument("--vergleich", help="Frühere Ergebnisdatei, gegen die geprüft wird")
+    parser.add_argument("--toleranz", type=float, default=1.3, help="Erlaubter Faktor gegenüber --vergleich, Standard 1.3")
+    parser.add_argument("--vorlagen", help="Verzeichnis, in dem erzeugte Datenbanken wiederverwendet werden")
+    args = parser.parse_args(argv)
+
+    basis = None
+    if args.vergleich:
+        with open(args.vergleich, encoding="utf-8") as f:
+            basis = json.load(f)
+
+    ergebnisse = []
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        vorlagen = args.vorlagen or verzeichnis
+        os.makedirs(vorlagen, exist_ok=True)
+        print(f"{'Messung':<18} {'Einträge':>10} {'min (ms)':>12} {'Median (ms)':>12}")
+        for anzahl in args.groessen:
+            for name, funktion, schema, veraendert in MESSUNGEN:
+                if args.nur and name not in args.nur:
+                    continue
+                ergebnis = messe(name, funktion, schema, veraendert, anzahl, verzeichnis, vorlagen, args.wiederholungen)
+                ergebnisse.append(ergebnis)
+                print(f"{name:<18} {anzahl:>10} {ergebnis['min_ms']:>12.1f} {ergebnis['median_ms']:>12.1f}", flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"umgebung": umgebungsdaten(), "ergebnisse": ergebnisse}, f, ensure_ascii=False, indent=2)
+
+    if basis is not None:
+        meldungen = vergleiche(ergebnisse, basis, args.toleranz)
+        for meldung in meldungen:
+            print(f"Verschlechterung: {meldung}", file=sys.stderr)
+        return 1 if meldungen else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
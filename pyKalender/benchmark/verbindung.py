@@ -0,0 +1,105 @@
+# benchmark/verbindung.py
+"""
+Misst den Einfluss der Verbindungsprofile aus `datenbank.VERBINDUNGSPROFILE`.
+
+Für jedes Profil werden auf einer frischen Kopie derselben Datenbank gemessen:
+
+- Einfügen: einzelne INSERTs mit Commit nach jedem Eintrag (wie `HinzufuegenDialog`)
+- Ändern: einzelne UPDATEs über die ID mit Commit (wie `BearbeitungsDialog`)
+- Gesamtliste: alle Sortierschlüssel in Listenreihenfolge lesen (wie das Laden im Hintergrund)
+- Seiten: zufällige Seiten der Liste über den `EintragsCache` laden
+
+Aufruf aus dem Verzeichnis `pyKalender`:
+    python -m benchmark.verbindung [Anzahl]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import datenbank
+from benchmark.daten import erzeuge_datenbank
+from eintrags_cache import EintragsCache
+
+SCHREIBVORGAENGE = 500
+SEITENZUGRIFFE = 200
+
+
+def einfuegen(db_conn):
+    """Einzelne INSERTs mit Commit nach jedem Eintrag."""
+
+    cursor = db_conn.cursor()
+    for i in range(SCHREIBVORGAENGE):
+        cursor.execute("INSERT INTO Entries (Date, DayOfWeek, Time, AdditionalInfo) VALUES (?, ?, ?, ?)",
+                       (f"{i % 28 + 1}.{i % 12 + 1}.2030", "Montag", "12:00", "Benchmark"))
+        db_conn.commit()
+
+
+def aendern(db_conn):
+    """Einzelne UPDATEs über die ID mit Commit nach jeder Änderung."""
+
+    cursor = db_conn.cursor()
+    hoechste_id = cursor.execute("SELECT MAX(ID) FROM Entries").fetchone()[0]
+    rnd = random.Random(2)
+    for _ in range(SCHREIBVORGAENGE):
+        cursor.execute("UPDATE Entries SET Time = ?, AdditionalInfo = ? WHERE ID = ?",
+                       (f"{rnd.randrange(24):02d}:00", "geändert", rnd.randint(1, hoechste_id)))
+        db_conn.commit()
+
+
+def gesamtliste(db_conn):
+    """Alle Sortierschlüssel stapelweise in Listenreihenfolge lesen."""
+
+    cache = EintragsCache(db_conn, zaehlen=False)
+    query, parameter = cache.schluessel_abfrage()
+    cursor = db_conn.cursor()
+    cursor.execute(query, parameter)
+    while True:
+        zeilen = cursor.fetchmany(EintragsCache.SEITENGROESSE * 25)
+        if not zeilen:
+            break
+        cache.ergaenze_schluessel(zeilen)
+
+
+def seiten(db_conn):
+    """Zufällige Seiten über den `EintragsCache` laden."""
+
+    cache = EintragsCache(db_conn)
+    rnd = random.Random(3)
+    for _ in range(SEITENZUGRIFFE):
+        cache.zeile(rnd.randrange(cache.anzahl))
+
+
+MESSUNGEN = [("Einfügen", einfuegen), ("Ändern", aendern), ("Gesamtliste", gesamtliste), ("Seiten", seiten)]
+
+
+def main(argv):
+    anzahl = int(argv[0]) if argv else 100_000
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        vorlage = os.path.join(verzeichnis, "vorlage.db")
+        erzeuge_datenbank(vorlage, anzahl)
+
+        print(f"{anzahl} Einträge, Zeiten in ms")
+        print(f"{'Profil':<12}" + "".join(f"{name:>14}" for name, _ in MESSUNGEN))
+        for profil in datenbank.VERBINDUNGSPROFILE:
+            ergebnisse = []
+            for _, messung in MESSUNGEN:
+                pfad = os.path.join(verzeichnis, f"{profil}.db")
+                shutil.copyfile(vorlage, pfad)
+                db_conn = datenbank.verbinde(pfad, profil)
+                start = time.perf_counter()
+                messung(db_conn)
+                ergebnisse.append((time.perf_counter() - start) * 1000)
+                db_conn.close()
+                for endung in ("", "-wal", "-shm"):
+                    if os.path.exists(pfad + endung):
+                        os.remove(pfad + endung)
+            print(f"{profil:<12}" + "".join(f"{dauer:>14.1f}" for dauer in ergebnisse))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,250 @@
+# cli.py
+"""
+Kommandozeile für die Kalender-Datenbank ohne grafische Oberfläche.
+
+Das Skript importiert kein wx und eignet sich damit für Skripte und geplante Aufgaben auf
+Rechnern ohne Anzeige. Es verwendet dieselben Module wie die Dialoge (`eintraege`, `suche`,
+`importieren`, `exportieren`, `statistik`). Module, die nur einzelne Befehle benötigen,
+werden erst beim Ausführen des Befehls geladen, damit der Start schnell bleibt.
+
+Beispiele:
+    python cli.py kalender.db add 24.12.2025 --zeit 18:00 "Bescherung"
+    python cli.py kalender.db add 5.1.2026 --zeit 9:30 --wiederholung woechentlich --intervall 2 "Jour fixe"
+    python cli.py kalender.db list --von 1.12.2025 --bis 31.12.2025
+    python cli.py kalender.db search Zahnarzt
+    python cli.py kalender.db delete 42
+    python cli.py kalender.db import termine.ics
+    python cli.py kalender.db export sicherung.jsonl
+    python cli.py kalender.db stats --monate
+    python cli.py kalender.db --messung messung.json list > /dev/null
+
+Rückgabewerte: 0 bei Erfolg, 1 bei einem Fehler, 2 bei falschem Aufruf.
+"""
+
+import argparse
+import sqlite3
+import sys
+
+import datenbank
+
+# Werte für "add --wiederholung"; die Frequenzen stehen in `wiederholungen`
+WIEDERHOLUNGEN = {"taeglich": "DAILY", "woechentlich": "WEEKLY", "monatlich": "MONTHLY", "jaehrlich": "YEARLY"}
+
+
+def _datum(text):
+    """Wandelt ein Datumsargument in ein `datetime.date` um (für argparse)."""
+
+    from importieren import parse_datum
+
+    datum = parse_datum(text)
+    if datum is None:
+        raise argparse.ArgumentTypeError(f"Ungültiges Datum: '{text}' (erwartet TT.MM.JJJJ oder JJJJ-MM-TT)")
+    return datum
+
+
+def _erste_zeile(text, laenge=80):
+    """Liefert die erste Zeile eines Textes, gekürzt auf `laenge` Zeichen."""
+
+    zeile = (text or "").split("\n", 1)[0]
+    return zeile if len(zeile) <= laenge else zeile[:laenge - 1] + "…"
+
+
+def befehl_add(db_conn, args):
+    """Fügt einen Eintrag oder eine Serie hinzu und gibt die ID aus."""
+
+    import eintraege
+    from importieren import parse_uhrzeit
+
+    uhrzeit = parse_uhrzeit(args.zeit)
+    if uhrzeit is None:
+        print(f"Ungültige Uhrzeit: '{args.zeit}'", file=sys.stderr)
+        return 1
+    if args.wiederholung:
+        import wiederholungen
+        regel_id = wiederholungen.anlegen(db_conn, WIEDERHOLUNGEN[args.wiederholung], args.datum, uhrzeit[0],
+                                          args.text, args.intervall, args.bis, args.anzahl)
+        print(f"Serie {regel_id}")
+        return 0
+    date = eintraege.datum_text(args.datum)
+    entry_id = eintraege.hinzufuegen(db_conn, date, eintraege.wochentag(date), uhrzeit[0], args.text)
+    print(entry_id)
+    return 0
+
+
+def befehl_list(db_conn, args):
+    """Gibt die Einträge eines Zeitraums tabellarisch oder als JSON Lines aus."""
+
+    from exportieren import JsonlSchreiber, lies_eintraege
+
+    schreiber = JsonlSchreiber(sys.stdout) if args.json else None
+    anzahl = 0
+    for stapel in lies_eintraege(db_conn, args.von, args.bis):
+        for zeile in stapel:
+            if args.limit is not None and anzahl >= args.limit:
+                return 0
+            if schreiber is not None:
+                schreiber.schreibe(zeile)
+            else:
+                entry_id, date, day_of_week, time, additional_info, _, _ = zeile
+                print(f"{entry_id}\t{date}\t{day_of_week}\t{time}\t{_erste_zeile(additional_info)}")
+            anzahl += 1
+    return 0
+
+
+def befehl_search(db_conn, args):
+    """Durchsucht die zusätzlichen Informationen und gibt die Treffer nach Relevanz aus."""
+
+    import suche
+
+    for entry_id, date, day_of_week, time, ausschnitt in suche.suche(db_conn, " ".join(args.begriffe), args.limit):
+        print(f"{entry_id}\t{date}\t{day_of_week}\t{time}\t{_erste_zeile(ausschnitt.replace(chr(10), ' '), 120)}")
+    return 0
+
+
+def befehl_delete(db_conn, args):
+    """Löscht Einträge über ihre ID."""
+
+    import eintraege
+
+    with eintraege.transaktion(db_conn):
+        fehlend = [entry_id for entry_id in args.ids if not eintraege.loeschen(db_conn, entry_id)]
+    for entry_id in fehlend:
+        print(f"Eintrag {entry_id} nicht gefunden", file=sys.stderr)
+    return 1 if fehlend else 0
+
+
+def befehl_import(db_conn, args):
+    """Importiert eine CSV- oder iCalendar-Datei."""
+
+    import importieren
+
+    anzahl, fehler = importieren.importiere_datei(db_conn, args.datei)
+    print(f"{anzahl} Einträge importiert")
+    for zeile, meldung in fehler.meldungen:
+        print(f"Zeile {zeile}: {meldung}", file=sys.stderr)
+    if fehler.anzahl > len(fehler.meldungen):
+        print(f"... insgesamt {fehler.anzahl} ungültige Zeilen übersprungen", file=sys.stderr)
+    return 0
+
+
+def befehl_export(db_conn, args):
+    """Exportiert die Einträge eines Zeitraums als CSV, iCalendar oder JSON Lines."""
+
+    import exportieren
+
+    anzahl, uebersprungen = exportieren.exportiere_datei(db_conn, args.datei, args.von, args.bis)
+    print(f"{anzahl} Einträge exportiert nach {args.datei}")
+    if uebersprungen:
+        print(f"{uebersprungen} Einträge mit ungültigem Datum übersprungen", file=sys.stderr)
+    return 0
+
+
+def befehl_stats(db_conn, args):
+    """Gibt die Kennzahlen der Datenbank und optional die Monatsverteilung aus."""
+
+    import statistik
+
+    for bezeichnung, wert in statistik.sammle_statistik(db_conn, args.db_datei):
+        print(f"{bezeichnung}: {wert}")
+    if args.monate:
+        print()
+        for monat, anzahl in statistik.monatsverteilung(db_conn):
+            print(f"{statistik.formatiere_datum(monat)}\t{anzahl}")
+    return 0
+
+
+def erstelle_parser():
+    """Erstellt den Parser für die Argumente und Unterbefehle."""
+
+    parser = argparse.ArgumentParser(prog="cli.py", description="Kalender-Datenbank ohne Oberfläche bearbeiten.")
+    parser.add_argument("db_datei", help="Die SQLite-Datenbankdatei")
+    parser.add_argument("--messung", metavar="DATEI", help="Laufzeitmessungen als JSON in DATEI schreiben")
+    befehle = parser.add_subparsers(dest="befehl", required=True, metavar="BEFEHL")
+
+    add = befehle.add_parser("add", help="Eintrag hinzufügen")
+    add.add_argument("datum", type=_datum, help="Datum (TT.MM.JJJJ)")
+    add.add_argument("text", help="Zusätzliche Informationen")
+    add.add_argument("--zeit", default="00:00", help="Uhrzeit (HH:MM), Standard 00:00")
+    add.add_argument("--wiederholung", choices=WIEDERHOLUNGEN, help="Als Serie ab dem Datum anlegen")
+    add.add_argument("--intervall", type=int, default=1, help="Abstand der Serientermine, Standard 1")
+    add.add_argument("--bis", type=_datum, help="Letzter möglicher Serientermin")
+    add.add_argument("--anzahl", type=int, help="Höchstzahl der Serientermine")
+    add.set_defaults(funktion=befehl_add)
+
+    liste = befehle.add_parser("list", help="Einträge auflisten")
+    liste.add_argument("--von", type=_datum, help="Erster Tag")
+    liste.add_argument("--bis", type=_datum, help="Letzter Tag")
+    liste.add_argument("--limit", type=int, help="Höchstzahl der Einträge")
+    liste.add_argument("--json", action="store_true", help="Ausgabe als JSON Lines")
+    liste.set_defaults(funktion=befehl_list)
+
+    search = befehle.add_parser("search", help="Volltextsuche")
+    search.add_argument("begriffe", nargs="+", help="Suchbegriffe")
+    search.add_argument("--limit", type=int, default=50, help="Höchstzahl der Treffer, Standard 50")
+    search.set_defaults(funktion=befehl_search)
+
+    delete = befehle.add_parser("delete", help="Einträge löschen")
+    delete.add_argument("ids", type=int, nargs="+", help="IDs der Einträge")
+    delete.set_defaults(funktion=befehl_delete)
+
+    imp = befehle.add_parser("import", help="CSV- oder iCalendar-Datei importieren")
+    imp.add_argument("datei", help="Die .csv- oder .ics-Datei")
+    imp.set_defaults(funktion=befehl_import)
+
+    exp = befehle.add_parser("export", help="Einträge exportieren")
+    exp.add_argument("datei", help="Die Zieldatei (.csv, .ics, .jsonl oder .json)")
+    exp.add_argument("--von", type=_datum, help="Erster Tag")
+    exp.add_argument("--bis", type=_datum, help="Letzter Tag")
+    exp.set_defaults(funktion=befehl_export)
+
+    stats = befehle.add_parser("stats", help="Kennzahlen der Datenbank anzeigen")
+    stats.add_argument("--monate", action="store_true", help="Zusätzlich die Einträge je Monat")
+    stats.set_defaults(funktion=befehl_stats)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Führt einen Befehl der Kommandozeile aus.
+
+    Args:
+        argv (list): Die Argumente ohne Programmnamen; None für `sys.argv[1:]`.
+
+    Returns:
+        int: Der Rückgabewert für das Betriebssystem.
+    """
+
+    args = erstelle_parser().parse_args(argv)
+
+    try:
+        db_conn = datenbank.verbinde(args.db_datei)
+    except sqlite3.Error as e:
+        print(f"Fehler beim Öffnen der Datenbank: {e}", file=sys.stderr)
+        return 1
+
+    if args.messung:
+        import messung
+        messung.verfolge(db_conn)
+
+    try:
+        datenbank.migriere_schema(db_conn)
+        if args.messung:
+            with messung.stoppuhr(f"Befehl: {args.befehl}"):
+                return args.funktion(db_conn, args)
+        return args.funktion(db_conn, args)
+    except BrokenPipeError:
+        # Ausgabe wurde vorzeitig geschlossen, z. B. durch "| head"
+        return 0
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.messung:
+            messung.verfolge(db_conn, False)
+            messung.speichere_json(args.messung)
+        db_conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
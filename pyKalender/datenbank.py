@@ -0,0 +1,502 @@
+# datenbank.py
+"""
+Dieses Modul enthält die versionierten Schema-Migrationen für die Tabelle `Entries`.
+
+Die Schema-Version einer Datei wird in `PRAGMA user_version` gespeichert. `migriere_schema`
+führt beim Öffnen einmalig alle ausstehenden Schritte aus:
+
+1. Anlegen der Tabelle bzw. Ergänzen der AUTOINCREMENT-Spalte `ID` bei älteren Dateien.
+2. Datum und Uhrzeit werden als Text im Format "TT.MM.JJJJ" bzw. "HH:MM" gespeichert und
+   lassen sich in SQL weder sortieren noch nach Bereichen filtern. Die Tabelle erhält
+   deshalb die sortierbaren Spalten `DateKey` (ISO-Datum "JJJJ-MM-TT") und `TimeKey`
+   (Minuten seit Mitternacht), die per Trigger mit `Date`/`Time` synchron gehalten werden,
+   sowie einen Index darüber.
+3. Volltextsuche über `AdditionalInfo` mit der FTS5-Tabelle `Entries_fts`. Ohne FTS5
+   fehlt sie; sie wird beim ersten Öffnen mit FTS5 nachgetragen.
+4. Anzahl der Einträge je Tag in der Tabelle `DayCounts`.
+5. Der Insert-Trigger für die Sortierschlüssel greift nur noch, wenn sie beim Einfügen
+   fehlen, sodass der Import sie direkt mitschreiben kann.
+6. Serientermine in den Tabellen `Recurrences` und `RecurrenceExceptions` (siehe `wiederholungen`).
+
+Außerdem stellt `verbinde` die Datenbankverbindung mit einem einstellbaren Verbindungsprofil
+(Journal-Modus, Synchronisierung, Speicher-Mapping, Seiten-Cache) her.
+
+Die Trigger verwenden ausschließlich eingebaute SQL-Funktionen, damit auch andere
+Anwendungen (z. B. der C#-Kalender) dieselbe Datenbankdatei weiter beschreiben können.
+"""
+
+import contextlib
+import sqlite3
+
+
+# Verbindungsprofile; None bedeutet SQLite-Standardwert
+VERBINDUNGSPROFILE = {
+    "standard": {
+        "journal_mode": None,
+        "synchronous": None,
+        "mmap_size": None,
+        "cache_size": None,
+        "temp_store": None,
+        "cached_statements": 128,
+    },
+    "optimiert": {
+        # Leser und Schreiber (z. B. AbfrageWorker und Dialoge) blockieren sich nicht
+        "journal_mode": "WAL",
+        # Im WAL-Modus sicher, spart ein fsync pro Commit
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        # Negativer Wert: Größe in KiB (64 MB)
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "cached_statements": 512,
+    },
+}
+
+STANDARD_PROFIL = "optimiert"
+
+
+def verbinde(db_datei, profil=STANDARD_PROFIL):
+    """
+    Öffnet eine Datenbankverbindung und wendet das Verbindungsprofil an.
+
+    Args:
+        db_datei (str): Der Pfad zur SQLite-Datenbankdatei.
+        profil (str | dict): Name eines Profils aus `VERBINDUNGSPROFILE` oder ein eigenes
+            Profil; fehlende Einstellungen werden aus dem Profil "standard" ergänzt.
+
+    Returns:
+        sqlite3.Connection: Die geöffnete Verbindung.
+    """
+
+    if isinstance(profil, str):
+        profil = VERBINDUNGSPROFILE[profil]
+    einstellungen = dict(VERBINDUNGSPROFILE["standard"], **profil)
+
+    db_conn = sqlite3.connect(db_datei, cached_statements=einstellungen["cached_statements"])
+    for pragma in ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store"):
+        wert = einstellungen[pragma]
+        if wert is not None:
+            db_conn.execute(f"PRAGMA {pragma} = {wert}")
+    return db_conn
+
+
+def datum_schluessel_sql(spalte):
+    """
+    Liefert einen SQL-Ausdruck, der ein Datum "T.M.JJJJ" in den ISO-Schlüssel umwandelt.
+
+    Führende Nullen sind optional. Ungültige Werte ergeben einen leeren Text.
+
+    Args:
+        spalte (str): Der SQL-Ausdruck mit dem Datum, z. B. "NEW.Date".
+
+    Returns:
+        str: Der SQL-Ausdruck für den Datumsschlüssel.
+    """
+
+    tag = f"substr({spalte}, 1, instr({spalte}, '.') - 1)"
+    rest = f"substr({spalte}, instr({spalte}, '.') + 1)"
+    monat = f"substr({rest}, 1, instr({rest}, '.') - 1)"
+    jahr = f"substr({rest}, instr({rest}, '.') + 1)"
+    iso = f"printf('%04d-%02d-%02d', {jahr}, {monat}, {tag})"
+    return f"(CASE WHEN instr({rest}, '.') > 0 AND date({iso}, '+0 days') = {iso} THEN {iso} ELSE '' END)"
+
+
+def zeit_schluessel_sql(spalte):
+    """
+    Liefert einen SQL-Ausdruck, der eine Uhrzeit "H:MM" in Minuten seit Mitternacht umwandelt.
+
+    Ungültige Werte ergeben -1.
+
+    Args:
+        spalte (str): Der SQL-Ausdruck mit der Uhrzeit, z. B. "NEW.Time".
+
+    Returns:
+        str: Der SQL-Ausdruck für den Zeitschlüssel.
+    """
+
+    trenner = f"instr({spalte}, ':')"
+    stunden = f"CAST(substr({spalte}, 1, {trenner} - 1) AS INTEGER)"
+    minuten = f"CAST(substr({spalte}, {trenner} + 1) AS INTEGER)"
+    return f"(CASE WHEN {trenner} > 0 THEN {stunden} * 60 + {minuten} ELSE -1 END)"
+
+
+def _migration_id_spalte(cursor, melde):
+    """
+    Version 1: Stellt sicher, dass `Entries` mit einer AUTOINCREMENT-Spalte `ID` existiert.
+
+    Fehlt die Tabelle, wird sie angelegt. Ältere Dateien ohne `ID` werden in eine neue
+    Tabelle kopiert, die alte gelöscht und die neue umbenannt.
+    """
+
+    cursor.execute("PRAGMA table_info(Entries)")
+    vorhandene_spalten = [column[1] for column in cursor.fetchall()]
+
+    if not vorhandene_spalten:
+        cursor.execute(
+            "CREATE TABLE Entries (ID INTEGER PRIMARY KEY AUTOINCREMENT, Date TEXT, DayOfWeek TEXT, Time TEXT, AdditionalInfo TEXT)"
+        )
+    elif 'ID' not in vorhandene_spalten:
+        cursor.execute(
+            "CREATE TABLE temp_Entries (ID INTEGER PRIMARY KEY AUTOINCREMENT, Date TEXT, DayOfWeek TEXT, Time TEXT, AdditionalInfo TEXT)"
+        )
+        cursor.execute(
+            "INSERT INTO temp_Entries (Date, DayOfWeek, Time, AdditionalInfo) "
+            "SELECT Date, DayOfWeek, Time, AdditionalInfo FROM Entries"
+        )
+        cursor.execute("DROP TABLE Entries")
+        cursor.execute("ALTER TABLE temp_Entries RENAME TO Entries")
+
+
+def _migration_sortierschluessel(cursor, melde):
+    """
+    Version 2: Ergänzt `Entries` um die Spalten `DateKey`/`TimeKey`, Trigger und Index.
+
+    Bestehende Einträge werden mit einem einzigen UPDATE nachgetragen.
+    """
+
+    cursor.execute("PRAGMA table_info(Entries)")
+    vorhandene_spalten = [column[1] for column in cursor.fetchall()]
+
+    if 'DateKey' not in vorhandene_spalten:
+        cursor.execute("ALTER TABLE Entries ADD COLUMN DateKey TEXT")
+        cursor.execute("ALTER TABLE Entries ADD COLUMN TimeKey INTEGER")
+        # Bestehende Einträge in einem Durchlauf nachtragen
+        cursor.execute(
+            f"UPDATE Entries SET DateKey = {datum_schluessel_sql('Date')}, "
+            f"TimeKey = {zeit_schluessel_sql('Time')}"
+        )
+
+    schluessel_update = (
+        f"UPDATE Entries SET DateKey = {datum_schluessel_sql('NEW.Date')}, "
+        f"TimeKey = {zeit_schluessel_sql('NEW.Time')} WHERE rowid = NEW.rowid;"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS Entries_Schluessel_Insert AFTER INSERT ON Entries "
+        f"BEGIN {schluessel_update} END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS Entries_Schluessel_Update AFTER UPDATE OF Date, Time ON Entries "
+        f"BEGIN {schluessel_update} END"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_Entries_DateKey ON Entries (DateKey, TimeKey)")
+
+
+# Anzahl der Einträge, die beim Aufbau des Suchindex pro Stapel indiziert werden
+FTS_STAPELGROESSE = 20_000
+
+# Größte mögliche ID (INTEGER PRIMARY KEY ist ein 64-Bit-Wert)
+MAX_ID = 2 ** 63 - 1
+
+
+def fts5_verfuegbar(cursor):
+    """
+    Prüft, ob die SQLite-Bibliothek das Modul FTS5 enthält.
+
+    Args:
+        cursor (sqlite3.Cursor): Ein Cursor der Datenbankverbindung.
+
+    Returns:
+        bool: True, wenn FTS5-Tabellen angelegt werden können.
+    """
+
+    cursor.execute("PRAGMA compile_options")
+    return any(option[0] == "ENABLE_FTS5" for option in cursor.fetchall())
+
+
+def _migration_volltextsuche(cursor, melde):
+    """
+    Version 3: Legt den FTS5-Suchindex `Entries_fts` über `AdditionalInfo` an.
+
+    Der Index speichert nur die Suchbegriffe (External Content) und wird per Trigger mit
+    `Entries` synchron gehalten. Bestehende Einträge werden stapelweise nach ID indiziert.
+    Ohne FTS5 wird der Schritt übersprungen; die Suche greift dann auf LIKE zurück, bis
+    `migriere_schema` den Index mit einer SQLite-Bibliothek mit FTS5 nachträgt. Besteht der
+    Index bereits, ändert der Schritt nichts.
+    """
+
+    import suche
+
+    if not fts5_verfuegbar(cursor) or suche.hat_suchindex(cursor.connection):
+        return
+
+    cursor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS Entries_fts USING fts5("
+        "AdditionalInfo, content='Entries', content_rowid='ID', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS Entries_fts_Insert AFTER INSERT ON Entries BEGIN "
+        "INSERT INTO Entries_fts (rowid, AdditionalInfo) VALUES (NEW.ID, NEW.AdditionalInfo); END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS Entries_fts_Delete AFTER DELETE ON Entries BEGIN "
+        "INSERT INTO Entries_fts (Entries_fts, rowid, AdditionalInfo) VALUES ('delete', OLD.ID, OLD.AdditionalInfo); END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS Entries_fts_Update AFTER UPDATE OF AdditionalInfo ON Entries BEGIN "
+        "INSERT INTO Entries_fts (Entries_fts, rowid, AdditionalInfo) VALUES ('delete', OLD.ID, OLD.AdditionalInfo); "
+        "INSERT INTO Entries_fts (rowid, AdditionalInfo) VALUES (NEW.ID, NEW.AdditionalInfo); END"
+    )
+
+    # Bestehende Einträge stapelweise nach ID indizieren
+    cursor.execute("SELECT COUNT(*) FROM Entries")
+    gesamt = cursor.fetchone()[0]
+    indiziert = 0
+    letzte_id = 0
+    while True:
+        cursor.execute("SELECT ID FROM Entries WHERE ID > ? ORDER BY ID LIMIT 1 OFFSET ?",
+                       (letzte_id, FTS_STAPELGROESSE - 1))
+        grenze = cursor.fetchone()
+        # Der letzte Stapel reicht bis zur größten ID
+        bis_id = grenze[0] if grenze else MAX_ID
+        cursor.execute(
+            "INSERT INTO Entries_fts (rowid, AdditionalInfo) "
+            "SELECT ID, AdditionalInfo FROM Entries WHERE ID > ? AND ID <= ?",
+            (letzte_id, bis_id)
+        )
+        indiziert += cursor.rowcount
+        melde(f"Suchindex wird aufgebaut... {indiziert} von {gesamt} Einträgen")
+        if grenze is None:
+            break
+        letzte_id = bis_id
+
+
+def _migration_tageszaehler(cursor, melde):
+    """
+    Version 4: Legt die Tabelle `DayCounts` mit der Anzahl der Einträge pro Tag an.
+
+    Die Zähler werden per Trigger bei jeder Änderung von `DateKey` fortgeschrieben, sodass
+    Gesamtzahl sowie Tages- und Monatsverteilung ohne Durchlauf durch `Entries` gelesen
+    werden können. Bestehende Einträge werden einmalig über den Index gezählt.
+    """
+
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS DayCounts (DateKey TEXT PRIMARY KEY, EntryCount INTEGER NOT NULL) WITHOUT ROWID"
+    )
+    cursor.execute("DELETE FROM DayCounts")
+    cursor.execute("INSERT INTO DayCounts (DateKey, EntryCount) SELECT DateKey, COUNT(*) FROM Entries WHERE DateKey IS NOT NULL GROUP BY DateKey")
+
+    erhoehe = (
+        "INSERT INTO DayCounts (DateKey, EntryCount) VALUES (NEW.DateKey, 1) "
+        "ON CONFLICT (DateKey) DO UPDATE SET EntryCount = EntryCount + 1;"
+    )
+    verringere = (
+        "UPDATE DayCounts SET EntryCount = EntryCount - 1 WHERE DateKey = OLD.DateKey; "
+        "DELETE FROM DayCounts WHERE DateKey = OLD.DateKey AND EntryCount <= 0;"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS DayCounts_Insert AFTER INSERT ON Entries "
+        f"WHEN NEW.DateKey IS NOT NULL BEGIN {erhoehe} END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS DayCounts_Update AFTER UPDATE OF DateKey ON Entries "
+        f"WHEN OLD.DateKey IS NOT NEW.DateKey BEGIN {verringere} {erhoehe} END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS DayCounts_Delete AFTER DELETE ON Entries "
+        f"WHEN OLD.DateKey IS NOT NULL BEGIN {verringere} END"
+    )
+
+
+def _migration_schluessel_beim_einfuegen(cursor, melde):
+    """
+    Version 5: Der Trigger `Entries_Schluessel_Insert` greift nur, wenn `DateKey` oder `TimeKey` fehlen.
+
+    Anwendungen, die nur Date/Time schreiben (Dialoge, C#-Kalender), verhalten sich unverändert.
+    Der Import schreibt die Schlüssel direkt und spart so ein UPDATE je eingefügter Zeile.
+    """
+
+    cursor.execute("DROP TRIGGER IF EXISTS Entries_Schluessel_Insert")
+    cursor.execute(
+        "CREATE TRIGGER Entries_Schluessel_Insert AFTER INSERT ON Entries "
+        "WHEN NEW.DateKey IS NULL OR NEW.TimeKey IS NULL BEGIN "
+        f"UPDATE Entries SET DateKey = {datum_schluessel_sql('NEW.Date')}, "
+        f"TimeKey = {zeit_schluessel_sql('NEW.Time')} WHERE rowid = NEW.rowid; END"
+    )
+
+
+def _migration_wiederholungen(cursor, melde):
+    """
+    Version 6: Legt die Tabellen für Serientermine an.
+
+    Eine Regel in `Recurrences` wird einmal gespeichert; ihre Vorkommen werden erst beim
+    Anzeigen berechnet. `StartKey` und `UntilKey` sind ISO-Daten, `UntilKey` ist bei Serien
+    ohne Ende NULL. Einzelne ausgelassene Termine stehen in `RecurrenceExceptions` und werden
+    beim Löschen der Regel per Trigger mitgelöscht.
+    """
+
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS Recurrences ("
+        "ID INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "Frequency TEXT NOT NULL CHECK (Frequency IN ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')), "
+        "Interval INTEGER NOT NULL DEFAULT 1 CHECK (Interval >= 1), "
+        "StartKey TEXT NOT NULL, UntilKey TEXT, Count INTEGER, "
+        "Time TEXT, AdditionalInfo TEXT)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS Recurrences_Zeitraum ON Recurrences (StartKey, UntilKey)")
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS RecurrenceExceptions ("
+        "RecurrenceID INTEGER NOT NULL, DateKey TEXT NOT NULL, "
+        "PRIMARY KEY (RecurrenceID, DateKey)) WITHOUT ROWID"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS Recurrences_Delete AFTER DELETE ON Recurrences BEGIN "
+        "DELETE FROM RecurrenceExceptions WHERE RecurrenceID = OLD.ID; END"
+    )
+
+
+# Migrationsschritte in Reihenfolge; Schritt i hebt die Datei auf Version i + 1
+MIGRATIONEN = [
+    ("Spalte 'ID' wird ergänzt...", _migration_id_spalte),
+    ("Sortierschlüssel für Datum und Uhrzeit werden angelegt...", _migration_sortierschluessel),
+    ("Suchindex wird aufgebaut...", _migration_volltextsuche),
+    ("Tageszähler werden angelegt...", _migration_tageszaehler),
+    ("Trigger für Sortierschlüssel werden angepasst...", _migration_schluessel_beim_einfuegen),
+    ("Tabellen für Serientermine werden angelegt...", _migration_wiederholungen),
+]
+
+SCHEMA_VERSION = len(MIGRATIONEN)
+
+
+def schema_version(db_conn):
+    """
+    Liest die Schema-Version der Datei aus `PRAGMA user_version`.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        int: Die Schema-Version; 0 für Dateien, die noch nie migriert wurden.
+    """
+
+    cursor = db_conn.cursor()
+    cursor.execute("PRAGMA user_version")
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+def suchindex_fehlt(db_conn):
+    """
+    Prüft, ob der Suchindex `Entries_fts` fehlt, obwohl FTS5 verfügbar ist.
+
+    Das ist der Fall, wenn die Datei zuerst mit einer SQLite-Bibliothek ohne FTS5 migriert
+    wurde; ihre Schema-Version ist dann aktuell, der Index aber nie angelegt worden.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        bool: True, wenn `migriere_schema` den Index nachtragen muss.
+    """
+
+    import suche
+
+    if suche.hat_suchindex(db_conn):
+        return False
+    cursor = db_conn.cursor()
+    try:
+        return fts5_verfuegbar(cursor)
+    finally:
+        cursor.close()
+
+
+def benoetigt_migration(db_conn):
+    """
+    Prüft, ob die Datei auf den aktuellen Schema-Stand gebracht werden muss.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        bool: True, wenn noch Migrationsschritte ausstehen oder der Suchindex fehlt.
+    """
+
+    return schema_version(db_conn) < SCHEMA_VERSION or suchindex_fehlt(db_conn)
+
+
+def migriere_schema(db_conn, fortschritt=None):
+    """
+    Bringt die Datei einmalig auf den aktuellen Schema-Stand.
+
+    Alle ausstehenden Schritte laufen in einer einzigen Transaktion, an deren Ende
+    `PRAGMA user_version` gesetzt wird. Fehlt der Suchindex, weil die Datei zuvor ohne FTS5
+    migriert wurde, wird er in derselben Transaktion nachgetragen (`suchindex_fehlt`). Ist die
+    Datei aktuell, kostet der Aufruf nur das Lesen der Version und des Schemas.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        fortschritt (callable): Optionaler Rückruf `fortschritt(meldung)`, der vor jedem
+            Schritt und während lang laufender Anweisungen regelmäßig aufgerufen wird.
+
+    Raises:
+        sqlite3.Error: Wenn ein Schritt fehlschlägt; die Transaktion wird zurückgerollt.
+    """
+
+    version = schema_version(db_conn)
+    if version >= SCHEMA_VERSION and not suchindex_fehlt(db_conn):
+        return
+
+    # Zuletzt gemeldeter Text, den der Progress-Handler während langer Anweisungen wiederholt
+    aktuelle_meldung = [""]
+
+    def melde(meldung):
+        aktuelle_meldung[0] = meldung
+        if fortschritt is not None:
+            fortschritt(meldung)
+
+    if fortschritt is not None:
+        def progress_handler():
+            fortschritt(aktuelle_meldung[0])
+            return 0
+
+        db_conn.set_progress_handler(progress_handler, 100_000)
+
+    cursor = db_conn.cursor()
+    try:
+        cursor.execute("BEGIN")
+        for meldung, migration in MIGRATIONEN[version:]:
+            melde(meldung)
+            migration(cursor, melde)
+        # Trägt den Suchindex nach, wenn eine frühere Migration ohne FTS5 lief
+        _migration_volltextsuche(cursor, melde)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db_conn.commit()
+    except sqlite3.Error:
+        db_conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        if fortschritt is not None:
+            db_conn.set_progress_handler(None, 0)
+
+
+@contextlib.contextmanager
+def volltext_nachtragen(cursor):
+    """
+    Setzt den Insert-Trigger des Suchindex aus und trägt die neuen Einträge danach in einem Durchlauf nach.
+
+    Für Masseneinfügungen innerhalb einer offenen Transaktion: Ein einzelnes INSERT ... SELECT
+    in `Entries_fts` ist um ein Vielfaches schneller als der Trigger je Zeile. Da Trigger
+    und Nachtrag in derselben Transaktion liegen, sehen andere Verbindungen den Index nie
+    unvollständig. Ohne Suchindex wird nichts ausgesetzt. Bei einem Fehler muss die
+    Transaktion zurückgerollt werden; damit ist auch der Trigger wiederhergestellt.
+
+    Args:
+        cursor (sqlite3.Cursor): Ein Cursor mit offener Transaktion.
+    """
+
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'Entries_fts_Insert'")
+    zeile = cursor.fetchone()
+    if zeile is None:
+        yield
+        return
+
+    # IDs werden per AUTOINCREMENT vergeben; neue Einträge liegen oberhalb der bisher höchsten ID
+    cursor.execute("SELECT COALESCE(MAX(ID), 0) FROM Entries")
+    letzte_id = cursor.fetchone()[0]
+    cursor.execute("DROP TRIGGER Entries_fts_Insert")
+    yield
+    cursor.execute("INSERT INTO Entries_fts (rowid, AdditionalInfo) SELECT ID, AdditionalInfo FROM Entries WHERE ID > ?",
+                   (letzte_id,))
+    cursor.execute(zeile[0])
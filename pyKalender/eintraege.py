@@ -0,0 +1,551 @@
+# eintraege.py
+"""
+Dieses Modul ist die Datenzugriffsschicht für einzelne Einträge der Tabelle `Entries`.
+
+Dialoge, Panels und Kommandozeile lesen, ändern, fügen und löschen Einträge ausschließlich
+über die Funktionen dieses Moduls; es hängt nicht von wx ab.
+
+- Einträge werden als `Eintrag` geliefert, einem schlanken Datensatz mit `__slots__`.
+- Die SQL-Anweisungen sind Konstanten, sodass `sqlite3` sie im Anweisungs-Cache der
+  Verbindung vorbereitet hält (siehe `cached_statements` in `datenbank.VERBINDUNGSPROFILE`).
+- Schreibende Funktionen laufen in `transaktion`: ohne äußere Transaktion wird jede
+  Änderung sofort festgeschrieben, innerhalb von `with transaktion(db_conn):` werden mehrere
+  Änderungen gemeinsam festgeschrieben oder verworfen. Änderungsmeldungen (`aenderungen`)
+  werden erst nach dem Commit verschickt.
+- `loeschen_mehrere` und `aendern_mehrere` ändern viele Einträge mit je einem
+  `executemany` in einer Transaktion.
+- `beobachte` registriert Rückrufe, die für jede Operation Name und Dauer erhalten.
+- `setze_cache` hinterlegt je Verbindung einen Cache für `lade`, der über die
+  Änderungsmeldungen aktuell gehalten wird.
+- `setze_journal` hinterlegt je Verbindung einen Rückruf, der nach jedem Commit die
+  geänderten Zeilen als Schritt erhält (siehe `journal`); `ersetze` spielt solche Schritte
+  wieder ein.
+"""
+
+import contextlib
+import datetime
+from time import perf_counter
+
+import aenderungen
+
+WOCHENTAGE = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+
+DATUMSFORMAT = "%d.%m.%Y"
+
+SPALTEN = "ID, Date, DayOfWeek, Time, AdditionalInfo, DateKey, TimeKey"
+
+_LADEN = f"SELECT {SPALTEN} FROM Entries WHERE ID = ?"
+_ALTER_STAND = "SELECT DateKey, TimeKey, ID, Date, DayOfWeek, Time, AdditionalInfo FROM Entries WHERE ID = ?"
+_ALTE_STAENDE = "SELECT DateKey, TimeKey, ID, Date, DayOfWeek, Time, AdditionalInfo FROM Entries WHERE ID IN ({platzhalter})"
+_EINFUEGEN = "INSERT INTO Entries (Date, DayOfWeek, Time, AdditionalInfo) VALUES (?, ?, ?, ?)"
+_AENDERN = "UPDATE Entries SET Date = ?, DayOfWeek = ?, Time = ?, AdditionalInfo = ? WHERE ID = ?"
+_LOESCHEN = "DELETE FROM Entries WHERE ID = ?"
+_WIEDERHERSTELLEN = "INSERT INTO Entries (ID, Date, DayOfWeek, Time, AdditionalInfo) VALUES (?, ?, ?, ?, ?)"
+
+# Anzahl der IDs je Abfrage in `_alte_staende`; unter der Grenze von 999 Parametern älterer SQLite-Versionen
+_STAPELGROESSE = 500
+
+# Rückrufe `beobachter(name, sekunden)` für die Messung der Operationen
+_beobachter = []
+
+# Offene Änderungsmeldungen je Verbindung, solange eine Transaktion läuft
+_offene_meldungen = {}
+
+# Caches für `lade` je Verbindung
+_caches = {}
+
+# Rückrufe `aufzeichnen(schritt)` je Verbindung und die geänderten Zeilen der laufenden Transaktion
+_journale = {}
+_offene_schritte = {}
+
+
+class Eintrag:
+    """
+    Ein Eintrag der Tabelle `Entries`.
+
+    Attributes:
+        entry_id (int): Die ID des Eintrags.
+        date (str): Das Datum im Format "TT.MM.JJJJ".
+        day_of_week (str): Der Wochentag.
+        time (str): Die Uhrzeit im Format "HH:MM".
+        additional_info (str): Die zusätzlichen Informationen.
+        date_key (str): Das ISO-Datum "JJJJ-MM-TT"; "" bei ungültigem Datum.
+        time_key (int): Die Minuten seit Mitternacht; -1 bei ungültiger Uhrzeit.
+    """
+
+    __slots__ = ("entry_id", "date", "day_of_week", "time", "additional_info", "date_key", "time_key")
+
+    def __init__(self, entry_id, date, day_of_week, time, additional_info, date_key=None, time_key=None):
+        self.entry_id = entry_id
+        self.date = date
+        self.day_of_week = day_of_week
+        self.time = time
+        self.additional_info = additional_info
+        self.date_key = date_key
+        self.time_key = time_key
+
+    def __repr__(self):
+        return f"Eintrag({self.entry_id}, {self.date!r}, {self.time!r})"
+
+    @property
+    def schluessel(self):
+        """tuple: Der Sortierschlüssel (DateKey, TimeKey, ID) für die Änderungsmeldungen."""
+
+        return (self.date_key, self.time_key, self.entry_id)
+
+    def inhalt(self):
+        """Liefert den vollständigen Eintrag als Text für die Anzeige."""
+
+        return f"{self.date}\n{self.day_of_week}, {self.time}\n\n{self.additional_info}"
+
+
+def datum_text(datum):
+    """
+    Formatiert ein Datum so, wie es in der Spalte `Date` gespeichert wird.
+
+    Args:
+        datum (datetime.date): Das Datum.
+
+    Returns:
+        str: Das Datum im Format "TT.MM.JJJJ".
+    """
+
+    return datum.strftime(DATUMSFORMAT)
+
+
+def tage_im_monat(jahr, monat):
+    """
+    Ermittelt die Anzahl der Tage eines Monats (ohne das Modul `calendar` zu laden).
+
+    Args:
+        jahr (int): Das Jahr.
+        monat (int): Der Monat (1-12).
+
+    Returns:
+        int: Die Anzahl der Tage, z. B. 29 für Februar 2024.
+    """
+
+    if monat == 12:
+        return 31
+    return (datetime.date(jahr, monat + 1, 1) - datetime.date(jahr, monat, 1)).days
+
+
+def wochentag(datum_text):
+    """
+    Ermittelt den deutschen Wochentag zu einem Datum.
+
+    Args:
+        datum_text (str): Das Datum im Format "TT.MM.JJJJ".
+
+    Returns:
+        str: Der Wochentag, z. B. "Montag", oder "" bei ungültigem Datum.
+    """
+
+    try:
+        return WOCHENTAGE[datetime.datetime.strptime(datum_text, DATUMSFORMAT).weekday()]
+    except ValueError:
+        return ""
+
+
+def beobachte(callback):
+    """
+    Registriert einen Rückruf, der nach jeder Operation dieses Moduls aufgerufen wird.
+
+    Args:
+        callback (callable): Wird als `callback(name, sekunden)` aufgerufen, z. B.
+            `callback("lade", 0.0002)`.
+    """
+
+    if callback not in _beobachter:
+        _beobachter.append(callback)
+
+
+def beende_beobachtung(callback):
+    """
+    Entfernt einen mit `beobachte` registrierten Rückruf.
+
+    Args:
+        callback (callable): Der Rückruf, der nicht mehr aufgerufen werden soll.
+    """
+
+    if callback in _beobachter:
+        _beobachter.remove(callback)
+
+
+@contextlib.contextmanager
+def _gemessen(name):
+    """Misst die Dauer des Blocks und meldet sie an die Beobachter."""
+
+    if not _beobachter:
+        yield
+        return
+    beginn = perf_counter()
+    try:
+        yield
+    finally:
+        dauer = perf_counter() - beginn
+        for callback in list(_beobachter):
+            callback(name, dauer)
+
+
+def setze_cache(db_conn, cache):
+    """
+    Hinterlegt einen Cache für `lade` oder entfernt ihn.
+
+    Der Cache wird über `aenderungen` aktuell gehalten. Änderungen, die andere Programme
+    direkt in die Datei schreiben, bemerkt er nicht; er eignet sich daher für Ansichten,
+    die ohnehin nur auf Meldungen dieser Anwendung reagieren.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        cache: Ein Objekt mit der Schnittstelle eines dict (`get`, `[]=`, `pop`, `clear`),
+            z. B. ein dict oder ein LRU-Cache; None entfernt den Cache.
+    """
+
+    if cache is None:
+        _caches.pop(db_conn, None)
+    else:
+        _caches[db_conn] = cache
+    if _caches:
+        aenderungen.abonniere(_cache_aktualisieren)
+    else:
+        aenderungen.kuendige(_cache_aktualisieren)
+
+
+def _cache_aktualisieren(db_conn, aktion, entry_id, alter_schluessel):
+    """Entfernt geänderte Einträge aus dem Cache der Verbindung."""
+
+    cache = _caches.get(db_conn)
+    if cache is None:
+        return
+    if aktion == aenderungen.IMPORTIERT:
+        cache.clear()
+    elif entry_id is not None:
+        cache.pop(entry_id, None)
+
+
+def setze_journal(db_conn, aufzeichnen):
+    """
+    Hinterlegt einen Rückruf, der die Änderungen jeder Transaktion erhält, oder entfernt ihn.
+
+    Nach jedem Commit wird `aufzeichnen(schritt)` mit einem Tupel von Änderungen
+    (entry_id, vorher, nachher) aufgerufen; `vorher` und `nachher` sind die Werte
+    (Date, DayOfWeek, Time, AdditionalInfo) bzw. None für einen nicht vorhandenen Eintrag.
+    Transaktionen ohne Änderungen an Einträgen werden nicht gemeldet.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        aufzeichnen (callable): Der Rückruf; None entfernt ihn.
+    """
+
+    if aufzeichnen is None:
+        _journale.pop(db_conn, None)
+    else:
+        _journale[db_conn] = aufzeichnen
+
+
+def _protokolliere(db_conn, entry_id, vorher, nachher):
+    """Merkt eine Änderung für das Journal der Verbindung vor; nur innerhalb von `transaktion`."""
+
+    schritt = _offene_schritte.get(db_conn)
+    if schritt is not None:
+        schritt.append((entry_id, vorher, nachher))
+
+
+def melde(db_conn, aktion, entry_id, alter_schluessel=None):
+    """
+    Meldet eine Änderung sofort oder, während einer Transaktion, nach dem Commit.
+
+    Auch `wiederholungen` meldet seine Änderungen hierüber, damit sie in gemeinsamen
+    Transaktionen erst nach dem Commit verschickt werden.
+    """
+
+    offen = _offene_meldungen.get(db_conn)
+    if offen is not None:
+        offen.append((aktion, entry_id, alter_schluessel))
+    else:
+        aenderungen.melde(db_conn, aktion, entry_id, alter_schluessel)
+
+
+@contextlib.contextmanager
+def transaktion(db_conn):
+    """
+    Fasst alle Änderungen im Block zu einer Transaktion zusammen.
+
+    Am Ende des Blocks wird festgeschrieben und danach gemeldet; bei einer Ausnahme wird
+    alles zurückgerollt und nichts gemeldet. Verschachtelte Aufrufe laufen in der äußeren
+    Transaktion.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Raises:
+        sqlite3.Error: Wenn der Commit fehlschlägt.
+    """
+
+    if db_conn in _offene_meldungen:
+        yield
+        return
+
+    meldungen = _offene_meldungen[db_conn] = []
+    if db_conn in _journale:
+        _offene_schritte[db_conn] = []
+    try:
+        with _gemessen("transaktion"):
+            if not db_conn.in_transaction:
+                db_conn.execute("BEGIN")
+            yield
+            db_conn.commit()
+    except BaseException:
+        db_conn.rollback()
+        raise
+    finally:
+        del _offene_meldungen[db_conn]
+        schritt = _offene_schritte.pop(db_conn, None)
+
+    if schritt and db_conn in _journale:
+        _journale[db_conn](tuple(schritt))
+    for aktion, entry_id, alter_schluessel in meldungen:
+        aenderungen.melde(db_conn, aktion, entry_id, alter_schluessel)
+
+
+def lade(db_conn, entry_id):
+    """
+    Lädt einen Eintrag über seine ID.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_id (int): Die ID des Eintrags.
+
+    Returns:
+        Eintrag: Der Eintrag oder None, wenn es ihn nicht gibt.
+
+    Raises:
+        sqlite3.Error: Wenn das Lesen fehlschlägt.
+    """
+
+    cache = _caches.get(db_conn)
+    if cache is not None:
+        eintrag = cache.get(entry_id)
+        if eintrag is not None:
+            return eintrag
+
+    with _gemessen("lade"):
+        zeile = db_conn.execute(_LADEN, (entry_id,)).fetchone()
+    if zeile is None:
+        return None
+    eintrag = Eintrag(*zeile)
+    if cache is not None:
+        cache[entry_id] = eintrag
+    return eintrag
+
+
+def _alter_stand(db_conn, entry_id):
+    """
+    Liest einen Eintrag vor einer Änderung.
+
+    Returns:
+        tuple: (Sortierschlüssel (DateKey, TimeKey, ID), Werte (Date, DayOfWeek, Time,
+        AdditionalInfo)) oder (None, None), wenn es den Eintrag nicht gibt.
+    """
+
+    # RETURNING ist erst ab SQLite 3.35 verfügbar; der alte Stand wird daher vorher gelesen
+    zeile = db_conn.execute(_ALTER_STAND, (entry_id,)).fetchone()
+    if zeile is None:
+        return None, None
+    return tuple(zeile[:3]), tuple(zeile[3:])
+
+
+def _alte_staende(db_conn, entry_ids):
+    """
+    Liest mehrere Einträge vor einer Änderung mit wenigen Abfragen.
+
+    Returns:
+        dict: ID -> (Sortierschlüssel, Werte) wie bei `_alter_stand`, in der Reihenfolge der
+        IDs; IDs, die es nicht gibt, fehlen.
+    """
+
+    ids = list(dict.fromkeys(entry_ids))
+    gefunden = {}
+    for beginn in range(0, len(ids), _STAPELGROESSE):
+        stapel = ids[beginn:beginn + _STAPELGROESSE]
+        query = _ALTE_STAENDE.format(platzhalter=", ".join("?" * len(stapel)))
+        for zeile in db_conn.execute(query, stapel):
+            gefunden[zeile[2]] = (tuple(zeile[:3]), tuple(zeile[3:]))
+    return {entry_id: gefunden[entry_id] for entry_id in ids if entry_id in gefunden}
+
+
+def hinzufuegen(db_conn, date, day_of_week, time, additional_info):
+    """
+    Fügt einen Eintrag hinzu und meldet die Änderung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        date (str): Das Datum im Format "TT.MM.JJJJ".
+        day_of_week (str): Der Wochentag.
+        time (str): Die Uhrzeit im Format "HH:MM".
+        additional_info (str): Die zusätzlichen Informationen.
+
+    Returns:
+        int: Die ID des neuen Eintrags.
+
+    Raises:
+        sqlite3.Error: Wenn das Einfügen fehlschlägt.
+    """
+
+    with transaktion(db_conn), _gemessen("hinzufuegen"):
+        entry_id = db_conn.execute(_EINFUEGEN, (date, day_of_week, time, additional_info)).lastrowid
+        _protokolliere(db_conn, entry_id, None, (date, day_of_week, time, additional_info))
+        melde(db_conn, aenderungen.HINZUGEFUEGT, entry_id)
+    return entry_id
+
+
+def aendern(db_conn, entry_id, date, day_of_week, time, additional_info):
+    """
+    Überschreibt die Felder eines Eintrags und meldet die Änderung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_id (int): Die ID des Eintrags.
+        date (str): Das Datum im Format "TT.MM.JJJJ".
+        day_of_week (str): Der Wochentag.
+        time (str): Die Uhrzeit im Format "HH:MM".
+        additional_info (str): Die zusätzlichen Informationen.
+
+    Returns:
+        bool: False, wenn es keinen Eintrag mit dieser ID gab.
+
+    Raises:
+        sqlite3.Error: Wenn das Ändern fehlschlägt.
+    """
+
+    with transaktion(db_conn), _gemessen("aendern"):
+        alter_schluessel, vorher = _alter_stand(db_conn, entry_id)
+        if alter_schluessel is None:
+            return False
+        db_conn.execute(_AENDERN, (date, day_of_week, time, additional_info, entry_id))
+        _protokolliere(db_conn, entry_id, vorher, (date, day_of_week, time, additional_info))
+        melde(db_conn, aenderungen.GEAENDERT, entry_id, alter_schluessel)
+    return True
+
+
+def loeschen(db_conn, entry_id):
+    """
+    Löscht einen Eintrag und meldet die Änderung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_id (int): Die ID des Eintrags.
+
+    Returns:
+        bool: False, wenn es keinen Eintrag mit dieser ID gab.
+
+    Raises:
+        sqlite3.Error: Wenn das Löschen fehlschlägt.
+    """
+
+    with transaktion(db_conn), _gemessen("loeschen"):
+        alter_schluessel, vorher = _alter_stand(db_conn, entry_id)
+        if alter_schluessel is None:
+            return False
+        db_conn.execute(_LOESCHEN, (entry_id,))
+        _protokolliere(db_conn, entry_id, vorher, None)
+        melde(db_conn, aenderungen.GELOESCHT, entry_id, alter_schluessel)
+    return True
+
+
+def loeschen_mehrere(db_conn, entry_ids):
+    """
+    Löscht mehrere Einträge mit einem `executemany` in einer Transaktion.
+
+    Jeder gelöschte Eintrag wird einzeln gemeldet, sodass Ansichten die Zeilen direkt entfernen.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_ids (iterable): Die IDs der Einträge.
+
+    Returns:
+        int: Die Anzahl der gelöschten Einträge; IDs, die es nicht gibt, werden übergangen.
+
+    Raises:
+        sqlite3.Error: Wenn das Löschen fehlschlägt; dann wird kein Eintrag gelöscht.
+    """
+
+    with transaktion(db_conn), _gemessen("loeschen_mehrere"):
+        staende = _alte_staende(db_conn, entry_ids)
+        db_conn.executemany(_LOESCHEN, ((entry_id,) for entry_id in staende))
+        for entry_id, (alter_schluessel, vorher) in staende.items():
+            _protokolliere(db_conn, entry_id, vorher, None)
+            melde(db_conn, aenderungen.GELOESCHT, entry_id, alter_schluessel)
+    return len(staende)
+
+
+def aendern_mehrere(db_conn, entry_ids, time=None, anhang=None):
+    """
+    Setzt die Uhrzeit mehrerer Einträge und/oder hängt Text an, mit einem `executemany` in
+    einer Transaktion.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_ids (iterable): Die IDs der Einträge.
+        time (str): Die neue Uhrzeit im Format "HH:MM"; None lässt die Uhrzeit unverändert.
+        anhang (str): Text, der in einer neuen Zeile an die zusätzlichen Informationen
+            angehängt wird; None oder "" hängt nichts an.
+
+    Returns:
+        int: Die Anzahl der geänderten Einträge; IDs, die es nicht gibt, werden übergangen.
+
+    Raises:
+        sqlite3.Error: Wenn das Ändern fehlschlägt; dann wird kein Eintrag geändert.
+    """
+
+    with transaktion(db_conn), _gemessen("aendern_mehrere"):
+        staende = _alte_staende(db_conn, entry_ids)
+        neue_werte = {}
+        for entry_id, (_, (date, day_of_week, alte_time, additional_info)) in staende.items():
+            if anhang:
+                additional_info = f"{additional_info}\n{anhang}" if additional_info else anhang
+            neue_werte[entry_id] = (date, day_of_week, alte_time if time is None else time, additional_info)
+        db_conn.executemany(_AENDERN, ((*werte, entry_id) for entry_id, werte in neue_werte.items()))
+        for entry_id, (alter_schluessel, vorher) in staende.items():
+            _protokolliere(db_conn, entry_id, vorher, neue_werte[entry_id])
+            melde(db_conn, aenderungen.GEAENDERT, entry_id, alter_schluessel)
+    return len(staende)
+
+
+def ersetze(db_conn, entry_id, vorher, nachher):
+    """
+    Bringt einen Eintrag vom Stand `vorher` auf den Stand `nachher`, z. B. beim Rückgängigmachen.
+
+    Ein gelöschter Eintrag wird mit seiner bisherigen ID wiederhergestellt; da `Entries` IDs
+    mit AUTOINCREMENT vergibt, ist sie nicht neu vergeben worden.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_id (int): Die ID des Eintrags.
+        vorher (tuple): Die erwarteten Werte (Date, DayOfWeek, Time, AdditionalInfo); None,
+            wenn der Eintrag nicht existieren soll.
+        nachher (tuple): Die neuen Werte; None löscht den Eintrag.
+
+    Returns:
+        bool: False, wenn der Eintrag nicht dem Stand `vorher` entspricht; dann wird nichts geändert.
+
+    Raises:
+        sqlite3.Error: Wenn das Schreiben fehlschlägt.
+    """
+
+    with transaktion(db_conn), _gemessen("ersetze"):
+        alter_schluessel, aktuell = _alter_stand(db_conn, entry_id)
+        if aktuell != (tuple(vorher) if vorher is not None else None):
+            return False
+        if nachher is None:
+            db_conn.execute(_LOESCHEN, (entry_id,))
+            melde(db_conn, aenderungen.GELOESCHT, entry_id, alter_schluessel)
+        elif vorher is None:
+            db_conn.execute(_WIEDERHERSTELLEN, (entry_id, *nachher))
+            melde(db_conn, aenderungen.HINZUGEFUEGT, entry_id)
+        else:
+            db_conn.execute(_AENDERN, (*nachher, entry_id))
+            melde(db_conn, aenderungen.GEAENDERT, entry_id, alter_schluessel)
+        _protokolliere(db_conn, entry_id, vorher, nachher)
+    return True
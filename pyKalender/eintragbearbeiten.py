@@ -2,6 +2,8 @@
 import wx
 import sqlite3
 
+import eintraege
+
 class BearbeitungsDialog(wx.Dialog):
     """
     Ein benutzerdefinierter Dialog zum Bearbeiten von Einträgen.
@@ -9,35 +11,33 @@ class BearbeitungsDialog(wx.Dialog):
     Attributes:
         parent (wx.Window): Das übergeordnete Fenster, zu dem dieser Dialog gehört.
         db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_id (int): Die ID des Eintrags in der Datenbank.
         date (str): Das Datum des Eintrags.
         day_of_week (str): Der Wochentag des Eintrags.
         time (str): Die Uhrzeit des Eintrags.
         additional_info (str): Zusätzliche Informationen des Eintrags.
     """
 
-    def __init__(self, parent, db_conn, date, day_of_week, time, additional_info):
+    def __init__(self, parent, db_conn, entry_id):
         """
         Initialisiert den Bearbeitungsdialog für den ausgewählten Eintrag.
 
         Args:
             parent (wx.Window): Das übergeordnete Fenster, zu dem dieser Dialog gehört.
             db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
-            date (str): Das Datum des Eintrags.
-            day_of_week (str): Der Wochentag des Eintrags.
-            time (str): Die Uhrzeit des Eintrags.
-            additional_info (str): Zusätzliche Informationen des Eintrags.
+            entry_id (int): Die ID des Eintrags in der Datenbank.
         """
         super().__init__(parent, title="Eintrag bearbeiten")
 
         self.db_conn = db_conn
-        self.date = date
-        self.day_of_week = day_of_week
-        self.time = time
-        self.additional_info = additional_info
+        self.entry_id = entry_id
+        self.date = ""
+        self.day_of_week = ""
+        self.time = ""
+        self.additional_info = ""
 
-        self.add_autoincrement_id_column()
-        # Ermittle die ID des Eintrags in der Datenbank
-        self.entry_id = self.get_entry_id()
+        # Lade den Eintrag über seine ID aus der Datenbank
+        self.load_entry()
 
         self.initialize_ui()
 
@@ -86,20 +86,24 @@ class BearbeitungsDialog(wx.Dialog):
         # Festlegen des Sizers für den Dialog
         self.SetSizerAndFit(sizer)
 
-    def get_entry_id(self):
+    def load_entry(self):
         """
-        Ermittelt die ID des Eintrags in der Datenbank basierend auf Datum, Uhrzeit und zusätzlichen Informationen.
+        Lädt Datum, Wochentag, Uhrzeit und zusätzliche Informationen des Eintrags über seine ID.
+
+        Existiert der Eintrag nicht mehr, wird `entry_id` auf None gesetzt.
         """
         try:
-            cursor = self.db_conn.cursor()
-            select_query = "SELECT ID FROM Entries WHERE Date = ? AND Time = ? AND AdditionalInfo = ?"
-            cursor.execute(select_query, (self.date, self.time, self.additional_info))
-            result = cursor.fetchone()
-            if result:
-                return result[0]  # ID des Eintrags
-            return None
+            eintrag = eintraege.lade(self.db_conn, self.entry_id)
+            if eintrag is not None:
+                self.date = eintrag.date
+                self.day_of_week = eintrag.day_of_week
+                self.time = eintrag.time
+                self.additional_info = eintrag.additional_info
+            else:
+                self.entry_id = None
         except sqlite3.Error as e:
-            wx.MessageBox(f"Fehler beim Abrufen der Eintrags-ID: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            self.entry_id = None
+            wx.MessageBox(f"Fehler beim Laden des Eintrags: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
 
     def update_entry(self):
         """Aktualisiert den Eintrag in der Datenbank mit den bearbeiteten Informationen."""
@@ -110,79 +114,17 @@ class BearbeitungsDialog(wx.Dialog):
         new_additional_info = self.additional_info_text.GetValue()
 
         if self.entry_id is not None:
-            print("id")
             try:
-                cursor = self.db_conn.cursor()
-                update_query = "UPDATE Entries SET Date = ?, DayOfWeek = ?, Time = ?, AdditionalInfo = ? WHERE ID = ?"
-                cursor.execute(update_query, (new_date, new_day_of_week, new_time, new_additional_info, self.entry_id))
-                
-                # Commit der Änderungen
-                self.db_conn.commit()
-                
-                wx.MessageBox("Eintrag erfolgreich aktualisiert.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
+                if eintraege.aendern(self.db_conn, self.entry_id, new_date, new_day_of_week, new_time,
+                                     new_additional_info):
+                    wx.MessageBox("Eintrag erfolgreich aktualisiert.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
+                else:
+                    wx.MessageBox("Aktualisieren fehlgeschlagen: Eintrag nicht gefunden.", "Fehler",
+                                  wx.OK | wx.ICON_ERROR)
             except sqlite3.Error as e:
                 wx.MessageBox(f"Fehler beim Aktualisieren des Eintrags: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
         else:
-            print("not id")
-
-    def add_autoincrement_id_column(self):
-        cursor = self.db_conn.cursor()
-        table_name = 'Entries'
-
-        try:
-            # Überprüfen, ob die Spalte 'ID' bereits existiert
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
-
-            id_column_exists = any(column[1] == 'ID' for column in columns)
-
-            if not id_column_exists:
-                self._add_autoincrement_id_column()
-                wx.MessageBox(f"Spalte 'ID' erfolgreich hinzugefügt.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
-            else:
-                #wx.MessageBox(f"Spalte 'ID' existiert bereits.", "Error", wx.OK | wx.ICON_ERROR)
-                pass
-
-        except sqlite3.Error as e:
-            wx.MessageBox(f"Fehler beim Hinzufügen der Spalte 'ID': {e}", "Error", wx.OK | wx.ICON_ERROR)
-
-        finally:
-            # Verbindung schließen
-            pass
-
-
-    def _add_autoincrement_id_column(self):
-        cursor = self.db_conn.cursor()
-        table_name = 'Entries'
-
-        try:
-            # Erstellen einer neuen temporären Tabelle mit AUTOINCREMENT-ID
-            temp_table_name = f"temp_{table_name}"
-            create_query = f"CREATE TABLE {temp_table_name} (ID INTEGER PRIMARY KEY AUTOINCREMENT, Date TEXT, DayOfWeek TEXT, Time TEXT, AdditionalInfo TEXT)"
-            cursor.execute(create_query)
-
-            # Kopieren von Daten aus der alten Tabelle in die neue Tabelle
-            copy_query = f"INSERT INTO {temp_table_name} (Date, DayOfWeek, Time, AdditionalInfo) SELECT Date, DayOfWeek, Time, AdditionalInfo FROM {table_name}"
-            cursor.execute(copy_query)
-
-            # Löschen der alten Tabelle
-            drop_query = f"DROP TABLE {table_name}"
-            cursor.execute(drop_query)
-
-            # Umbenennen der neuen Tabelle in den ursprünglichen Tabellennamen
-            rename_query = f"ALTER TABLE {temp_table_name} RENAME TO {table_name}"
-            cursor.execute(rename_query)
-
-            # Commit der Änderungen
-            self.db_conn.commit()
-            print("Spalte 'ID' erfolgreich hinzugefügt.")
-
-        except sqlite3.Error as e:
-            print(f"Fehler beim Hinzufügen der Spalte 'ID': {e}")
-
-        finally:
-            # Verbindung schließen
-            pass
+            wx.MessageBox("Aktualisieren fehlgeschlagen: Eintrag nicht gefunden.", "Fehler", wx.OK | wx.ICON_ERROR)
 
     def on_ok_button(self, event):
         """Event-Handler für den OK-Button"""
@@ -206,20 +148,9 @@ class BearbeitungsDialog(wx.Dialog):
         entered_date = self.date_text.GetValue()
 
         # Versuche, den Wochentag zu ermitteln
-        try:
-            import datetime
-            dt = datetime.datetime.strptime(entered_date, "%d.%m.%Y")
-            weekday_index = dt.weekday()  # Index des Wochentags (0 = Montag, 1 = Dienstag, ...)
-
-            # Liste mit deutschen Wochentagen
-            german_weekdays = [
-                "Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"
-            ]
-
-            # Wähle den entsprechenden deutschen Wochentag aus der Liste
-            german_weekday = german_weekdays[weekday_index]
-
+        german_weekday = eintraege.wochentag(entered_date)
+        if german_weekday:
             self.day_of_week_text.SetValue(german_weekday)
-        except ValueError:
+        else:
             # Fehler beim Parsen des Datums
             wx.MessageBox("Ungültiges Datumsformat.", "Fehler", wx.OK | wx.ICON_ERROR)
@@ -0,0 +1,387 @@
+# eintrags_cache.py
+"""
+Modul mit dem seitenweisen Zeilen-Cache für die virtuelle Eintragsliste.
+
+Die Klasse `EintragsCache` lädt aus der Tabelle `Entries` nur die Seiten, die in der
+ListView tatsächlich angezeigt werden. Aufeinanderfolgende Seiten werden per
+Keyset-Pagination über (Datum, Uhrzeit, ID, Kalender) nachgeladen, sodass Öffnungszeit und
+Speicherbedarf unabhängig von der Größe der Datenbank bleiben. Sind weitere Kalender
+hinzugefügt (`kalender_quellen`), liest jede Seite alle Kalender mit einer `UNION ALL`-Abfrage.
+
+Nach dem Hinzufügen, Bearbeiten oder Löschen eines Eintrags wird nur die betroffene Zeile
+an ihrer sortierten Position in die geladenen Seiten eingefügt bzw. daraus entfernt.
+
+Die Sortierung und der Datumsfilter laufen über die Spalten `DateKey`/`TimeKey` und
+deren Index (siehe `datenbank.migriere_schema`).
+"""
+
+from bisect import bisect_left
+from collections import OrderedDict
+
+import kalender_quellen
+import messung
+
+
+class EintragsCache:
+    """
+    Ein Fenster-Cache über die sortierten Einträge der Tabelle `Entries`.
+
+    Jede Zeile wird als Tupel (Datumsschlüssel, Zeitschlüssel, ID, Date, DayOfWeek, Time,
+    AdditionalInfo) geliefert, die ersten drei Werte bilden den Sortierschlüssel. Sind weitere
+    Kalender hinzugefügt, folgt auf die ID die Nummer des Kalenders (`Quelle`, siehe
+    `kalender_quellen`) als vierter Wert des Schlüssels; ohne sie bleibt die Spalte weg, da sie
+    das Lesen aller Schlüssel langer Listen spürbar verlangsamt. Von `AdditionalInfo` werden nur die ersten
+    `VORSCHAU_LAENGE` Zeichen geladen; der vollständige Text wird über die ID gelesen.
+    Es werden höchstens `MAX_SEITEN` Seiten zu je `SEITENGROESSE` Zeilen im Speicher
+    gehalten.
+
+    Attributes:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        ab_datum (str): ISO-Datum, ab dem Einträge geladen werden, oder None für alle.
+        anzahl (int): Die Anzahl der Einträge, die dem Filter entsprechen.
+        zusammengefuehrt (bool): True, wenn die Liste mehrere Kalender umfasst.
+        laenge (int): Die Anzahl der Werte des Sortierschlüssels am Anfang jeder Zeile.
+    """
+
+    SEITENGROESSE = 200
+    MAX_SEITEN = 16
+
+    VORSCHAU_LAENGE = 500
+
+    SCHLUESSEL = "DateKey, TimeKey, ID"
+
+    def __init__(self, db_conn, ab_datum=None, zaehlen=True):
+        """
+        Initialisiert den Cache und ermittelt die Anzahl der Einträge.
+
+        Args:
+            db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+            ab_datum (str): ISO-Datum, ab dem Einträge geladen werden, oder None für alle.
+            zaehlen (bool): False, wenn die Schlüssel im Hintergrund über
+                `ergaenze_schluessel` nachgeliefert werden; die Liste ist dann zunächst leer.
+        """
+
+        self.db_conn = db_conn
+        self.ab_datum = ab_datum
+        self.neu_laden(zaehlen)
+
+    def neu_laden(self, zaehlen=True):
+        """Verwirft alle geladenen Seiten und ermittelt die Anzahl der Einträge neu."""
+
+        self.zusammengefuehrt = kalender_quellen.zusammengefuehrt(self.db_conn)
+        self.laenge = 4 if self.zusammengefuehrt else 3
+        self.seiten = OrderedDict()
+        # Schlüssel der letzten Zeile jeder vollständig geladenen Seite für die Keyset-Pagination
+        self.anker = {}
+        self.anzahl = self._zaehle() if zaehlen else 0
+
+    @property
+    def schluessel(self):
+        """str: Die Spalten des Sortierschlüssels für ORDER BY."""
+
+        return self.SCHLUESSEL + ", Quelle" if self.zusammengefuehrt else self.SCHLUESSEL
+
+    @property
+    def schluessel_spalten(self):
+        """str: Die Spalten des Sortierschlüssels je Kalender für `kalender_quellen.vereinige`."""
+
+        return self.SCHLUESSEL + ", {quelle} AS Quelle" if self.zusammengefuehrt else self.SCHLUESSEL
+
+    def quelle(self, zeile):
+        """Liefert die Nummer des Kalenders, aus dem eine Zeile stammt."""
+
+        return zeile[3] if self.zusammengefuehrt else kalender_quellen.HAUPT
+
+    def schluessel_abfrage(self):
+        """
+        Liefert die Abfrage aller Sortierschlüssel für das Laden im Hintergrund.
+
+        Die Abfrage liest nur den Index und liefert die Sortierschlüssel in Listenreihenfolge.
+
+        Returns:
+            tuple: (SQL-Abfrage, Parameter)
+        """
+
+        bedingungen, parameter = self._filter()
+        return self._abfrage(self.schluessel_spalten, bedingungen) + f" ORDER BY {self.schluessel}", parameter
+
+    def ergaenze_schluessel(self, schluessel_liste):
+        """
+        Hängt einen im Hintergrund geladenen Stapel von Sortierschlüsseln an die Liste an.
+
+        Die Liste wächst um die Anzahl der Schlüssel. Für jede dabei vollständig erfasste
+        Seite wird der Keyset-Anker gesetzt, sodass auch Sprünge per Bildlaufleiste
+        ohne OFFSET geladen werden.
+
+        Args:
+            schluessel_liste (list): Die Sortierschlüssel in Listenreihenfolge.
+        """
+
+        for index, schluessel in enumerate(schluessel_liste, start=self.anzahl):
+            if (index + 1) % self.SEITENGROESSE == 0:
+                self.anker[index // self.SEITENGROESSE] = schluessel
+        self.anzahl += len(schluessel_liste)
+
+    def _im_filter(self, schluessel):
+        """Prüft, ob eine Zeile mit dem angegebenen Schlüssel zur Liste gehört."""
+
+        return self.ab_datum is None or schluessel[0] >= self.ab_datum
+
+    def _filter(self):
+        """
+        Liefert die WHERE-Bedingung und ihre Parameter für den aktuellen Filter.
+
+        Returns:
+            tuple: (Liste von Bedingungen, dict mit den benannten Parametern)
+        """
+
+        if self.ab_datum is None:
+            return [], {}
+        return ["DateKey >= :ab_datum"], {"ab_datum": self.ab_datum}
+
+    def _abfrage(self, spalten, bedingungen):
+        """
+        Baut die Abfrage über die Tabelle `Entries` aller Kalender.
+
+        Args:
+            spalten (str): Die Spalten je Kalender; `{quelle}` steht für die Nummer des Kalenders.
+            bedingungen (list): Die WHERE-Bedingungen je Kalender.
+
+        Returns:
+            str: Die Abfrage ohne ORDER BY.
+        """
+
+        vorlage = f"SELECT {spalten} FROM {{schema}}.Entries"
+        if bedingungen:
+            vorlage += " WHERE " + " AND ".join(bedingungen)
+        return kalender_quellen.vereinige(self.db_conn, vorlage)
+
+    def _zaehle(self):
+        """Zählt die Einträge, die dem aktuellen Filter entsprechen."""
+
+        bedingungen, parameter = self._filter()
+        query = f"SELECT SUM(Anzahl) FROM ({self._abfrage('COUNT(*) AS Anzahl', bedingungen)})"
+        cursor = self.db_conn.cursor()
+        cursor.execute(query, parameter)
+        anzahl = cursor.fetchone()[0]
+        cursor.close()
+        return anzahl
+
+    def zeile(self, index):
+        """
+        Liefert die Zeile an der angegebenen Position der sortierten Liste.
+
+        Args:
+            index (int): Die Position in der Liste.
+
+        Returns:
+            tuple: Die Zeile oder None, wenn die Position außerhalb der Liste liegt.
+        """
+
+        if index < 0 or index >= self.anzahl:
+            return None
+        seite, offset = divmod(index, self.SEITENGROESSE)
+        zeilen = self._seite(seite)
+        if offset < len(zeilen):
+            return zeilen[offset]
+        return None
+
+    def lade_zeile(self, entry_id):
+        """
+        Lädt eine einzelne Zeile der geöffneten Datei über ihre ID im Format des Caches.
+
+        Args:
+            entry_id (int): Die ID des Eintrags im Schema `main`.
+
+        Returns:
+            tuple: Die Zeile oder None, wenn der Eintrag nicht existiert.
+        """
+
+        cursor = self.db_conn.cursor()
+        spalten = self.schluessel_spalten.format(quelle=kalender_quellen.HAUPT)
+        cursor.execute(
+            f"SELECT {spalten}, Date, DayOfWeek, Time, substr(AdditionalInfo, 1, {self.VORSCHAU_LAENGE}) "
+            f"FROM {kalender_quellen.schema(kalender_quellen.HAUPT)}.Entries WHERE ID = ?",
+            (entry_id,)
+        )
+        zeile = cursor.fetchone()
+        cursor.close()
+        return zeile
+
+    def einfuegen(self, zeile):
+        """
+        Fügt eine neue Zeile an ihrer sortierten Position ein.
+
+        Args:
+            zeile (tuple): Die Zeile, wie sie `lade_zeile` liefert.
+        """
+
+        if not self._im_filter(zeile[:self.laenge]):
+            return
+        self.anzahl += 1
+        self._patche(zeile[:self.laenge], zeile)
+
+    def entferne(self, schluessel):
+        """
+        Entfernt die Zeile eines Eintrags der geöffneten Datei.
+
+        Args:
+            schluessel (tuple): (DateKey, TimeKey, ID) der Zeile, wie ihn `aenderungen` meldet.
+        """
+
+        if self.zusammengefuehrt:
+            schluessel = tuple(schluessel) + (kalender_quellen.HAUPT,)
+        if not self._im_filter(schluessel):
+            return
+        self.anzahl -= 1
+        self._patche(schluessel)
+
+    def _patche(self, schluessel, zeile=None):
+        """
+        Fügt eine Zeile in die geladenen Seiten ein (`zeile` gesetzt) oder entfernt sie.
+
+        Die Position wird per Binärsuche bestimmt. Zeilen, die dadurch über eine Seitengrenze
+        rutschen, werden in die nachfolgende geladene Seite verschoben. Seiten, deren Inhalt
+        sich nicht mehr exakt bestimmen lässt, werden verworfen und bei Bedarf neu geladen.
+
+        Jede geladene Seite ist danach entweder voll oder die letzte Seite der Liste; nur an
+        eine solche kürzere Seite wird hinter der letzten Zeile angefügt.
+        """
+
+        # Anker hinter der geänderten Position verschieben sich und sind ungültig
+        for seite, anker in list(self.anker.items()):
+            if anker >= schluessel:
+                del self.anker[seite]
+
+        seiten = sorted(self.seiten)
+        betroffen = [s for s in seiten if self.seiten[s][-1][:self.laenge] >= schluessel]
+
+        if not betroffen:
+            # Anfügen hinter der letzten Zeile der Liste
+            if zeile is not None and seiten:
+                letzte = seiten[-1]
+                zeilen = self.seiten[letzte]
+                if len(zeilen) < self.SEITENGROESSE:
+                    if letzte * self.SEITENGROESSE + len(zeilen) == self.anzahl - 1:
+                        zeilen.append(zeile)
+                        if len(zeilen) == self.SEITENGROESSE:
+                            self.anker[letzte] = zeile[:self.laenge]
+                    else:
+                        self._verwerfe_ab(letzte)
+            return
+
+        start = betroffen[0]
+        zeilen = self.seiten[start]
+        vor_der_seite = zeilen[0][:self.laenge] > schluessel
+        if vor_der_seite and start != 0 and (start - 1) not in self.seiten:
+            # Die Position liegt vor dieser Seite in einem nicht geladenen Bereich
+            if zeile is not None:
+                self._verwerfe_ab(start)
+                return
+            # Alle Zeilen rücken um eine Position nach vorn, die erste in die Vorgängerseite
+            del zeilen[0]
+        else:
+            position = bisect_left(zeilen, schluessel, key=lambda z: z[:self.laenge])
+            if zeile is not None:
+                zeilen.insert(position, zeile)
+            elif position < len(zeilen) and zeilen[position][:self.laenge] == schluessel:
+                del zeilen[position]
+            else:
+                self._verwerfe_ab(start)
+                return
+
+        # Verschiebung über die zusammenhängend geladenen Folgeseiten fortsetzen
+        ende = start
+        while True:
+            zeilen = self.seiten[ende]
+            naechste = self.seiten.get(ende + 1)
+            if zeile is not None:
+                if len(zeilen) <= self.SEITENGROESSE:
+                    break
+                ueberlauf = zeilen.pop()
+                if naechste is None:
+                    self._verwerfe_ab(ende + 1)
+                    break
+                naechste.insert(0, ueberlauf)
+            else:
+                if ende * self.SEITENGROESSE + len(zeilen) >= self.anzahl:
+                    break
+                if not naechste:
+                    # Seite ist unvollständig und wird beim nächsten Zugriff neu geladen
+                    self._verwerfe_ab(ende)
+                    break
+                zeilen.append(naechste.pop(0))
+            ende += 1
+
+        # Hinter der letzten Zeile bleiben keine leeren Seiten stehen
+        for seite in range(start, ende + 1):
+            zeilen = self.seiten.get(seite)
+            if zeilen is None:
+                continue
+            if not zeilen:
+                self._verwerfe_ab(seite)
+                break
+            if len(zeilen) == self.SEITENGROESSE:
+                self.anker[seite] = zeilen[-1][:self.laenge]
+
+    def _verwerfe_ab(self, erste_seite):
+        """Verwirft alle geladenen Seiten und Anker ab der angegebenen Seite."""
+
+        for seite in [s for s in self.seiten if s >= erste_seite]:
+            del self.seiten[seite]
+        for seite in [s for s in self.anker if s >= erste_seite]:
+            del self.anker[seite]
+
+    def _seite(self, seite):
+        """Liefert eine Seite aus dem Cache und lädt sie bei Bedarf nach."""
+
+        if seite in self.seiten:
+            self.seiten.move_to_end(seite)
+            return self.seiten[seite]
+
+        zeilen = self._lade_seite(seite)
+        if not zeilen:
+            return zeilen
+        self.seiten[seite] = zeilen
+        if len(self.seiten) > self.MAX_SEITEN:
+            self.seiten.popitem(last=False)
+        if len(zeilen) == self.SEITENGROESSE:
+            self.anker[seite] = zeilen[-1][:self.laenge]
+        return zeilen
+
+    def _lade_seite(self, seite):
+        """
+        Lädt eine Seite aus der Datenbank.
+
+        Ist der Schlüssel der letzten Zeile der Vorgängerseite bekannt, wird per Keyset
+        ab diesem Schlüssel gelesen, sonst (z. B. beim Springen mit der Bildlaufleiste)
+        per OFFSET.
+        """
+
+        bedingungen, parameter = self._filter()
+        vorgaenger = self.anker.get(seite - 1)
+        if vorgaenger is not None:
+            if self.zusammengefuehrt:
+                # Die erste Bedingung begrenzt den Indexbereich; Zeilen mit gleichem (DateKey, TimeKey, ID)
+                # aus einem anderen Kalender folgen dem Anker nur, wenn dessen Nummer größer ist
+                bedingungen = bedingungen + [
+                    f"({self.SCHLUESSEL}) >= (:datum, :zeit, :id)",
+                    f"(({self.SCHLUESSEL}) > (:datum, :zeit, :id) OR {{quelle}} > :quelle)",
+                ]
+            else:
+                bedingungen = bedingungen + [f"({self.SCHLUESSEL}) > (:datum, :zeit, :id)"]
+            parameter = dict(parameter, **dict(zip(("datum", "zeit", "id", "quelle"), vorgaenger)))
+            offset = 0
+        else:
+            offset = seite * self.SEITENGROESSE
+
+        spalten = f"{self.schluessel_spalten}, Date, DayOfWeek, Time, substr(AdditionalInfo, 1, {self.VORSCHAU_LAENGE})"
+        query = self._abfrage(spalten, bedingungen) + f" ORDER BY {self.schluessel} LIMIT :limit OFFSET :offset"
+
+        with messung.stoppuhr("Liste: Seite laden"):
+            cursor = self.db_conn.cursor()
+            cursor.execute(query, dict(parameter, limit=self.SEITENGROESSE, offset=offset))
+            zeilen = cursor.fetchall()
+            cursor.close()
+        messung.zaehle("Zeilen: Liste", len(zeilen))
+        return zeilen
@@ -0,0 +1,250 @@
+# erinnerungen.py
+"""
+Dieses Modul plant Erinnerungen an anstehende Termine; es hängt nicht von wx ab.
+
+Statt die Tabelle regelmäßig abzufragen, hält `Erinnerungsplan` die Fälligkeiten der nächsten
+Termine in einem Heap, sodass das Hauptfenster nur einen einzigen Timer auf die früheste
+Fälligkeit stellen muss:
+
+- Einträge werden in Fenstern von `FENSTER` Stück über den Index auf (DateKey, TimeKey)
+  geladen, beginnend beim aktuellen Zeitpunkt. Der Schlüssel des letzten geladenen Eintrags
+  steht als Marke im Heap; erst wenn sie fällig wird, wird das nächste Fenster geladen.
+- Termine von Serien (`wiederholungen`) werden für jeweils `SERIEN_TAGE` Tage berechnet, das
+  Ende dieses Zeitraums steht ebenfalls als Marke im Heap.
+- `aenderung` gleicht den Heap nach einer Änderungsmeldung (`aenderungen`) an, ohne ihn neu
+  zu laden; liegt ein Eintrag hinter dem geladenen Fenster, wird er erst mit diesem geladen.
+
+Einträge ohne gültige Uhrzeit erhalten keine Erinnerung, ebenso Einträge hinzugefügter
+Kalender (`kalender_quellen`), die nur angezeigt werden.
+"""
+
+import datetime
+import heapq
+import itertools
+
+import aenderungen
+import eintraege
+import messung
+import wiederholungen
+
+# Abstand der Erinnerung vor dem Termin
+VORLAUF = datetime.timedelta(minutes=15)
+
+# Anzahl der Einträge, die auf einmal geladen werden
+FENSTER = 50
+
+# Zeitraum, für den Termine von Serien im Voraus berechnet werden
+SERIEN_TAGE = 7
+
+# Längste Wartezeit des Timers: Ein Ruhezustand oder eine umgestellte Uhr verschieben einen
+# einmal gestellten Timer, daher wird der Heap spätestens nach dieser Zeit erneut geprüft
+MAX_WARTEZEIT = datetime.timedelta(hours=1)
+
+_FENSTER_LADEN = (
+    "SELECT DateKey, TimeKey, ID FROM Entries "
+    "WHERE (DateKey, TimeKey, ID) > (?, ?, ?) AND TimeKey >= 0 "
+    "ORDER BY DateKey, TimeKey, ID LIMIT ?"
+)
+
+# Marken im Heap, bei deren Fälligkeit Einträge bzw. Termine von Serien nachgeladen werden
+_EINTRAEGE_NACHLADEN = object()
+_SERIEN_NACHLADEN = object()
+
+
+def termin_zeit(date_key, time_key):
+    """
+    Ermittelt den Zeitpunkt eines Termins aus seinem Sortierschlüssel.
+
+    Args:
+        date_key (str): Das ISO-Datum "JJJJ-MM-TT".
+        time_key (int): Die Minuten seit Mitternacht.
+
+    Returns:
+        datetime.datetime: Der Beginn des Termins.
+    """
+
+    return datetime.datetime.fromisoformat(date_key) + datetime.timedelta(minutes=time_key)
+
+
+def _zeit_schluessel(zeitpunkt):
+    """Liefert den kleinsten Sortierschlüssel (DateKey, TimeKey, ID) ab einem Zeitpunkt."""
+
+    return (zeitpunkt.date().isoformat(), zeitpunkt.hour * 60 + zeitpunkt.minute, -1)
+
+
+class Erinnerungsplan:
+    """
+    Die anstehenden Erinnerungen einer Datenbankverbindung.
+
+    Attributes:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        vorlauf (datetime.timedelta): Abstand der Erinnerung vor dem Termin.
+        heap (list): Tupel (Fälligkeit, laufende Nummer, Kennung, Ziel); Ziel ist die ID eines
+            Eintrags, ein `wiederholungen.Vorkommen` oder eine Marke zum Nachladen.
+        grenze (tuple): Sortierschlüssel (DateKey, TimeKey, ID), bis zu dem Einträge geladen sind.
+        vollstaendig (bool): True, wenn hinter `grenze` keine Einträge mehr folgen.
+        serien_bis (datetime.date): Letzter Tag, für den Termine von Serien berechnet sind.
+        erinnert (dict): Kennung -> Fälligkeit der bereits ausgelösten Erinnerungen.
+    """
+
+    def __init__(self, db_conn, vorlauf=VORLAUF, jetzt=None):
+        """
+        Lädt die ersten anstehenden Termine.
+
+        Args:
+            db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+            vorlauf (datetime.timedelta): Abstand der Erinnerung vor dem Termin.
+            jetzt (datetime.datetime): Der aktuelle Zeitpunkt; None für `datetime.now()`.
+
+        Raises:
+            sqlite3.Error: Wenn das Lesen fehlschlägt.
+        """
+
+        self.db_conn = db_conn
+        self.vorlauf = vorlauf
+        self.erinnert = {}
+        self.neu_laden(jetzt)
+
+    def neu_laden(self, jetzt=None):
+        """
+        Verwirft den Heap und lädt die anstehenden Termine ab `jetzt` neu.
+
+        Args:
+            jetzt (datetime.datetime): Der aktuelle Zeitpunkt; None für `datetime.now()`.
+
+        Raises:
+            sqlite3.Error: Wenn das Lesen fehlschlägt.
+        """
+
+        jetzt = jetzt or datetime.datetime.now()
+        self.heap = []
+        self._folge = itertools.count()
+        self.grenze = _zeit_schluessel(jetzt)
+        self.vollstaendig = False
+        self._lade_eintraege(jetzt)
+        heute = jetzt.date()
+        self._lade_serien(heute, heute + datetime.timedelta(days=SERIEN_TAGE - 1), jetzt)
+
+    def _vormerken(self, faellig, kennung, ziel):
+        """Legt eine Erinnerung in den Heap, sofern sie nicht bereits ausgelöst wurde."""
+
+        if kennung is not None and self.erinnert.get(kennung) == faellig:
+            return
+        heapq.heappush(self.heap, (faellig, next(self._folge), kennung, ziel))
+
+    def _lade_eintraege(self, jetzt):
+        """Lädt das nächste Fenster von Einträgen hinter `grenze`."""
+
+        # Nach einem Ruhezustand nicht erst alle inzwischen vergangenen Fenster laden
+        self.grenze = max(self.grenze, _zeit_schluessel(jetzt))
+        with messung.stoppuhr("Erinnerungen: nachladen"):
+            zeilen = self.db_conn.execute(_FENSTER_LADEN, (*self.grenze, FENSTER)).fetchall()
+        messung.zaehle("Zeilen: Erinnerungen", len(zeilen))
+
+        for date_key, time_key, entry_id in zeilen:
+            self._vormerken(termin_zeit(date_key, time_key) - self.vorlauf, entry_id, entry_id)
+        if len(zeilen) < FENSTER:
+            self.vollstaendig = True
+        else:
+            self.grenze = tuple(zeilen[-1])
+            self._vormerken(termin_zeit(*self.grenze[:2]) - self.vorlauf, None, _EINTRAEGE_NACHLADEN)
+
+    def _lade_serien(self, von, bis, jetzt):
+        """Berechnet die Termine der Serien von `von` bis `bis`, soweit sie nicht begonnen haben."""
+
+        for termin in wiederholungen.vorkommen(self.db_conn, von, bis):
+            if termin.time_key < 0:
+                continue
+            beginn = termin_zeit(termin.date_key, termin.time_key)
+            if beginn >= jetzt:
+                self._vormerken(beginn - self.vorlauf, (termin.regel.regel_id, termin.datum), termin)
+        self.serien_bis = bis
+        naechster_tag = datetime.datetime.combine(bis + datetime.timedelta(days=1), datetime.time())
+        self._vormerken(naechster_tag - self.vorlauf, None, _SERIEN_NACHLADEN)
+
+    def naechste(self):
+        """
+        Liefert den Zeitpunkt, zu dem `faellige` das nächste Mal aufgerufen werden muss.
+
+        Returns:
+            datetime.datetime: Die früheste Fälligkeit im Heap; None, wenn er leer ist.
+        """
+
+        return self.heap[0][0] if self.heap else None
+
+    def faellige(self, jetzt=None):
+        """
+        Entnimmt alle bis `jetzt` fälligen Erinnerungen und lädt bei Bedarf nach.
+
+        Erinnerungen an Termine, die bereits begonnen haben (z. B. nach einem Ruhezustand),
+        werden übergangen.
+
+        Args:
+            jetzt (datetime.datetime): Der aktuelle Zeitpunkt; None für `datetime.now()`.
+
+        Returns:
+            list: Die IDs fälliger Einträge bzw. `wiederholungen.Vorkommen`, nach Fälligkeit sortiert.
+
+        Raises:
+            sqlite3.Error: Wenn das Nachladen fehlschlägt.
+        """
+
+        jetzt = jetzt or datetime.datetime.now()
+        ergebnis = []
+        while self.heap and self.heap[0][0] <= jetzt:
+            faellig, _, kennung, ziel = heapq.heappop(self.heap)
+            if ziel is _EINTRAEGE_NACHLADEN:
+                self._lade_eintraege(jetzt)
+            elif ziel is _SERIEN_NACHLADEN:
+                von = max(self.serien_bis + datetime.timedelta(days=1), jetzt.date())
+                self._lade_serien(von, von + datetime.timedelta(days=SERIEN_TAGE - 1), jetzt)
+            elif faellig + self.vorlauf >= jetzt:
+                self.erinnert[kennung] = faellig
+                ergebnis.append(ziel)
+
+        # Erinnerungen an begonnene Termine können nicht erneut vorgemerkt werden
+        self.erinnert = {kennung: faellig for kennung, faellig in self.erinnert.items()
+                         if faellig + self.vorlauf >= jetzt}
+        return ergebnis
+
+    def _entferne(self, bedingung):
+        """Entfernt alle Erinnerungen aus dem Heap, deren Ziel die Bedingung erfüllt."""
+
+        anzahl = len(self.heap)
+        self.heap = [eintrag for eintrag in self.heap if not bedingung(eintrag[3])]
+        if len(self.heap) != anzahl:
+            heapq.heapify(self.heap)
+
+    def aenderung(self, aktion, entry_id, jetzt=None):
+        """
+        Gleicht den Heap nach einer Änderungsmeldung an.
+
+        Args:
+            aktion (str): Die Art der Änderung (`aenderungen.HINZUGEFUEGT` usw.).
+            entry_id (int): Die ID des betroffenen Eintrags bzw. der Serie.
+            jetzt (datetime.datetime): Der aktuelle Zeitpunkt; None für `datetime.now()`.
+
+        Raises:
+            sqlite3.Error: Wenn das Lesen fehlschlägt.
+        """
+
+        jetzt = jetzt or datetime.datetime.now()
+        if aktion == aenderungen.IMPORTIERT:
+            self.neu_laden(jetzt)
+        elif aktion == aenderungen.WIEDERHOLUNGEN:
+            self._entferne(lambda ziel: ziel is _SERIEN_NACHLADEN or isinstance(ziel, wiederholungen.Vorkommen))
+            self._lade_serien(jetzt.date(), self.serien_bis, jetzt)
+        elif aktion in (aenderungen.HINZUGEFUEGT, aenderungen.GEAENDERT, aenderungen.GELOESCHT):
+            if aktion != aenderungen.HINZUGEFUEGT:
+                self._entferne(lambda ziel: ziel == entry_id)
+            if aktion == aenderungen.GELOESCHT:
+                return
+            eintrag = eintraege.lade(self.db_conn, entry_id)
+            if eintrag is None or not eintrag.date_key or eintrag.time_key < 0:
+                return
+            # Einträge hinter dem geladenen Fenster werden mit dem nächsten Fenster geladen
+            if not self.vollstaendig and eintrag.schluessel > self.grenze:
+                return
+            beginn = termin_zeit(eintrag.date_key, eintrag.time_key)
+            if beginn >= jetzt:
+                self._vormerken(beginn - self.vorlauf, entry_id, entry_id)
@@ -0,0 +1,317 @@
+# exportieren.py
+"""
+Dieses Modul exportiert die Tabelle `Entries` als CSV, iCalendar (.ics), JSON Lines (.jsonl)
+oder JSON-Array (.json).
+
+Die Einträge werden stapelweise mit `fetchmany` gelesen und direkt in die Zieldatei
+geschrieben, sodass der Speicherbedarf unabhängig von der Größe der Tabelle konstant bleibt.
+Ein Zeitraum wird über den Index auf `DateKey` eingegrenzt. Die Datei wird zunächst unter
+einem temporären Namen geschrieben und erst nach erfolgreichem Abschluss umbenannt.
+
+Aufruf ohne Oberfläche:
+    python exportieren.py kalender.db export.csv [--von TT.MM.JJJJ] [--bis TT.MM.JJJJ]
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+
+import datenbank
+from importieren import parse_datum
+
+STAPELGROESSE = 1000
+
+# Maximale Zeilenlänge in iCalendar-Dateien in Bytes (RFC 5545)
+ICS_ZEILENLAENGE = 75
+
+
+class ExportAbgebrochen(Exception):
+    """Wird ausgelöst, wenn der Benutzer den Export über den Fortschritts-Rückruf abbricht."""
+
+
+def _bereich(von=None, bis=None):
+    """Liefert die WHERE-Bedingung und Parameter für einen Zeitraum über `DateKey`."""
+
+    bedingungen = []
+    parameter = []
+    if von is not None:
+        bedingungen.append("DateKey >= ?")
+        parameter.append(von.isoformat())
+    if bis is not None:
+        bedingungen.append("DateKey <= ?")
+        parameter.append(bis.isoformat())
+    return (" WHERE " + " AND ".join(bedingungen) if bedingungen else ""), tuple(parameter)
+
+
+def zaehle(db_conn, von=None, bis=None):
+    """
+    Ermittelt die Anzahl der zu exportierenden Einträge aus den Tageszählern.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        von (datetime.date): Erster Tag oder None für unbegrenzt.
+        bis (datetime.date): Letzter Tag oder None für unbegrenzt.
+
+    Returns:
+        int: Die Anzahl der Einträge im Zeitraum.
+    """
+
+    bedingung, parameter = _bereich(von, bis)
+    cursor = db_conn.cursor()
+    cursor.execute(f"SELECT COALESCE(SUM(EntryCount), 0) FROM DayCounts{bedingung}", parameter)
+    anzahl = cursor.fetchone()[0]
+    cursor.close()
+    return anzahl
+
+
+def lies_eintraege(db_conn, von=None, bis=None, stapelgroesse=STAPELGROESSE):
+    """
+    Liest die Einträge eines Zeitraums stapelweise in Datums- und Zeitreihenfolge.
+
+    Einträge mit ungültigem Datum werden nur ohne Zeitraum geliefert, und zwar zuerst.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        von (datetime.date): Erster Tag oder None für unbegrenzt.
+        bis (datetime.date): Letzter Tag oder None für unbegrenzt.
+        stapelgroesse (int): Die Anzahl der Zeilen je `fetchmany`.
+
+    Yields:
+        list: Stapel von Tupeln (ID, Date, DayOfWeek, Time, AdditionalInfo, DateKey, TimeKey).
+    """
+
+    bedingung, parameter = _bereich(von, bis)
+    cursor = db_conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT ID, Date, DayOfWeek, Time, AdditionalInfo, DateKey, TimeKey FROM Entries"
+            f"{bedingung} ORDER BY DateKey, TimeKey, ID", parameter
+        )
+        while True:
+            zeilen = cursor.fetchmany(stapelgroesse)
+            if not zeilen:
+                break
+            yield zeilen
+    finally:
+        cursor.close()
+
+
+def _ics_text(wert):
+    """Maskiert einen Text für iCalendar."""
+
+    return (wert.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+class CsvSchreiber:
+    """Schreibt Einträge als CSV mit Semikolon in der Spaltenfolge der Tabelle."""
+
+    KODIERUNG = "utf-8-sig"  # mit BOM, damit Excel die Umlaute erkennt
+
+    def __init__(self, f):
+        self.writer = csv.writer(f, delimiter=";")
+        self.writer.writerow(["Date", "DayOfWeek", "Time", "AdditionalInfo"])
+
+    def schreibe(self, zeile):
+        """Schreibt einen Eintrag; liefert False, wenn er im Format nicht darstellbar ist."""
+
+        self.writer.writerow(zeile[1:5])
+        return True
+
+    def abschliessen(self):
+        """Schreibt den Abschluss der Datei."""
+
+
+class IcsSchreiber:
+    """
+    Schreibt Einträge als VEVENT einer iCalendar-Datei.
+
+    Die erste Zeile des Textes wird zu SUMMARY, der Rest zu DESCRIPTION. Einträge mit
+    ungültigem Datum lassen sich nicht darstellen und werden übersprungen.
+    """
+
+    KODIERUNG = "utf-8"
+
+    def __init__(self, f):
+        self.f = f
+        self.zeitstempel = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        for zeile in ("BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//pyKalender//DE"):
+            self._zeile(zeile)
+
+    def _zeile(self, zeile):
+        """Schreibt eine Zeile mit CRLF und bricht sie nach `ICS_ZEILENLAENGE` Bytes um."""
+
+        if len(zeile.encode("utf-8")) <= ICS_ZEILENLAENGE:
+            self.f.write(zeile + "\r\n")
+            return
+        teile = []
+        laenge = 0
+        for zeichen in zeile:
+            zeichen_laenge = len(zeichen.encode("utf-8"))
+            if laenge + zeichen_laenge > ICS_ZEILENLAENGE:
+                teile.append("\r\n ")
+                laenge = 1
+            teile.append(zeichen)
+            laenge += zeichen_laenge
+        self.f.write("".join(teile) + "\r\n")
+
+    def schreibe(self, zeile):
+        """Schreibt einen Eintrag; liefert False, wenn er im Format nicht darstellbar ist."""
+
+        entry_id, _, _, _, additional_info, date_key, time_key = zeile
+        if not date_key:
+            return False
+        beginn = datetime.datetime.fromisoformat(date_key) + datetime.timedelta(minutes=max(time_key or 0, 0))
+        summary, _, description = (additional_info or "").partition("\n")
+        # Leerzeilen bleiben erhalten, damit `importieren.lies_ics` den Text unverändert liest
+        summary = summary.rstrip("\r\n")
+
+        self._zeile("BEGIN:VEVENT")
+        self._zeile(f"UID:{entry_id}@pykalender")
+        self._zeile(f"DTSTAMP:{self.zeitstempel}")
+        self._zeile(f"DTSTART:{beginn.strftime('%Y%m%dT%H%M%S')}")
+        self._zeile(f"SUMMARY:{_ics_text(summary)}")
+        if description:
+            self._zeile(f"DESCRIPTION:{_ics_text(description)}")
+        self._zeile("END:VEVENT")
+        return True
+
+    def abschliessen(self):
+        """Schreibt den Abschluss der Datei."""
+
+        self._zeile("END:VCALENDAR")
+
+
+class JsonlSchreiber:
+    """Schreibt jeden Eintrag als JSON-Objekt in eine eigene Zeile (JSON Lines)."""
+
+    KODIERUNG = "utf-8"
+
+    def __init__(self, f):
+        self.f = f
+
+    @staticmethod
+    def _objekt(zeile):
+        """Liefert einen Eintrag als JSON-Objekt in einer Zeile."""
+
+        entry_id, date, day_of_week, time, additional_info, _, _ = zeile
+        return json.dumps({"ID": entry_id, "Date": date, "DayOfWeek": day_of_week, "Time": time,
+                           "AdditionalInfo": additional_info}, ensure_ascii=False)
+
+    def schreibe(self, zeile):
+        """Schreibt einen Eintrag; liefert False, wenn er im Format nicht darstellbar ist."""
+
+        self.f.write(self._objekt(zeile) + "\n")
+        return True
+
+    def abschliessen(self):
+        """Schreibt den Abschluss der Datei."""
+
+
+class JsonSchreiber(JsonlSchreiber):
+    """Schreibt die Einträge als JSON-Array, ein Objekt je Zeile, ohne sie im Speicher zu sammeln."""
+
+    def __init__(self, f):
+        super().__init__(f)
+        self.f.write("[")
+        self.erster = True
+
+    def schreibe(self, zeile):
+        """Schreibt einen Eintrag; liefert False, wenn er im Format nicht darstellbar ist."""
+
+        self.f.write(("\n" if self.erster else ",\n") + self._objekt(zeile))
+        self.erster = False
+        return True
+
+    def abschliessen(self):
+        """Schreibt den Abschluss der Datei."""
+
+        self.f.write("\n]\n")
+
+
+# Schreiber je Dateiendung
+SCHREIBER = {".csv": CsvSchreiber, ".ics": IcsSchreiber, ".jsonl": JsonlSchreiber, ".json": JsonSchreiber}
+
+
+def exportiere_datei(db_conn, datei, von=None, bis=None, fortschritt=None):
+    """
+    Exportiert die Einträge eines Zeitraums; das Format wird an der Dateiendung erkannt.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        datei (str): Der Pfad der Zieldatei (.csv, .ics, .jsonl oder .json).
+        von (datetime.date): Erster Tag oder None für unbegrenzt.
+        bis (datetime.date): Letzter Tag oder None für unbegrenzt.
+        fortschritt (callable): Optionaler Rückruf `fortschritt(anzahl)` nach jedem Stapel;
+            gibt er False zurück, wird der Export abgebrochen.
+
+    Returns:
+        tuple: (Anzahl der exportierten Einträge, Anzahl der übersprungenen Einträge).
+
+    Raises:
+        ValueError: Bei einer unbekannten Dateiendung.
+        ExportAbgebrochen: Wenn `fortschritt` False liefert; die Zieldatei bleibt unverändert.
+        sqlite3.Error, OSError: Bei Datenbank- oder Dateifehlern.
+    """
+
+    endung = os.path.splitext(datei)[1].lower()
+    if endung not in SCHREIBER:
+        raise ValueError(f"Unbekanntes Dateiformat: '{endung}'")
+    schreiber_klasse = SCHREIBER[endung]
+
+    temp_datei = datei + ".tmp"
+    anzahl = 0
+    uebersprungen = 0
+    try:
+        # newline="": Zeilenenden schreiben die Schreiber selbst (CSV und iCalendar mit CRLF)
+        with open(temp_datei, "w", encoding=schreiber_klasse.KODIERUNG, newline="") as f:
+            schreiber = schreiber_klasse(f)
+            for stapel in lies_eintraege(db_conn, von, bis):
+                for zeile in stapel:
+                    if schreiber.schreibe(zeile):
+                        anzahl += 1
+                    else:
+                        uebersprungen += 1
+                if fortschritt is not None and fortschritt(anzahl + uebersprungen) is False:
+                    raise ExportAbgebrochen()
+            schreiber.abschliessen()
+        os.replace(temp_datei, datei)
+    except Exception:
+        if os.path.exists(temp_datei):
+            os.remove(temp_datei)
+        raise
+    return anzahl, uebersprungen
+
+
+def main(argv):
+    """Exportiert eine Datenbank ohne Oberfläche, z. B. für geplante Sicherungen."""
+
+    parser = argparse.ArgumentParser(prog="exportieren", description="Exportiert die Einträge einer Kalender-Datenbank.")
+    parser.add_argument("db_datei", help="Die SQLite-Datenbankdatei")
+    parser.add_argument("ziel", help="Die Zieldatei (.csv, .ics, .jsonl oder .json)")
+    parser.add_argument("--von", help="Erster Tag (TT.MM.JJJJ oder JJJJ-MM-TT)")
+    parser.add_argument("--bis", help="Letzter Tag (TT.MM.JJJJ oder JJJJ-MM-TT)")
+    args = parser.parse_args(argv)
+
+    von = bis = None
+    if args.von:
+        von = parse_datum(args.von) or parser.error(f"Ungültiges Datum: {args.von}")
+    if args.bis:
+        bis = parse_datum(args.bis) or parser.error(f"Ungültiges Datum: {args.bis}")
+
+    db_conn = datenbank.verbinde(args.db_datei)
+    try:
+        datenbank.migriere_schema(db_conn)
+        anzahl, uebersprungen = exportiere_datei(db_conn, args.ziel, von, bis)
+    finally:
+        db_conn.close()
+    print(f"{anzahl} Einträge exportiert nach {args.ziel}")
+    if uebersprungen:
+        print(f"{uebersprungen} Einträge mit ungültigem Datum übersprungen")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
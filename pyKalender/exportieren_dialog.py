@@ -0,0 +1,76 @@
+# exportieren_dialog.py
+"""
+Modul zur Definition des Dialogfensters 'ExportierenDialog' für die Auswahl des Zeitraums beim Export.
+"""
+
+import wx
+
+from importieren import parse_datum
+
+
+class ExportierenDialog(wx.Dialog):
+    """
+    Ein Dialog zur Eingabe des Zeitraums, dessen Einträge exportiert werden.
+
+    Leere Felder bedeuten einen offenen Zeitraum; sind beide leer, wird alles exportiert.
+
+    Attributes:
+        von (datetime.date): Der erste Tag oder None.
+        bis (datetime.date): Der letzte Tag oder None.
+    """
+
+    def __init__(self, parent):
+        """
+        Initialisiert den Dialog.
+
+        :param parent: Das Elternfenster.
+        """
+
+        super().__init__(parent, title="Exportieren")
+
+        self.von = None
+        self.bis = None
+
+        self.initialize_ui()
+
+    def initialize_ui(self):
+        """Initialisiert die Benutzeroberfläche des Dialogs."""
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        hinweis = wx.StaticText(self, label="Zeitraum (tt.mm.jjjj), leer lassen für alle Einträge:")
+        sizer.Add(hinweis, 0, wx.ALL | wx.EXPAND, 10)
+
+        felder = wx.FlexGridSizer(2, 2, 5, 10)
+        felder.Add(wx.StaticText(self, label="Von:"), 0, wx.ALIGN_CENTER_VERTICAL)
+        self.von_text = wx.TextCtrl(self)
+        felder.Add(self.von_text, 1, wx.EXPAND)
+        felder.Add(wx.StaticText(self, label="Bis:"), 0, wx.ALIGN_CENTER_VERTICAL)
+        self.bis_text = wx.TextCtrl(self)
+        felder.Add(self.bis_text, 1, wx.EXPAND)
+        felder.AddGrowableCol(1)
+        sizer.Add(felder, 0, wx.LEFT | wx.RIGHT | wx.EXPAND, 10)
+
+        btn_sizer = self.CreateButtonSizer(wx.OK | wx.CANCEL)
+        sizer.Add(btn_sizer, 0, wx.ALIGN_CENTER | wx.ALL, 10)
+
+        self.Bind(wx.EVT_BUTTON, self.on_ok_button, id=wx.ID_OK)
+
+        self.SetSizerAndFit(sizer)
+
+    def on_ok_button(self, event):
+        """Prüft die eingegebenen Daten und schließt den Dialog."""
+
+        von_text = self.von_text.GetValue().strip()
+        bis_text = self.bis_text.GetValue().strip()
+        self.von = parse_datum(von_text) if von_text else None
+        self.bis = parse_datum(bis_text) if bis_text else None
+
+        if (von_text and self.von is None) or (bis_text and self.bis is None):
+            wx.MessageBox("Ungültiges Datumsformat. Bitte verwenden Sie tt.mm.jjjj.", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+        if self.von is not None and self.bis is not None and self.von > self.bis:
+            wx.MessageBox("Das Startdatum liegt nach dem Enddatum.", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        self.EndModal(wx.ID_OK)
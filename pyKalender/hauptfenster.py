@@ -1,16 +1,33 @@
 # hauptfenster.py
 """
 Dieses Modul definiert die `HauptFenster`-Klasse, die das Hauptfenster der Kalenderanwendung repräsentiert.
+
+Beim Start werden nur die Module geladen, die das leere Hauptfenster braucht. Dialoge,
+`sqlite3` und die Datenbankmodule werden erst in den Handlern importiert, die sie benötigen,
+z. B. beim Öffnen der ersten Datei; Python lädt jedes Modul dabei nur einmal.
+
+Zur geöffneten Datei lassen sich weitere Kalenderdateien hinzufügen, die an dieselbe
+Verbindung gehängt werden (`kalender_quellen`); Kalenderraster, Tagesansicht und Liste zeigen
+dann die Einträge aller Kalender zusammen an.
+
+Für anstehende Termine der geöffneten Datei zeigt das Fenster Erinnerungen an. Dafür läuft
+ein einziger Timer, der jeweils auf die nächste Fälligkeit aus `erinnerungen` gestellt wird;
+zwischen zwei Erinnerungen wird die Datenbank nicht abgefragt.
 """
 
 import wx
 import sys
-import calendar
-import sqlite3
-import os
-
-from alleanzeigen_dialog import AlleAnzeigenDialog
-from hinzufuegen_dialog import HinzufuegenDialog
+import datetime
+
+import aenderungen
+import eintraege
+import erinnerungen
+import journal
+import kalender_quellen
+import messung
+import wiederholungen
+from agenda_panel import AgendaPanel
+from kalender_grid import KalenderGrid, MONAT, WOCHE
 
 class HauptFenster(wx.Frame):
     """
@@ -22,11 +39,19 @@ class HauptFenster(wx.Frame):
     Attributes:
         db_datei (str): Der Pfad zur SQLite-Datenbankdatei.
         db_conn (sqlite3.Connection): Die Verbindung zur geöffneten Datenbank.
+        worker (AbfrageWorker): Führt lange Abfragen mit eigener Verbindung im Hintergrund aus.
         datum_textbox (wx.TextCtrl): Das Textfeld zur Eingabe des Datums.
         jahr_numeric (wx.SpinCtrl): Die Steuerung für die Auswahl des Jahres.
         monat_listbox (wx.ListBox): Die ListBox zur Auswahl des Monats.
         wochentag_listbox (wx.ListBox): Die ListBox zur Anzeige der Wochentage.
         wochentag_label (wx.StaticText): Das Label für den ausgewählten Wochentag.
+        kalender (KalenderGrid): Das Kalenderraster mit Monats- und Wochenansicht.
+        agenda (AgendaPanel): Die Einträge des ausgewählten Tages.
+        tageszaehler (dict): Anzahl der Einträge je Tag, zwischengespeichert je (Jahr, Monat).
+        angezeigter_monat (tuple): (Jahr, Monat) der aktuell in `wochentag_listbox` angezeigten Tage.
+        erinnerungen (erinnerungen.Erinnerungsplan): Die anstehenden Erinnerungen der geöffneten Datei.
+        erinnerungs_timer (wx.Timer): Läuft bis zur nächsten fälligen Erinnerung.
+        benachrichtigung (wx.adv.NotificationMessage): Die zuletzt angezeigte Erinnerung.
     """
 
     def __init__(self, *args, **kwargs):
@@ -46,6 +71,22 @@ class HauptFenster(wx.Frame):
         # Datenbank-Datei-Variable
         self.db_datei = None
         self.db_conn = None
+        self.worker = None
+
+        # Zwischenspeicher für die Tageszähler, wird bei jeder Änderung geleert
+        self.tageszaehler = {}
+        self.angezeigter_monat = None
+        self.tageszaehler_geplant = False
+
+        # Ein einziger Timer für die jeweils nächste Erinnerung
+        self.erinnerungen = None
+        self.erinnerungs_timer = wx.Timer(self)
+        self.benachrichtigung = None
+        self.Bind(wx.EVT_TIMER, self.on_erinnerung, self.erinnerungs_timer)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+        # Dauer der Operationen auf einzelnen Einträgen im Performance-Dialog anzeigen
+        eintraege.beobachte(lambda name, sekunden: messung.erfasse(f"Eintrag: {name}", sekunden))
 
         # Oberflächenelemente erstellen
         self.erstelle_gui()
@@ -98,6 +139,23 @@ class HauptFenster(wx.Frame):
         self.Bind(wx.EVT_LISTBOX, self.on_wochentag_auswahl, self.wochentag_listbox)
         sizer.Add(self.wochentag_listbox, 0, wx.ALL | wx.EXPAND, 10)
 
+        # Kalenderraster und Tagesansicht rechts neben der Datumsauswahl
+        ansicht_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.ansicht_radiobox = wx.RadioBox(panel, label="Ansicht", choices=["Monat", "Woche"],
+                                            style=wx.RA_SPECIFY_COLS)
+        self.Bind(wx.EVT_RADIOBOX, self.on_ansicht_auswahl, self.ansicht_radiobox)
+        ansicht_sizer.Add(self.ansicht_radiobox, 0, wx.BOTTOM, 5)
+        self.kalender = KalenderGrid(panel, bei_auswahl=self.on_kalender_auswahl)
+        self.kalender.SetMinSize((560, 360))
+        ansicht_sizer.Add(self.kalender, 2, wx.BOTTOM | wx.EXPAND, 10)
+        self.agenda = AgendaPanel(panel)
+        self.agenda.SetMinSize((-1, 160))
+        ansicht_sizer.Add(self.agenda, 1, wx.EXPAND)
+
+        haupt_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        haupt_sizer.Add(sizer, 0, wx.EXPAND)
+        haupt_sizer.Add(ansicht_sizer, 1, wx.ALL | wx.EXPAND, 10)
+
         # Hauptmenü erstellen
         menubar = wx.MenuBar()
         datei_menu = wx.Menu()
@@ -112,6 +170,24 @@ class HauptFenster(wx.Frame):
         self.close_item = datei_menu.Append(wx.ID_ANY, "&Schließen\tCtrl-S", "Schließe .db Datei")
         self.Bind(wx.EVT_MENU, self.on_close, self.close_item)
 
+        # Menüeinträge für weitere Kalender neben der geöffneten Datei
+        self.kalender_hinzufuegen_item = datei_menu.Append(wx.ID_ANY, "&Kalender hinzufügen...\tCtrl-Shift-O", "Zeige die Einträge einer weiteren .db Datei mit an")
+        self.Bind(wx.EVT_MENU, self.on_kalender_hinzufuegen, self.kalender_hinzufuegen_item)
+        self.kalender_entfernen_item = datei_menu.Append(wx.ID_ANY, "Kalender &entfernen...", "Blende einen hinzugefügten Kalender wieder aus")
+        self.Bind(wx.EVT_MENU, self.on_kalender_entfernen, self.kalender_entfernen_item)
+
+        datei_menu.AppendSeparator()
+
+        # Menüeintrag für Importieren
+        self.importieren_item = datei_menu.Append(wx.ID_ANY, "&Importieren...\tCtrl-Shift-I", "Importiere Termine aus CSV- oder iCalendar-Dateien")
+        self.Bind(wx.EVT_MENU, self.on_importieren, self.importieren_item)
+
+        # Menüeintrag für Exportieren
+        self.exportieren_item = datei_menu.Append(wx.ID_ANY, "&Exportieren...\tCtrl-Shift-E", "Exportiere Einträge als CSV, iCalendar oder JSON Lines")
+        self.Bind(wx.EVT_MENU, self.on_exportieren, self.exportieren_item)
+
+        datei_menu.AppendSeparator()
+
         # Menüeintrag für Beenden
         exit_item = datei_menu.Append(wx.ID_ANY, "&Beenden\tCtrl-Q", "Beende die Anwendung")
         self.Bind(wx.EVT_MENU, self.on_exit, exit_item)
@@ -126,23 +202,39 @@ class HauptFenster(wx.Frame):
         self.hinzufuegen_item = aktion_menu.Append(wx.ID_ANY, "&Hinzufügen\tCtrl-H", "Füge neuen Eintrag hinzu")
         self.Bind(wx.EVT_MENU, self.on_hinzufuegen, self.hinzufuegen_item)
 
+        # Menüeintrag für Suchen
+        self.suchen_item = aktion_menu.Append(wx.ID_ANY, "&Suchen\tCtrl-F", "Durchsuche alle Einträge")
+        self.Bind(wx.EVT_MENU, self.on_suchen, self.suchen_item)
+
         # Menüeintrag für Datenbank-Informationen
         self.datenbank_info_item = aktion_menu.Append(wx.ID_ANY, "&Datenbank-Informationen\tCtrl-d", "Zeige Datenbank-Informationen")
         self.Bind(wx.EVT_MENU, self.on_datenbank_info, self.datenbank_info_item)
 
+        aktion_menu.AppendSeparator()
+
+        # Menüeinträge für Rückgängig und Wiederholen (`journal`)
+        self.rueckgaengig_item = aktion_menu.Append(wx.ID_ANY, "&Rückgängig\tCtrl-Z", "Mache die letzte Änderung rückgängig")
+        self.Bind(wx.EVT_MENU, self.on_rueckgaengig, self.rueckgaengig_item)
+        self.wiederholen_item = aktion_menu.Append(wx.ID_ANY, "&Wiederholen\tCtrl-Y", "Führe die rückgängig gemachte Änderung erneut aus")
+        self.Bind(wx.EVT_MENU, self.on_wiederholen, self.wiederholen_item)
+
         menubar.Append(aktion_menu, "&Aktion")
 
         # Menüeintrag für Info
         info_item = info_menu.Append(wx.ID_ANY, "&Info\tCtrl-I", "Zeige Python Info")
         self.Bind(wx.EVT_MENU, self.on_info_klick, info_item)
 
+        # Menüeintrag für die Laufzeitmessungen
+        performance_item = info_menu.Append(wx.ID_ANY, "&Performance\tCtrl-Shift-P", "Zeige Laufzeitmessungen")
+        self.Bind(wx.EVT_MENU, self.on_performance, performance_item)
+
         menubar.Append(info_menu, "&?")
 
         self.SetMenuBar(menubar)
 
         # Sizer zum Panel hinzufügen und Layout anwenden
-        panel.SetSizer(sizer)
-        sizer.Fit(self)
+        panel.SetSizer(haupt_sizer)
+        haupt_sizer.Fit(self)
 
     def on_info_klick(self, event):
         """
@@ -157,6 +249,20 @@ class HauptFenster(wx.Frame):
         info_text = f"Python Version: {python_version}\nwxPython Version: {wx_version}"
         wx.MessageBox(info_text, "Info", wx.OK | wx.ICON_INFORMATION)
 
+    def on_performance(self, event):
+        """
+        Zeigt die Laufzeitmessungen der Anwendung an.
+
+        Args:
+            event: Das auslösende Ereignis.
+        """
+
+        from performance_dialog import PerformanceDialog
+
+        dialog = PerformanceDialog(self, self.db_conn)
+        dialog.ShowModal()
+        dialog.Destroy()
+
     def on_open(self, event):
         """
         Öffnet eine Dialogbox zum Öffnen einer SQLite-Datenbankdatei.
@@ -182,11 +288,34 @@ class HauptFenster(wx.Frame):
         """
 
         if self.db_conn:
-            self.db_conn.close()
-            self.db_conn = None
+            self.trenne_datenbank()
             wx.MessageBox("Datenbank erfolgreich geschlossen.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
             self.update_menu_items()
 
+    def trenne_datenbank(self):
+        """
+        Löst alle Ansichten, den Worker und die Erinnerungen von der Datenbank und schließt die Verbindung.
+
+        Wird beim Schließen und nach einem fehlgeschlagenen Öffnen aufgerufen; Schritte, die beim
+        Öffnen noch nicht ausgeführt wurden, sind dabei unschädlich.
+        """
+
+        self.agenda.trenne()
+        self.kalender.trenne()
+        if self.worker:
+            self.worker.beenden()
+            self.worker = None
+        aenderungen.kuendige(self.on_eintraege_geaendert)
+        self.erinnerungs_timer.Stop()
+        self.erinnerungen = None
+        if self.db_conn:
+            journal.beende(self.db_conn)
+            kalender_quellen.vergessen(self.db_conn)
+            messung.verfolge(self.db_conn, False)
+            self.db_conn.close()
+            self.db_conn = None
+        self.aktualisiere_tageszaehler()
+
     def on_exit(self, event):
         """
         Schließt die Anwendung.
@@ -221,13 +350,189 @@ class HauptFenster(wx.Frame):
             jahr (int): Das ausgewählte Jahr.
         """
 
-        self.wochentag_listbox.Clear()
-        _, days_in_month = calendar.monthrange(jahr, monat)
-        german_weekdays = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
-        for tag in range(1, days_in_month + 1):
-            wochentag_index = calendar.weekday(jahr, monat, tag)
-            tag_label = f"{tag:02d}. {german_weekdays[wochentag_index]}"
-            self.wochentag_listbox.Append(tag_label)
+        self.angezeigter_monat = (jahr, monat)
+        self.wochentag_listbox.Set(self.tag_labels(jahr, monat))
+
+    def tag_labels(self, jahr, monat):
+        """
+        Erstellt die Beschriftungen der Tage eines Monats, bei geöffneter Datenbank mit der Anzahl der Einträge.
+
+        Args:
+            jahr (int): Das Jahr.
+            monat (int): Der Monat.
+
+        Returns:
+            list: Beschriftungen wie "05. Montag" bzw. "05. Montag (3)".
+        """
+
+        zaehler = self.lade_tageszaehler(jahr, monat)
+        erster_wochentag = datetime.date(jahr, monat, 1).weekday()
+        labels = []
+        for tag in range(1, eintraege.tage_im_monat(jahr, monat) + 1):
+            wochentag_index = (erster_wochentag + tag - 1) % 7
+            tag_label = f"{tag:02d}. {eintraege.WOCHENTAGE[wochentag_index]}"
+            if zaehler.get(tag):
+                tag_label += f" ({zaehler[tag]})"
+            labels.append(tag_label)
+        return labels
+
+    def lade_tageszaehler(self, jahr, monat):
+        """
+        Gibt die Anzahl der Einträge je Tag eines Monats zurück, bei Bedarf aus der Datenbank.
+
+        Die Einträge hinzugefügter Kalender werden mitgezählt, Termine von Serien werden für
+        den Monat berechnet und mitgezählt.
+
+        Args:
+            jahr (int): Das Jahr.
+            monat (int): Der Monat.
+
+        Returns:
+            dict: Tag des Monats -> Anzahl der Einträge.
+        """
+
+        if not self.db_conn:
+            return {}
+        if (jahr, monat) not in self.tageszaehler:
+            import sqlite3
+
+            try:
+                zaehler = {}
+                erster_tag = datetime.date(jahr, monat, 1)
+                letzter_tag = erster_tag.replace(day=eintraege.tage_im_monat(jahr, monat))
+                for zaehle in (kalender_quellen.tageszaehler, wiederholungen.tageszaehler):
+                    for datum_schluessel, anzahl in zaehle(self.db_conn, erster_tag, letzter_tag).items():
+                        tag = int(datum_schluessel[8:])
+                        zaehler[tag] = zaehler.get(tag, 0) + anzahl
+                self.tageszaehler[(jahr, monat)] = zaehler
+            except sqlite3.Error:
+                # Die Zähler sind nur ein Hinweis; die Tagesliste bleibt auch ohne sie bedienbar
+                return {}
+        return self.tageszaehler[(jahr, monat)]
+
+    def aktualisiere_tageszaehler(self):
+        """
+        Verwirft die zwischengespeicherten Tageszähler und beschriftet die angezeigten Tage neu.
+
+        Die Auswahl in `wochentag_listbox` bleibt dabei erhalten.
+        """
+
+        self.tageszaehler.clear()
+        if self.angezeigter_monat is None:
+            return
+        for index, tag_label in enumerate(self.tag_labels(*self.angezeigter_monat)):
+            if self.wochentag_listbox.GetString(index) != tag_label:
+                self.wochentag_listbox.SetString(index, tag_label)
+
+    def on_eintraege_geaendert(self, db_conn, aktion, entry_id, alter_schluessel):
+        """
+        Aktualisiert die Tageszähler und Erinnerungen nach dem Hinzufügen, Bearbeiten oder Löschen eines Eintrags.
+
+        Args:
+            db_conn (sqlite3.Connection): Die Verbindung, über die geändert wurde.
+            aktion (str): Die Art der Änderung.
+            entry_id (int): Die ID des betroffenen Eintrags.
+            alter_schluessel (tuple): (DateKey, TimeKey, ID) vor der Änderung.
+        """
+
+        if db_conn is self.db_conn:
+            # Viele Meldungen hintereinander (z. B. beim Löschen mehrerer Einträge) nur einmal zählen
+            self.tageszaehler.clear()
+            if not self.tageszaehler_geplant:
+                self.tageszaehler_geplant = True
+                wx.CallAfter(self.tageszaehler_nach_aenderung)
+            self.update_journal_items()
+            if self.erinnerungen is not None:
+                import sqlite3
+
+                try:
+                    self.erinnerungen.aenderung(aktion, entry_id)
+                except sqlite3.Error:
+                    # Beim nächsten Öffnen wird der Plan ohnehin neu geladen
+                    pass
+                self.plane_erinnerung()
+
+    def tageszaehler_nach_aenderung(self):
+        """Beschriftet die Tage nach gesammelten Änderungsmeldungen neu."""
+
+        if not self:
+            return
+        self.tageszaehler_geplant = False
+        self.aktualisiere_tageszaehler()
+
+    def plane_erinnerung(self):
+        """
+        Stellt den Timer auf die nächste Fälligkeit aus `erinnerungen`.
+
+        Der Timer läuft höchstens `erinnerungen.MAX_WARTEZEIT` lang und prüft dann erneut.
+        """
+
+        self.erinnerungs_timer.Stop()
+        if self.erinnerungen is None:
+            return
+        faellig = self.erinnerungen.naechste()
+        if faellig is None:
+            return
+        wartezeit = min(faellig - datetime.datetime.now(), erinnerungen.MAX_WARTEZEIT)
+        self.erinnerungs_timer.StartOnce(max(int(wartezeit.total_seconds() * 1000), 1))
+
+    def on_erinnerung(self, event):
+        """
+        Zeigt die fälligen Erinnerungen an und stellt den Timer auf die nächste.
+
+        Args:
+            event: Das auslösende Timer-Ereignis.
+        """
+
+        if self.erinnerungen is None:
+            return
+        import sqlite3
+
+        try:
+            termine = []
+            for ziel in self.erinnerungen.faellige():
+                # Einträge erst beim Anzeigen lesen, damit Änderungen seit dem Laden enthalten sind
+                termin = eintraege.lade(self.db_conn, ziel) if isinstance(ziel, int) else ziel
+                if termin is not None:
+                    termine.append(termin)
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Laden der Erinnerungen: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+        if termine:
+            self.zeige_erinnerung(termine)
+        self.plane_erinnerung()
+
+    def zeige_erinnerung(self, termine):
+        """
+        Zeigt eine Benachrichtigung des Systems für fällige Termine an.
+
+        Args:
+            termine (list): `eintraege.Eintrag` bzw. `wiederholungen.Vorkommen`, nach Uhrzeit sortiert.
+        """
+
+        import wx.adv
+
+        zeilen = []
+        for termin in termine:
+            text = (termin.additional_info or "").strip().split("\n", 1)[0][:80]
+            if isinstance(termin, wiederholungen.Vorkommen):
+                text = f"{wiederholungen.KENNZEICHEN} {text}"
+            zeilen.append(f"{termin.date} {termin.time}  {text}")
+        titel = f"Termin um {termine[0].time}" if len(termine) == 1 else f"{len(termine)} anstehende Termine"
+
+        if self.benachrichtigung is not None:
+            self.benachrichtigung.Close()
+        # Referenz halten, da die Benachrichtigung sonst mit dem Python-Objekt verschwindet
+        self.benachrichtigung = wx.adv.NotificationMessage(titel, "\n".join(zeilen), parent=self)
+        self.benachrichtigung.Show()
+        self.RequestUserAttention()
+
+    def on_destroy(self, event):
+        """Hält den Timer an, bevor das Fenster zerstört wird."""
+
+        if event.GetEventObject() is self:
+            self.erinnerungs_timer.Stop()
+        event.Skip()
 
     def on_enter_datum(self, event):
         """
@@ -246,6 +551,7 @@ class HauptFenster(wx.Frame):
                 self.aktualisiere_wochentage(monat, jahr)
                 self.on_wochentag_auswahl(None)
                 self.select_tag_in_listbox()
+                self.zeige_ausgewaehlten_tag()
         except ValueError:
             wx.MessageBox("Ungültiges Datumsformat. Bitte verwenden Sie tt.mm.jjjj.", "Fehler", wx.OK | wx.ICON_ERROR)
 
@@ -297,9 +603,45 @@ class HauptFenster(wx.Frame):
 
             # Aktualisiere das Datum in der TextBox mit dem ausgewählten Tag
             self.datum_textbox.SetValue(f"{selected_tag}.{monat}.{jahr}")
+            self.zeige_ausgewaehlten_tag()
         except ValueError:
             pass
 
+    def zeige_ausgewaehlten_tag(self):
+        """
+        Wählt das Datum aus der Textbox im Kalenderraster aus und zeigt seine Einträge in der Tagesansicht an.
+        """
+
+        try:
+            tag, monat, jahr = map(int, self.datum_textbox.GetValue().split('.'))
+            datum = datetime.date(jahr, monat, tag)
+        except ValueError:
+            self.agenda.zeige_tag(None)
+            return
+        self.kalender.setze_datum(datum)
+        self.agenda.zeige_tag(datum)
+
+    def on_kalender_auswahl(self, datum):
+        """
+        Übernimmt einen im Kalenderraster gewählten Tag in die Datumsauswahl.
+
+        Args:
+            datum (datetime.date): Der gewählte Tag.
+        """
+
+        self.datum_textbox.SetValue(f"{datum.day}.{datum.month}.{datum.year}")
+        self.on_enter_datum(None)
+
+    def on_ansicht_auswahl(self, event):
+        """
+        Event-Handler für die Auswahl zwischen Monats- und Wochenansicht.
+
+        Args:
+            event: Das auslösende Ereignis.
+        """
+
+        self.kalender.setze_modus(MONAT if self.ansicht_radiobox.GetSelection() == 0 else WOCHE)
+
     def select_tag_in_listbox(self):
         """
         Selektiert den entsprechenden Tag in der ListBox basierend auf dem aktuellen Datum.
@@ -325,74 +667,383 @@ class HauptFenster(wx.Frame):
         if self.db_conn:
             self.open_item.Enable(False)
             self.close_item.Enable(True)
+            self.kalender_hinzufuegen_item.Enable(True)
+            self.kalender_entfernen_item.Enable(bool(kalender_quellen.weitere(self.db_conn)))
+            self.importieren_item.Enable(True)
+            self.exportieren_item.Enable(True)
             self.alleAnzeigen_item.Enable(True)
             self.hinzufuegen_item.Enable(True)
+            self.suchen_item.Enable(True)
             self.datenbank_info_item.Enable(True)
         else:
             self.open_item.Enable(True)
             self.close_item.Enable(False)
+            self.kalender_hinzufuegen_item.Enable(False)
+            self.kalender_entfernen_item.Enable(False)
+            self.importieren_item.Enable(False)
+            self.exportieren_item.Enable(False)
             self.alleAnzeigen_item.Enable(False)
             self.hinzufuegen_item.Enable(False)
+            self.suchen_item.Enable(False)
             self.datenbank_info_item.Enable(False)
+        self.update_journal_items()
+
+    def update_journal_items(self):
+        """
+        Beschriftet die Menüeinträge Rückgängig und Wiederholen mit dem jeweils nächsten Schritt.
+        """
+
+        eintrags_journal = journal.von(self.db_conn) if self.db_conn else None
+        for item, text, taste, naechster in (
+                (self.rueckgaengig_item, "&Rückgängig", "Ctrl-Z", eintrags_journal and eintrags_journal.naechster_rueckgaengig()),
+                (self.wiederholen_item, "&Wiederholen", "Ctrl-Y", eintrags_journal and eintrags_journal.naechster_wiederholen())):
+            item.SetItemLabel(f"{text}: {naechster}\t{taste}" if naechster else f"{text}\t{taste}")
+            item.Enable(bool(naechster))
+
+    def on_rueckgaengig(self, event):
+        """
+        Macht die letzte Änderung an Einträgen rückgängig.
+
+        Args:
+            event: Das auslösende Ereignis.
+        """
+
+        self.spiele_journal_ein(rueckgaengig=True)
+
+    def on_wiederholen(self, event):
+        """
+        Führt die zuletzt rückgängig gemachte Änderung erneut aus.
+
+        Args:
+            event: Das auslösende Ereignis.
+        """
+
+        self.spiele_journal_ein(rueckgaengig=False)
+
+    def spiele_journal_ein(self, rueckgaengig):
+        """
+        Spielt den nächsten Schritt des Journals ein; die Ansichten folgen über die Änderungsmeldungen.
+
+        Args:
+            rueckgaengig (bool): True für Rückgängig, False für Wiederholen.
+        """
+
+        eintrags_journal = journal.von(self.db_conn) if self.db_conn else None
+        if eintrags_journal is None:
+            return
+        import sqlite3
+
+        try:
+            if rueckgaengig:
+                eintrags_journal.rueckgaengig(self.db_conn)
+            else:
+                eintrags_journal.wiederholen(self.db_conn)
+        except ValueError as e:
+            wx.MessageBox(f"Die Änderung kann nicht mehr eingespielt werden: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Einspielen der Änderung: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+        self.update_journal_items()
 
     def open_database(self):
         """
-        Öffnet die SQLite-Datenbankverbindung.
+        Öffnet die SQLite-Datenbankverbindung mit dem Verbindungsprofil aus `datenbank.verbinde`.
 
+        Bringt die Datei beim ersten Öffnen einmalig auf den aktuellen Schema-Stand und
+        zeigt dabei den Fortschritt an.
         Zeigt eine MessageBox mit Erfolgsmeldung oder Fehlermeldung an.
         """
 
+        import datenbank
+        from abfrage_worker import AbfrageWorker
+
         try:
-            self.db_conn = sqlite3.connect(self.db_datei)
+            with messung.stoppuhr("Datenbank öffnen"):
+                self.db_conn = datenbank.verbinde(self.db_datei)
+                self.migriere_datenbank(self.db_conn)
+                # Erst nach der Migration, die einen eigenen Progress-Handler setzt und entfernt
+                if messung.sql_verfolgung:
+                    messung.verfolge(self.db_conn)
+                self.worker = AbfrageWorker(self.db_datei)
+                journal.aktiviere(self.db_conn)
+                aenderungen.abonniere(self.on_eintraege_geaendert)
+                self.aktualisiere_tageszaehler()
+                self.agenda.verbinde(self.db_conn, self.worker)
+                self.kalender.verbinde(self.db_conn)
+                self.erinnerungen = erinnerungen.Erinnerungsplan(self.db_conn)
+                self.plane_erinnerung()
             wx.MessageBox("Datenbank erfolgreich geöffnet.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
+            self.trenne_datenbank()
             wx.MessageBox(f"Fehler beim Öffnen der Datenbank: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
 
-    def on_alle_anzeigen(self, event):
-        dialog = AlleAnzeigenDialog(self, self.db_conn, self.db_datei)
-        dialog.ShowModal()
-        dialog.Destroy()
+    def migriere_datenbank(self, db_conn):
+        """
+        Führt ausstehende Schema-Migrationen mit einem Fortschrittsdialog aus.
 
-    def on_hinzufuegen(self, event):
-        dialog = HinzufuegenDialog(self, self.db_conn, self.datum_textbox.GetValue())
-        dialog.ShowModal()
+        Ist die Datei bereits aktuell, wird kein Dialog angezeigt.
+
+        Args:
+            db_conn (sqlite3.Connection): Die Verbindung zur Datei, die migriert werden soll.
+        """
+
+        import datenbank
+
+        if not datenbank.benoetigt_migration(db_conn):
+            return
+
+        progress = wx.ProgressDialog("Datenbank aktualisieren", "Datenbank wird aktualisiert...",
+                                     parent=self, style=wx.PD_APP_MODAL | wx.PD_ELAPSED_TIME)
+        try:
+            datenbank.migriere_schema(db_conn, lambda meldung: progress.Pulse(meldung))
+        finally:
+            progress.Destroy()
+
+    def on_kalender_hinzufuegen(self, event):
+        """
+        Hängt eine weitere Kalenderdatei an die geöffnete Datenbank und zeigt ihre Einträge mit an.
+
+        Die Datei wird vorher mit einer eigenen Verbindung auf den aktuellen Schema-Stand
+        gebracht. Der `AbfrageWorker` hängt sie ebenfalls an seine Verbindung.
+
+        Args:
+            event: Das auslösende Ereignis.
+        """
+
+        wildcard = "DB Dateien (*.db)|*.db"
+        dialog = wx.FileDialog(self, message="Kalender hinzufügen", wildcard=wildcard,
+                               style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        if dialog.ShowModal() != wx.ID_OK:
+            dialog.Destroy()
+            return
+        datei = dialog.GetPath()
         dialog.Destroy()
 
+        import sqlite3
+        import datenbank
 
-    def on_datenbank_info(self, event):
+        try:
+            with messung.stoppuhr("Kalender hinzufügen"):
+                db_conn = datenbank.verbinde(datei)
+                try:
+                    self.migriere_datenbank(db_conn)
+                finally:
+                    db_conn.close()
+                quelle = kalender_quellen.anhaengen(self.db_conn, datei)
+        except (sqlite3.Error, ValueError) as e:
+            wx.MessageBox(f"Fehler beim Hinzufügen des Kalenders: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        db_conn = self.db_conn
+
+        def rueckgaengig(fehler):
+            # Ohne den Kalender auf der Worker-Verbindung würden Abfragen das Schema nicht finden
+            if not self or self.db_conn is not db_conn:
+                return
+            try:
+                kalender_quellen.entfernen(db_conn, quelle)
+            except (sqlite3.Error, ValueError):
+                pass
+            self.update_menu_items()
+            wx.MessageBox(f"Fehler beim Hinzufügen des Kalenders: {str(fehler)}", "Fehler", wx.OK | wx.ICON_ERROR)
+
+        self.melde_kalender(kalender_quellen.ANHAENGEN.format(schema=kalender_quellen.schema(quelle)), (datei,),
+                            rueckgaengig)
+        self.update_menu_items()
+
+    def on_kalender_entfernen(self, event):
         """
-        Event-Handler für den Menüeintrag 'Datenbank-Informationen'.
+        Blendet einen hinzugefügten Kalender wieder aus.
 
         Args:
             event: Das auslösende Ereignis.
         """
-        if self.db_conn:
-            # Sammle Datenbank-Informationen und Statistiken
+
+        weitere = kalender_quellen.weitere(self.db_conn)
+        if not weitere:
+            return
+        dialog = wx.SingleChoiceDialog(self, "Welcher Kalender soll entfernt werden?", "Kalender entfernen",
+                                       [name for _, name in weitere])
+        if dialog.ShowModal() != wx.ID_OK:
+            dialog.Destroy()
+            return
+        quelle = weitere[dialog.GetSelection()][0]
+        dialog.Destroy()
+
+        import sqlite3
+
+        try:
+            datei = kalender_quellen.datei(self.db_conn, quelle)
+            kalender_quellen.entfernen(self.db_conn, quelle)
+        except (sqlite3.Error, ValueError) as e:
+            wx.MessageBox(f"Fehler beim Entfernen des Kalenders: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        db_conn = self.db_conn
+
+        def rueckgaengig(fehler):
+            # Der Worker liest den Kalender weiter mit, also auch wieder an die eigene Verbindung hängen
+            if not self or self.db_conn is not db_conn:
+                return
             try:
-                cursor = self.db_conn.cursor()
+                kalender_quellen.anhaengen(db_conn, datei, quelle)
+            except (sqlite3.Error, ValueError):
+                pass
+            self.update_menu_items()
+            wx.MessageBox(f"Fehler beim Entfernen des Kalenders: {str(fehler)}", "Fehler", wx.OK | wx.ICON_ERROR)
 
-                # Beispiel: Anzahl der Einträge in der Datenbank
-                cursor.execute("SELECT COUNT(*) FROM Entries")
-                count = cursor.fetchone()[0]
+        self.melde_kalender(kalender_quellen.ABHAENGEN.format(schema=kalender_quellen.schema(quelle)), (),
+                            rueckgaengig)
+        self.update_menu_items()
 
-                # Beispiel: Liste der Tabellen in der Datenbank
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [table[0] for table in cursor.fetchall()]
+    def melde_kalender(self, sql, parameter, bei_fehler):
+        """
+        Hängt einen Kalender auch an die Verbindung des `AbfrageWorker` bzw. ab und meldet danach
+        `aenderungen.KALENDER`, damit die Ansichten erst neu laden, wenn beide Verbindungen
+        dieselben Kalender kennen.
 
-                # Zusammenstellen der Informationen
-                info_text = f"Anzahl der Einträge: {count}\nTabellen: {', '.join(tables)}"
+        Args:
+            sql (str): `kalender_quellen.ANHAENGEN` bzw. `ABHAENGEN` für das Schema des Kalenders.
+            parameter (tuple): Die Parameter der Anweisung.
+            bei_fehler (callable): Rückruf `bei_fehler(fehler)`, der die Änderung an der
+                eigenen Verbindung zurücknimmt.
+        """
 
-                # MessageBox mit Datenbank-Informationen anzeigen
-                wx.MessageBox(info_text, "Datenbank-Informationen", wx.OK | wx.ICON_INFORMATION)
-            except sqlite3.Error as e:
-                wx.MessageBox(f"Fehler beim Abrufen der Datenbank-Informationen: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
-        else:
-            wx.MessageBox("Datenbankverbindung nicht geöffnet.", "Fehler", wx.OK | wx.ICON_ERROR)
+        db_conn = self.db_conn
+        if not self.worker:
+            aenderungen.melde(db_conn, aenderungen.KALENDER, None)
+            return
 
-        self.datenbank_info()
+        def bei_ende(anzahl):
+            if self and self.db_conn is db_conn:
+                aenderungen.melde(db_conn, aenderungen.KALENDER, None)
 
+        self.worker.ausfuehren(sql, parameter, bei_ende=bei_ende, bei_fehler=bei_fehler)
 
-    def datenbank_info(self):
+    def on_importieren(self, event):
+        """
+        Importiert Termine aus einer CSV- oder iCalendar-Datei mit Fortschrittsanzeige.
+
+        Args:
+            event: Das auslösende Ereignis.
+        """
+
+        wildcard = "Kalenderdateien (*.csv;*.ics)|*.csv;*.ics|CSV Dateien (*.csv)|*.csv|iCalendar Dateien (*.ics)|*.ics"
+        dialog = wx.FileDialog(self, message="Datei importieren", wildcard=wildcard, style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        if dialog.ShowModal() != wx.ID_OK:
+            dialog.Destroy()
+            return
+        datei = dialog.GetPath()
+        dialog.Destroy()
+
+        import sqlite3
+        import importieren
+
+        progress = wx.ProgressDialog("Importieren", "Einträge werden importiert...", parent=self,
+                                     style=wx.PD_APP_MODAL | wx.PD_ELAPSED_TIME | wx.PD_CAN_ABORT)
+        try:
+            with messung.stoppuhr("Import"):
+                anzahl, fehler = importieren.importiere_datei(
+                    self.db_conn, datei, lambda anzahl: progress.Pulse(f"{anzahl} Einträge importiert...")[0])
+        except importieren.ImportAbgebrochen:
+            wx.MessageBox("Import abgebrochen. Es wurden keine Einträge übernommen.", "Information", wx.OK | wx.ICON_INFORMATION)
+            return
+        except (sqlite3.Error, OSError, ValueError) as e:
+            wx.MessageBox(f"Fehler beim Importieren: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+        finally:
+            progress.Destroy()
+
+        messung.zaehle("Zeilen: Import", anzahl)
+        aenderungen.melde(self.db_conn, aenderungen.IMPORTIERT, None)
+
+        info_text = f"{anzahl} Einträge importiert."
+        if fehler.anzahl:
+            info_text += f"\n{fehler.anzahl} ungültige Zeilen übersprungen:\n"
+            info_text += "\n".join(f"Zeile {zeile}: {meldung}" for zeile, meldung in fehler.meldungen[:10])
+        wx.MessageBox(info_text, "Importieren", wx.OK | wx.ICON_INFORMATION)
+
+    def on_exportieren(self, event):
+        """
+        Exportiert die Einträge eines wählbaren Zeitraums mit Fortschrittsanzeige.
+
+        Args:
+            event: Das auslösende Ereignis.
+        """
+
+        import sqlite3
+        import exportieren
+        from exportieren_dialog import ExportierenDialog
+
+        zeitraum_dialog = ExportierenDialog(self)
+        if zeitraum_dialog.ShowModal() != wx.ID_OK:
+            zeitraum_dialog.Destroy()
+            return
+        von, bis = zeitraum_dialog.von, zeitraum_dialog.bis
+        zeitraum_dialog.Destroy()
+
+        wildcard = "CSV Dateien (*.csv)|*.csv|iCalendar Dateien (*.ics)|*.ics|JSON Lines (*.jsonl)|*.jsonl|JSON Dateien (*.json)|*.json"
+        dialog = wx.FileDialog(self, message="Exportieren nach", wildcard=wildcard,
+                               style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT)
+        if dialog.ShowModal() != wx.ID_OK:
+            dialog.Destroy()
+            return
+        datei = dialog.GetPath()
+        dialog.Destroy()
+
+        try:
+            gesamt = max(exportieren.zaehle(self.db_conn, von, bis), 1)
+            progress = wx.ProgressDialog("Exportieren", "Einträge werden exportiert...", maximum=gesamt, parent=self,
+                                         style=wx.PD_APP_MODAL | wx.PD_ELAPSED_TIME | wx.PD_REMAINING_TIME | wx.PD_CAN_ABORT)
+            try:
+                with messung.stoppuhr("Export"):
+                    anzahl, uebersprungen = exportieren.exportiere_datei(
+                        self.db_conn, datei, von, bis,
+                        lambda anzahl: progress.Update(min(anzahl, gesamt), f"{anzahl} Einträge exportiert...")[0])
+            finally:
+                progress.Destroy()
+        except exportieren.ExportAbgebrochen:
+            wx.MessageBox("Export abgebrochen.", "Information", wx.OK | wx.ICON_INFORMATION)
+            return
+        except (sqlite3.Error, OSError, ValueError) as e:
+            wx.MessageBox(f"Fehler beim Exportieren: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        messung.zaehle("Zeilen: Export", anzahl)
+        info_text = f"{anzahl} Einträge exportiert."
+        if uebersprungen:
+            info_text += f"\n{uebersprungen} Einträge mit ungültigem Datum übersprungen."
+        wx.MessageBox(info_text, "Exportieren", wx.OK | wx.ICON_INFORMATION)
+
+    def on_alle_anzeigen(self, event):
+        with messung.stoppuhr("Dialog: Alle anzeigen öffnen"):
+            from alleanzeigen_dialog import AlleAnzeigenDialog
+            dialog = AlleAnzeigenDialog(self, self.db_conn, self.db_datei, self.worker)
+        dialog.ShowModal()
+        dialog.Destroy()
+
+    def on_hinzufuegen(self, event):
+        date = self.datum_textbox.GetValue()
+        try:
+            # Gespeichert wird immer mit führenden Nullen, wie in der übrigen Datenbank
+            tag, monat, jahr = map(int, date.split('.'))
+            date = eintraege.datum_text(datetime.date(jahr, monat, tag))
+        except ValueError:
+            pass
+        with messung.stoppuhr("Dialog: Hinzufügen öffnen"):
+            from hinzufuegen_dialog import HinzufuegenDialog
+            dialog = HinzufuegenDialog(self, self.db_conn, date)
+        dialog.ShowModal()
+        dialog.Destroy()
+
+    def on_suchen(self, event):
+        with messung.stoppuhr("Dialog: Suchen öffnen"):
+            from suchen_dialog import SuchenDialog
+            dialog = SuchenDialog(self, self.db_conn, self.worker)
+        dialog.ShowModal()
+        dialog.Destroy()
+
+
+    def on_datenbank_info(self, event):
         """
         Event-Handler für den Menüeintrag 'Datenbank-Informationen'.
 
@@ -400,43 +1051,10 @@ class HauptFenster(wx.Frame):
             event: Das auslösende Ereignis.
         """
         if self.db_conn:
-            try:
-                cursor = self.db_conn.cursor()
-
-                # SQLite-Informationen abrufen
-                cursor.execute(f"SELECT sqlite_version()")
-                sqlite_version = cursor.fetchone()[0]
-
-                # Datenbank-Dateigröße abrufen
-                db_file_size = os.path.getsize(self.db_datei)  # in Bytes
-                db_size_mb = db_file_size / (1024 * 1024)  # in Megabytes
-
-                # Anzahl der Tabellen in der Datenbank
-                cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
-                table_count = cursor.fetchone()[0]
-
-                # Gesamtanzahl der Datensätze in allen Tabellen
-                total_records = 0
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = cursor.fetchall()
-                for table in tables:
-                    table_name = table[0]
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    records_count = cursor.fetchone()[0]
-                    total_records += records_count
-
-                # Zusammenstellen der Informationen
-                info_text = (
-                    f"SQLite Version: {sqlite_version}\n"
-                    f"Datenbank-Dateigröße: {db_size_mb:.2f} MB\n"
-                    f"Anzahl der Tabellen: {table_count}\n"
-                    f"Gesamtanzahl der Datensätze: {total_records}\n"
-                )
-
-                # MessageBox mit Datenbank-Informationen anzeigen
-                wx.MessageBox(info_text, "Datenbank-Informationen", wx.OK | wx.ICON_INFORMATION)
-
-            except sqlite3.Error as e:
-                wx.MessageBox(f"Fehler beim Abrufen der Datenbank-Informationen: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            with messung.stoppuhr("Dialog: Datenbank-Informationen öffnen"):
+                from statistik_dialog import StatistikDialog
+                dialog = StatistikDialog(self, self.db_conn, self.db_datei, self.worker)
+            dialog.ShowModal()
+            dialog.Destroy()
         else:
             wx.MessageBox("Datenbankverbindung nicht geöffnet.", "Fehler", wx.OK | wx.ICON_ERROR)
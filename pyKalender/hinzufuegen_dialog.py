@@ -3,10 +3,16 @@ import wx
 import sqlite3
 import datetime
 
+import eintraege
+import wiederholungen
+
 class HinzufuegenDialog(wx.Dialog):
     """
     Ein benutzerdefinierter Dialog zum Hinzufügen neuer Einträge in die Datenbank.
 
+    Ist eine Wiederholung gewählt, wird statt eines Eintrags eine Serie angelegt, deren
+    Termine erst beim Anzeigen berechnet werden (siehe `wiederholungen`).
+
     Attributes:
         parent (wx.Window): Das übergeordnete Fenster, zu dem dieser Dialog gehört.
         db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
@@ -39,19 +45,7 @@ class HinzufuegenDialog(wx.Dialog):
         self.date_text = wx.TextCtrl(self, value=self.date, style=wx.TE_PROCESS_ENTER) #, style=wx.TE_READONLY)
 
         # Ermittle den Wochentag
-        try:
-            dt = datetime.datetime.strptime(self.date, "%d.%m.%Y")
-            weekday_index = dt.weekday()  # Index des Wochentags (0 = Montag, 1 = Dienstag, ...)
-
-            # Liste mit deutschen Wochentagen
-            german_weekdays = [
-                "Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"
-            ]
-
-            # Wähle den entsprechenden deutschen Wochentag aus der Liste
-            german_weekday = german_weekdays[weekday_index]
-        except ValueError:
-            german_weekday = ""
+        german_weekday = eintraege.wochentag(self.date)
 
         # Label und TextCtrl für den Wochentag
         day_of_week_label = wx.StaticText(self, label="Wochentag:")
@@ -61,6 +55,24 @@ class HinzufuegenDialog(wx.Dialog):
         time_label = wx.StaticText(self, label="Uhrzeit:")
         self.time_text = wx.TextCtrl(self, value="00:00")
 
+        # Auswahl der Wiederholung mit Intervall und optionalem Ende der Serie
+        wiederholung_label = wx.StaticText(self, label="Wiederholung:")
+        self.frequenzen = [None] + list(wiederholungen.FREQUENZEN)
+        self.wiederholung_choice = wx.Choice(
+            self, choices=["Keine"] + [bezeichnung for bezeichnung, _ in wiederholungen.FREQUENZEN.values()])
+        self.wiederholung_choice.SetSelection(0)
+        self.wiederholung_choice.Bind(wx.EVT_CHOICE, self.on_wiederholung_auswahl)
+        self.intervall_label = wx.StaticText(self, label="alle")
+        self.intervall_spin = wx.SpinCtrl(self, min=1, max=999, initial=1)
+        self.ende_label = wx.StaticText(self, label="bis (leer = ohne Ende):")
+        self.ende_text = wx.TextCtrl(self)
+        wiederholung_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        wiederholung_sizer.Add(self.wiederholung_choice, 0, wx.RIGHT, 10)
+        wiederholung_sizer.Add(self.intervall_label, 0, wx.RIGHT | wx.ALIGN_CENTER_VERTICAL, 5)
+        wiederholung_sizer.Add(self.intervall_spin, 0, wx.RIGHT, 10)
+        wiederholung_sizer.Add(self.ende_label, 0, wx.RIGHT | wx.ALIGN_CENTER_VERTICAL, 5)
+        wiederholung_sizer.Add(self.ende_text, 1)
+
         # Label und Multiline-TextCtrl für zusätzliche Informationen
         additional_info_label = wx.StaticText(self, label="Zusätzliche Informationen:")
         self.additional_info_text = wx.TextCtrl(self, style=wx.TE_MULTILINE)
@@ -72,6 +84,8 @@ class HinzufuegenDialog(wx.Dialog):
         sizer.Add(self.day_of_week_text, 0, wx.ALL | wx.EXPAND, 10)
         sizer.Add(time_label, 0, wx.ALL | wx.EXPAND, 10)
         sizer.Add(self.time_text, 0, wx.ALL | wx.EXPAND, 10)
+        sizer.Add(wiederholung_label, 0, wx.ALL | wx.EXPAND, 10)
+        sizer.Add(wiederholung_sizer, 0, wx.ALL | wx.EXPAND, 10)
         sizer.Add(additional_info_label, 0, wx.ALL | wx.EXPAND, 10)
         sizer.Add(self.additional_info_text, 1, wx.ALL | wx.EXPAND, 10)
 
@@ -88,36 +102,76 @@ class HinzufuegenDialog(wx.Dialog):
 
         # Festlegen des Sizers für den Dialog
         self.SetSizerAndFit(sizer)
+        self.on_wiederholung_auswahl(None)
 
     def add_entry_to_database(self):
-        """Fügt den neuen Eintrag in die Datenbank ein."""
+        """
+        Fügt den neuen Eintrag bzw. die neue Serie in die Datenbank ein.
+
+        Returns:
+            bool: False, wenn die Eingabe ungültig ist und der Dialog offen bleiben soll.
+        """
 
         new_date = self.date_text.GetValue()
         new_day_of_week = self.day_of_week_text.GetValue()
         new_time = self.time_text.GetValue()
         new_additional_info = self.additional_info_text.GetValue()
 
+        frequenz = self.frequenzen[self.wiederholung_choice.GetSelection()]
+        if frequenz is not None:
+            return self.add_series_to_database(frequenz, new_date, new_time, new_additional_info)
+
         try:
-            cursor = self.db_conn.cursor()
-            insert_query = "INSERT INTO Entries (Date, DayOfWeek, Time, AdditionalInfo) VALUES (?, ?, ?, ?)"
-            cursor.execute(insert_query, (new_date, new_day_of_week, new_time, new_additional_info))
-            
-            # Commit der Änderungen
-            self.db_conn.commit()
-            
+            eintraege.hinzufuegen(self.db_conn, new_date, new_day_of_week, new_time, new_additional_info)
             wx.MessageBox("Neuer Eintrag erfolgreich hinzugefügt.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
         except sqlite3.Error as e:
             wx.MessageBox(f"Fehler beim Hinzufügen des Eintrags: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+        return True
+
+    def add_series_to_database(self, frequenz, date, time, additional_info):
+        """
+        Legt eine Serie ab dem eingegebenen Datum an.
+
+        Returns:
+            bool: False, wenn Datum oder Ende ungültig sind und der Dialog offen bleiben soll.
+        """
+
+        try:
+            beginn = datetime.datetime.strptime(date, eintraege.DATUMSFORMAT).date()
+            ende_text = self.ende_text.GetValue().strip()
+            ende = datetime.datetime.strptime(ende_text, eintraege.DATUMSFORMAT).date() if ende_text else None
+        except ValueError:
+            wx.MessageBox("Ungültiges Datumsformat.", "Fehler", wx.OK | wx.ICON_ERROR)
+            return False
+
+        try:
+            wiederholungen.anlegen(self.db_conn, frequenz, beginn, time, additional_info,
+                                   intervall=self.intervall_spin.GetValue(), ende=ende)
+            wx.MessageBox("Neue Serie erfolgreich hinzugefügt.", "Erfolg", wx.OK | wx.ICON_INFORMATION)
+        except ValueError as e:
+            wx.MessageBox(str(e), "Fehler", wx.OK | wx.ICON_ERROR)
+            return False
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Hinzufügen der Serie: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+        return True
 
     def on_ok_button(self, event):
         """Event-Handler für den OK-Button"""
 
-        # Füge den neuen Eintrag in die Datenbank ein
-        self.add_entry_to_database()
+        # Füge den neuen Eintrag in die Datenbank ein; bei ungültiger Eingabe bleibt der Dialog offen
+        if not self.add_entry_to_database():
+            return
 
         # Schließe den Dialog
         self.EndModal(wx.ID_OK)
 
+    def on_wiederholung_auswahl(self, event):
+        """Aktiviert Intervall und Ende nur, wenn eine Wiederholung gewählt ist."""
+
+        aktiv = self.wiederholung_choice.GetSelection() > 0
+        for control in (self.intervall_label, self.intervall_spin, self.ende_label, self.ende_text):
+            control.Enable(aktiv)
+
     def on_cancel_button(self, event):
         """Event-Handler für den Abbrechen-Button"""
 
@@ -131,20 +185,10 @@ class HinzufuegenDialog(wx.Dialog):
         entered_date = self.date_text.GetValue()
 
         # Versuche, den Wochentag zu ermitteln
-        try:
-            dt = datetime.datetime.strptime(entered_date, "%d.%m.%Y")
-            weekday_index = dt.weekday()  # Index des Wochentags (0 = Montag, 1 = Dienstag, ...)
-
-            # Liste mit deutschen Wochentagen
-            german_weekdays = [
-                "Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"
-            ]
-
-            # Wähle den entsprechenden deutschen Wochentag aus der Liste
-            german_weekday = german_weekdays[weekday_index]
-
+        german_weekday = eintraege.wochentag(entered_date)
+        if german_weekday:
             self.day_of_week_text.SetValue(german_weekday)
-        except ValueError:
+        else:
             # Fehler beim Parsen des Datums
             wx.MessageBox("Ungültiges Datumsformat.", "Fehler", wx.OK | wx.ICON_ERROR)
 
@@ -0,0 +1,363 @@
+# importieren.py
+"""
+Dieses Modul importiert Termine aus CSV- und iCalendar-Dateien (.ics) in die Tabelle `Entries`.
+
+Der Import ist als Generator-Kette aufgebaut: Die Datei wird zeilenweise gelesen
+(`lies_csv`/`lies_ics`), jeder Datensatz geprüft und in das Tabellenformat gebracht (`pruefe`)
+und stapelweise mit `executemany` in einer einzigen Transaktion eingefügt (`importiere`).
+So bleibt der Speicherbedarf auch bei sehr großen Dateien gering.
+
+Datum, Wochentag und Sortierschlüssel werden je verschiedenem Datum nur einmal berechnet.
+Die Sortierschlüssel werden direkt mitgeschrieben und der Suchindex am Ende in einem
+Durchlauf nachgetragen (siehe `datenbank.volltext_nachtragen`).
+"""
+
+import codecs
+import csv
+import datetime
+import itertools
+import os
+
+import datenbank
+from eintraege import WOCHENTAGE
+
+# Akzeptierte Datumsformate in CSV-Dateien
+DATUMSFORMATE = ("%d.%m.%Y", "%Y-%m-%d", "%d.%m.%y", "%d/%m/%Y", "%Y%m%d")
+
+# Spaltennamen in der Kopfzeile einer CSV-Datei (ohne Groß-/Kleinschreibung)
+CSV_SPALTEN = {
+    "datum": ("date", "datum"),
+    "uhrzeit": ("time", "uhrzeit", "zeit"),
+    "text": ("additionalinfo", "info", "text", "beschreibung", "zusätzliche informationen",
+             "description", "summary", "betreff"),
+}
+
+STAPELGROESSE = 10_000
+
+# Höchstzahl der gesammelten Fehlermeldungen; weitere Fehler werden nur gezählt
+MAX_FEHLERMELDUNGEN = 100
+
+EINFUEGEN = (
+    "INSERT INTO Entries (Date, DayOfWeek, Time, AdditionalInfo, DateKey, TimeKey) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class ImportAbgebrochen(Exception):
+    """Wird ausgelöst, wenn der Benutzer den Import über den Fortschritts-Rückruf abbricht."""
+
+
+class ImportFehler:
+    """
+    Sammelt die Fehler ungültiger Datensätze eines Imports.
+
+    Attributes:
+        anzahl (int): Die Anzahl aller übersprungenen Datensätze.
+        meldungen (list): Tupel (Zeilennummer, Meldung) der ersten `MAX_FEHLERMELDUNGEN` Fehler.
+    """
+
+    def __init__(self):
+        self.anzahl = 0
+        self.meldungen = []
+
+    def melde(self, zeile, meldung):
+        """Zählt einen Fehler und merkt sich die Meldung, solange das Limit nicht erreicht ist."""
+
+        self.anzahl += 1
+        if len(self.meldungen) < MAX_FEHLERMELDUNGEN:
+            self.meldungen.append((zeile, meldung))
+
+
+def _kodierung(datei):
+    """Erkennt, ob eine Textdatei UTF-8 ist; sonst wird Windows-1252 (z. B. aus Excel) angenommen."""
+
+    with open(datei, "rb") as f:
+        probe = f.read(64 * 1024)
+    try:
+        # final=False: ein am Ende der Probe abgeschnittenes Zeichen ist kein Fehler
+        codecs.getincrementaldecoder("utf-8")().decode(probe, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+def lies_csv(datei):
+    """
+    Liest Termine zeilenweise aus einer CSV-Datei.
+
+    Das Trennzeichen (Komma, Semikolon oder Tabulator) wird an der ersten Zeile erkannt. Mit Kopfzeile werden
+    die Spalten über ihre Namen zugeordnet (siehe `CSV_SPALTEN`); ohne Kopfzeile wird die
+    Spaltenfolge der Tabelle (Date, DayOfWeek, Time, AdditionalInfo) bzw. bei drei Spalten
+    (Datum, Uhrzeit, Text) angenommen.
+
+    Args:
+        datei (str): Der Pfad zur CSV-Datei.
+
+    Yields:
+        tuple: (Zeilennummer, Datum, Uhrzeit, Text) als unbearbeitete Texte.
+    """
+
+    with open(datei, newline="", encoding=_kodierung(datei)) as f:
+        # Trennzeichen ist das häufigste Kandidatenzeichen der ersten Zeile; robuster als
+        # csv.Sniffer bei mehrzeiligen Feldern
+        erste = f.readline()
+        f.seek(0)
+        trennzeichen = max(",;\t", key=erste.count)
+        reader = csv.reader(f, delimiter=trennzeichen)
+
+        erste_zeile = next(reader, None)
+        if erste_zeile is None:
+            return
+        namen = [name.strip().lower() for name in erste_zeile]
+        spalten = {}
+        for feld, moegliche_namen in CSV_SPALTEN.items():
+            for index, name in enumerate(namen):
+                if name in moegliche_namen:
+                    spalten[feld] = index
+                    break
+
+        if "datum" in spalten:
+            zeilen = reader
+        else:
+            # Keine Kopfzeile: erste Zeile ist bereits ein Datensatz
+            if len(erste_zeile) >= 4:
+                spalten = {"datum": 0, "uhrzeit": 2, "text": 3}
+            else:
+                spalten = {"datum": 0, "uhrzeit": 1, "text": 2}
+            zeilen = itertools.chain([erste_zeile], reader)
+
+        for zeile in zeilen:
+            if not any(feld.strip() for feld in zeile):
+                continue
+            werte = [zeile[spalten[feld]] if feld in spalten and spalten[feld] < len(zeile) else ""
+                     for feld in ("datum", "uhrzeit", "text")]
+            yield (reader.line_num, *werte)
+
+
+def _ics_zeilen(f):
+    """Liefert die logischen Zeilen einer iCalendar-Datei mit aufgelösten Folgezeilen."""
+
+    nummer = 0
+    aktuell = None
+    for nummer_roh, zeile in enumerate(f, 1):
+        zeile = zeile.rstrip("\r\n")
+        if zeile[:1] in (" ", "\t") and aktuell is not None:
+            aktuell += zeile[1:]
+            continue
+        if aktuell is not None:
+            yield nummer, aktuell
+        nummer, aktuell = nummer_roh, zeile
+    if aktuell is not None:
+        yield nummer, aktuell
+
+
+def _ics_text(wert):
+    """Löst die Maskierungen eines iCalendar-Textwerts auf."""
+
+    ergebnis = []
+    zeichen = iter(wert)
+    for z in zeichen:
+        if z == "\\":
+            folge = next(zeichen, "")
+            ergebnis.append("\n" if folge in ("n", "N") else folge)
+        else:
+            ergebnis.append(z)
+    return "".join(ergebnis)
+
+
+def _ics_beginn(wert):
+    """
+    Wandelt einen DTSTART-Wert in Datum und Uhrzeit um.
+
+    UTC-Zeiten (Endung "Z") werden in die lokale Zeit umgerechnet; Zeiten mit TZID und
+    ganztägige Termine werden unverändert übernommen.
+
+    Returns:
+        tuple: (Datum "JJJJ-MM-TT", Uhrzeit "HH:MM").
+    """
+
+    if "T" not in wert:
+        datum = datetime.datetime.strptime(wert[:8], "%Y%m%d")
+        return datum.strftime("%Y-%m-%d"), "00:00"
+    beginn = datetime.datetime.strptime(wert[:15], "%Y%m%dT%H%M%S")
+    if wert.endswith("Z"):
+        beginn = beginn.replace(tzinfo=datetime.timezone.utc).astimezone()
+    return beginn.strftime("%Y-%m-%d"), beginn.strftime("%H:%M")
+
+
+def lies_ics(datei):
+    """
+    Liest die Termine (VEVENT) einer iCalendar-Datei zeilenweise.
+
+    Der Text eines Termins setzt sich zeilenweise aus SUMMARY, DESCRIPTION und LOCATION zusammen;
+    so ergibt ein mit `exportieren` geschriebener Termin wieder den ursprünglichen Text.
+    Wiederholungsregeln (RRULE) werden nicht ausgewertet; es wird nur der erste Termin übernommen.
+
+    Args:
+        datei (str): Der Pfad zur .ics-Datei.
+
+    Yields:
+        tuple: (Zeilennummer, Datum, Uhrzeit, Text); Datum und Uhrzeit sind bei
+        ungültigem DTSTART leer.
+    """
+
+    with open(datei, encoding="utf-8-sig", errors="replace") as f:
+        termin = None
+        for nummer, zeile in _ics_zeilen(f):
+            name, _, wert = zeile.partition(":")
+            name = name.split(";", 1)[0].upper()
+            if name == "BEGIN" and wert.upper() == "VEVENT":
+                termin = {"zeile": nummer}
+            elif termin is None:
+                continue
+            elif name == "END" and wert.upper() == "VEVENT":
+                try:
+                    datum, uhrzeit = _ics_beginn(termin.get("DTSTART", ""))
+                except ValueError:
+                    datum, uhrzeit = "", ""
+                teile = [termin.get("SUMMARY", ""), termin.get("DESCRIPTION", "")]
+                if termin.get("LOCATION"):
+                    teile.append(f"Ort: {termin['LOCATION']}")
+                yield termin["zeile"], datum, uhrzeit, "\n".join(teil for teil in teile if teil)
+                termin = None
+            elif name == "DTSTART":
+                termin[name] = wert.strip()
+            elif name in ("SUMMARY", "DESCRIPTION", "LOCATION"):
+                termin[name] = _ics_text(wert)
+
+
+def parse_datum(text):
+    """Liefert ein `datetime.date` für einen Datumstext in einem der `DATUMSFORMATE` oder None."""
+
+    for datumsformat in DATUMSFORMATE:
+        try:
+            return datetime.datetime.strptime(text, datumsformat).date()
+        except ValueError:
+            pass
+    return None
+
+
+def parse_uhrzeit(text):
+    """Liefert (Uhrzeit "HH:MM", Minuten seit Mitternacht) für "H:MM", "HH:MM:SS" oder "HH.MM"; sonst None."""
+
+    if not text:
+        return "00:00", 0
+    teile = text.replace(".", ":").split(":")
+    try:
+        stunden = int(teile[0])
+        minuten = int(teile[1]) if len(teile) > 1 else 0
+    except ValueError:
+        return None
+    if not (0 <= stunden < 24 and 0 <= minuten < 60):
+        return None
+    return f"{stunden:02d}:{minuten:02d}", stunden * 60 + minuten
+
+
+def pruefe(datensaetze, fehler):
+    """
+    Prüft die Datensätze und bringt sie in das Format der Tabelle `Entries`.
+
+    Datum, Wochentag und `DateKey` werden je verschiedenem Datumstext nur einmal ermittelt.
+    Ungültige Datensätze werden übersprungen und in `fehler` gemeldet.
+
+    Args:
+        datensaetze (iterable): Tupel (Zeilennummer, Datum, Uhrzeit, Text).
+        fehler (ImportFehler): Sammelt die übersprungenen Datensätze.
+
+    Yields:
+        tuple: (Date, DayOfWeek, Time, AdditionalInfo, DateKey, TimeKey).
+    """
+
+    tage = {}
+    for zeile, datum_text, uhrzeit_text, text in datensaetze:
+        datum_text = datum_text.strip()
+        tag = tage.get(datum_text)
+        if tag is None and datum_text not in tage:
+            datum = parse_datum(datum_text)
+            tag = None if datum is None else (datum.strftime("%d.%m.%Y"), WOCHENTAGE[datum.weekday()], datum.isoformat())
+            tage[datum_text] = tag
+        if tag is None:
+            fehler.melde(zeile, f"Ungültiges Datum: '{datum_text}'")
+            continue
+
+        uhrzeit = parse_uhrzeit(uhrzeit_text.strip())
+        if uhrzeit is None:
+            fehler.melde(zeile, f"Ungültige Uhrzeit: '{uhrzeit_text}'")
+            continue
+
+        date, day_of_week, date_key = tag
+        time, time_key = uhrzeit
+        yield date, day_of_week, time, text, date_key, time_key
+
+
+def importiere(db_conn, eintraege, fortschritt=None, stapelgroesse=STAPELGROESSE):
+    """
+    Fügt Einträge stapelweise in einer einzigen Transaktion ein.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        eintraege (iterable): Tupel (Date, DayOfWeek, Time, AdditionalInfo, DateKey, TimeKey).
+        fortschritt (callable): Optionaler Rückruf `fortschritt(anzahl)` nach jedem Stapel;
+            gibt er False zurück, wird der Import abgebrochen.
+        stapelgroesse (int): Die Anzahl der Einträge je `executemany`.
+
+    Returns:
+        int: Die Anzahl der eingefügten Einträge.
+
+    Raises:
+        ImportAbgebrochen: Wenn `fortschritt` False liefert; es wurde nichts eingefügt.
+        sqlite3.Error: Bei einem Datenbankfehler; es wurde nichts eingefügt.
+    """
+
+    anzahl = 0
+    cursor = db_conn.cursor()
+    try:
+        cursor.execute("BEGIN")
+        with datenbank.volltext_nachtragen(cursor):
+            eintraege = iter(eintraege)
+            while True:
+                stapel = list(itertools.islice(eintraege, stapelgroesse))
+                if not stapel:
+                    break
+                cursor.executemany(EINFUEGEN, stapel)
+                anzahl += len(stapel)
+                if fortschritt is not None and fortschritt(anzahl) is False:
+                    raise ImportAbgebrochen()
+        db_conn.commit()
+    except Exception:
+        db_conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return anzahl
+
+
+def importiere_datei(db_conn, datei, fortschritt=None):
+    """
+    Importiert eine CSV- oder iCalendar-Datei; das Format wird an der Dateiendung erkannt.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        datei (str): Der Pfad zur .csv- oder .ics-Datei.
+        fortschritt (callable): Optionaler Rückruf `fortschritt(anzahl)`, siehe `importiere`.
+
+    Returns:
+        tuple: (Anzahl der eingefügten Einträge, ImportFehler).
+
+    Raises:
+        ValueError: Bei einer unbekannten Dateiendung.
+        ImportAbgebrochen: Wenn der Import abgebrochen wurde.
+        sqlite3.Error, OSError: Bei Datenbank- oder Dateifehlern.
+    """
+
+    endung = os.path.splitext(datei)[1].lower()
+    if endung == ".csv":
+        datensaetze = lies_csv(datei)
+    elif endung in (".ics", ".ical"):
+        datensaetze = lies_ics(datei)
+    else:
+        raise ValueError(f"Unbekanntes Dateiformat: '{endung}'")
+
+    fehler = ImportFehler()
+    anzahl = importiere(db_conn, pruefe(datensaetze, fehler), fortschritt)
+    return anzahl, fehler
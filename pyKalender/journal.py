@@ -0,0 +1,203 @@
+# journal.py
+"""
+Dieses Modul ermöglicht das Rückgängigmachen und Wiederholen von Änderungen an Einträgen;
+es hängt nicht von wx ab.
+
+Das Journal einer Verbindung erhält von `eintraege` nach jedem Commit die geänderten Zeilen
+als einen Schritt (siehe `eintraege.setze_journal`). Gespeichert werden nur diese Deltas
+(ID, Werte vorher, Werte nachher), nicht die ganze Datei; die Schritte liegen in einem
+Ringpuffer mit höchstens `MAX_SCHRITTE` Einträgen, ältere Schritte entfallen.
+
+`rueckgaengig` und `wiederholen` spielen einen Schritt über `eintraege.ersetze` in einer
+einzigen Transaktion ein. Dabei entstehen die üblichen Änderungsmeldungen (`aenderungen`),
+sodass Ansichten die betroffenen Zeilen direkt nachführen. Wurde ein Eintrag inzwischen auf
+anderem Weg geändert, wird der Schritt nicht angewandt und verworfen.
+
+Serien (`wiederholungen`), Importe und Einträge hinzugefügter Kalender werden nicht erfasst.
+Das Journal besteht nur, solange die Verbindung geöffnet ist.
+"""
+
+from collections import deque
+
+import eintraege
+
+# Höchstzahl der Schritte, die rückgängig gemacht werden können
+MAX_SCHRITTE = 100
+
+# Journal je Verbindung
+_journale = {}
+
+
+def beschreibung(schritt):
+    """
+    Beschreibt einen Schritt für die Anzeige, z. B. im Menü.
+
+    Args:
+        schritt (tuple): Änderungen (entry_id, vorher, nachher).
+
+    Returns:
+        str: z. B. "Löschen" oder "3 Änderungen".
+    """
+
+    if len(schritt) != 1:
+        return f"{len(schritt)} Änderungen"
+    _, vorher, nachher = schritt[0]
+    if vorher is None:
+        return "Hinzufügen"
+    if nachher is None:
+        return "Löschen"
+    return "Bearbeiten"
+
+
+class Journal:
+    """
+    Die Schritte, die auf einer Verbindung rückgängig gemacht bzw. wiederholt werden können.
+
+    Attributes:
+        rueckgaengig_liste (collections.deque): Die ausgeführten Schritte, der jüngste zuletzt.
+        wiederholen_liste (collections.deque): Die rückgängig gemachten Schritte, der jüngste zuletzt.
+    """
+
+    def __init__(self, max_schritte=MAX_SCHRITTE):
+        """
+        Initialisiert ein leeres Journal.
+
+        Args:
+            max_schritte (int): Die Höchstzahl der gespeicherten Schritte je Richtung.
+        """
+
+        self.rueckgaengig_liste = deque(maxlen=max_schritte)
+        self.wiederholen_liste = deque(maxlen=max_schritte)
+        self._spielt_ein = False
+
+    def aufzeichnen(self, schritt):
+        """
+        Nimmt einen ausgeführten Schritt auf; bisher rückgängig gemachte Schritte entfallen.
+
+        Args:
+            schritt (tuple): Änderungen (entry_id, vorher, nachher).
+        """
+
+        # Schritte, die das Journal selbst einspielt, verschiebt `_spiele_ein`
+        if self._spielt_ein:
+            return
+        self.rueckgaengig_liste.append(schritt)
+        self.wiederholen_liste.clear()
+
+    def naechster_rueckgaengig(self):
+        """Liefert die Beschreibung des Schritts, den `rueckgaengig` zurücknimmt, oder None."""
+
+        return beschreibung(self.rueckgaengig_liste[-1]) if self.rueckgaengig_liste else None
+
+    def naechster_wiederholen(self):
+        """Liefert die Beschreibung des Schritts, den `wiederholen` ausführt, oder None."""
+
+        return beschreibung(self.wiederholen_liste[-1]) if self.wiederholen_liste else None
+
+    def _spiele_ein(self, db_conn, von, nach, umkehren):
+        """
+        Nimmt den jüngsten Schritt aus `von`, spielt ihn ein und legt ihn auf `nach`.
+
+        Returns:
+            tuple: Der eingespielte Schritt oder None, wenn `von` leer ist.
+
+        Raises:
+            ValueError: Wenn ein Eintrag inzwischen geändert wurde; der Schritt wird verworfen.
+            sqlite3.Error: Wenn das Schreiben fehlschlägt; der Schritt bleibt erhalten.
+        """
+
+        if not von:
+            return None
+        schritt = von[-1]
+        if umkehren:
+            zeilen = [(entry_id, nachher, vorher) for entry_id, vorher, nachher in reversed(schritt)]
+        else:
+            zeilen = schritt
+
+        self._spielt_ein = True
+        try:
+            with eintraege.transaktion(db_conn):
+                for entry_id, vorher, nachher in zeilen:
+                    if not eintraege.ersetze(db_conn, entry_id, vorher, nachher):
+                        raise ValueError(f"Der Eintrag {entry_id} wurde inzwischen geändert oder gelöscht.")
+        except ValueError:
+            von.pop()
+            raise
+        finally:
+            self._spielt_ein = False
+
+        von.pop()
+        nach.append(schritt)
+        return schritt
+
+    def rueckgaengig(self, db_conn):
+        """
+        Macht den jüngsten Schritt rückgängig.
+
+        Args:
+            db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+        Returns:
+            tuple: Der zurückgenommene Schritt oder None, wenn es keinen gibt.
+
+        Raises:
+            ValueError: Wenn ein Eintrag inzwischen geändert wurde; der Schritt wird verworfen.
+            sqlite3.Error: Wenn das Schreiben fehlschlägt.
+        """
+
+        return self._spiele_ein(db_conn, self.rueckgaengig_liste, self.wiederholen_liste, True)
+
+    def wiederholen(self, db_conn):
+        """
+        Führt den zuletzt rückgängig gemachten Schritt erneut aus.
+
+        Args:
+            db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+        Returns:
+            tuple: Der ausgeführte Schritt oder None, wenn es keinen gibt.
+
+        Raises:
+            ValueError: Wenn ein Eintrag inzwischen geändert wurde; der Schritt wird verworfen.
+            sqlite3.Error: Wenn das Schreiben fehlschlägt.
+        """
+
+        return self._spiele_ein(db_conn, self.wiederholen_liste, self.rueckgaengig_liste, False)
+
+
+def aktiviere(db_conn, max_schritte=MAX_SCHRITTE):
+    """
+    Legt ein Journal für die Verbindung an und meldet es bei `eintraege` an.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        max_schritte (int): Die Höchstzahl der gespeicherten Schritte je Richtung.
+
+    Returns:
+        Journal: Das neue Journal.
+    """
+
+    journal = _journale[db_conn] = Journal(max_schritte)
+    eintraege.setze_journal(db_conn, journal.aufzeichnen)
+    return journal
+
+
+def beende(db_conn):
+    """Verwirft das Journal einer Verbindung vor dem Schließen."""
+
+    eintraege.setze_journal(db_conn, None)
+    _journale.pop(db_conn, None)
+
+
+def von(db_conn):
+    """
+    Liefert das Journal einer Verbindung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        Journal: Das Journal oder None, wenn keines aktiviert ist.
+    """
+
+    return _journale.get(db_conn)
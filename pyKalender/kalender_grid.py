@@ -0,0 +1,463 @@
+# kalender_grid.py
+"""
+Modul mit dem selbst gezeichneten Kalenderraster 'KalenderGrid' für das Hauptfenster.
+
+Das Raster zeigt einen Monat (sechs Wochen) oder eine Woche mit der Anzahl der Einträge und
+den ersten Einträgen jedes Tages. Gezeichnet wird mit `wx.BufferedPaintDC` in einen
+dauerhaften Puffer, in dem nur die geänderten Zellen neu gezeichnet werden; beim Wechsel
+der Auswahl sind das genau zwei Zellen.
+
+Die Einträge des sichtbaren Zeitraums werden mit einer einzigen Abfrage über die
+Tageszähler (`DayCounts`) und den Index auf `DateKey` gelesen und je Zeitraum
+zwischengespeichert, sodass das Blättern zwischen Monaten ohne spürbare Verzögerung bleibt.
+Sind weitere Kalender hinzugefügt (`kalender_quellen`), umfasst diese Abfrage alle Kalender als
+`UNION ALL`; Anzahlen werden addiert und Einträge mit ihrem Kalender gekennzeichnet.
+Termine von Serien (`wiederholungen`) werden nur für den sichtbaren Zeitraum berechnet und
+mitgezählt.
+"""
+
+import datetime
+from collections import OrderedDict
+
+import wx
+
+import aenderungen
+import kalender_quellen
+import messung
+import wiederholungen
+
+MONAT = "monat"
+WOCHE = "woche"
+
+
+class KalenderGrid(wx.Window):
+    """
+    Ein Kalenderraster mit Monats- und Wochenansicht.
+
+    Attributes:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung oder None.
+        modus (str): MONAT oder WOCHE.
+        datum (datetime.date): Der ausgewählte Tag.
+        erster_tag (datetime.date): Der erste sichtbare Tag (immer ein Montag).
+    """
+
+    WOCHENTAGE = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+
+    # Höchstzahl der angezeigten Einträge je Tag
+    EINTRAEGE_JE_TAG = {MONAT: 3, WOCHE: 12}
+    VORSCHAU_LAENGE = 80
+    # Anzahl der Zeiträume, deren Einträge zwischengespeichert werden
+    MAX_ZEITRAEUME = 12
+
+    KOPF_HOEHE = 20
+
+    # Abfrage je Kalender für `kalender_quellen.vereinige`
+    ABFRAGE = (
+        "SELECT d.DateKey AS DateKey, d.EntryCount, e.Time, substr(e.AdditionalInfo, 1, :laenge), "
+        "e.TimeKey AS TimeKey, e.ID AS ID, {quelle} AS Quelle "
+        "FROM {schema}.DayCounts d LEFT JOIN {schema}.Entries e ON e.ID IN ("
+        "SELECT ID FROM {schema}.Entries WHERE DateKey = d.DateKey ORDER BY TimeKey, ID LIMIT :anzahl) "
+        "WHERE d.DateKey BETWEEN :von AND :bis"
+    )
+    SORTIERUNG = " ORDER BY DateKey, TimeKey, ID, Quelle"
+
+    def __init__(self, parent, bei_auswahl=None):
+        """
+        Initialisiert das Raster mit dem heutigen Tag in der Monatsansicht.
+
+        Args:
+            parent (wx.Window): Das Elternfenster.
+            bei_auswahl (callable): Rückruf `bei_auswahl(datum)`, wenn der Benutzer einen Tag wählt.
+        """
+
+        super().__init__(parent, style=wx.WANTS_CHARS | wx.BORDER_SIMPLE)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+
+        self.db_conn = None
+        self.bei_auswahl = bei_auswahl
+        self.modus = MONAT
+        self.datum = datetime.date.today()
+        self.erster_tag = self._erster_tag(self.datum)
+        self.eintraege = {}
+        self.zeitraeume = OrderedDict()
+        # True, solange nach Änderungsmeldungen ein Neuladen aussteht
+        self.neu_laden_geplant = False
+
+        self.puffer = None
+        self.schmutzig = set()
+        self.kopf_schmutzig = True
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_LEFT_DOWN, self.on_left_down)
+        self.Bind(wx.EVT_LEFT_DCLICK, self.on_left_down)
+        self.Bind(wx.EVT_MOUSEWHEEL, self.on_mouse_wheel)
+        self.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+    # Zeitraum und Daten
+
+    @property
+    def zeilen(self):
+        """Die Anzahl der sichtbaren Wochen."""
+
+        return 6 if self.modus == MONAT else 1
+
+    def _erster_tag(self, datum):
+        """Ermittelt den ersten sichtbaren Tag für ein Datum im aktuellen Modus."""
+
+        if self.modus == MONAT:
+            datum = datum.replace(day=1)
+        return datum - datetime.timedelta(days=datum.weekday())
+
+    def verbinde(self, db_conn):
+        """
+        Setzt die Datenbankverbindung nach dem Öffnen einer Datei.
+
+        Args:
+            db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        """
+
+        self.db_conn = db_conn
+        aenderungen.abonniere(self.on_eintraege_geaendert)
+        self.zeitraeume.clear()
+        self.lade_eintraege()
+
+    def trenne(self):
+        """Löst die Datenbankverbindung vor dem Schließen der Datei und leert das Raster."""
+
+        aenderungen.kuendige(self.on_eintraege_geaendert)
+        self.db_conn = None
+        self.zeitraeume.clear()
+        self.lade_eintraege()
+
+    def lade_eintraege(self, nur_geaenderte=False):
+        """
+        Übernimmt die Einträge des sichtbaren Zeitraums und markiert die betroffenen Zellen.
+
+        Args:
+            nur_geaenderte (bool): True, um nur Zellen neu zu zeichnen, deren Inhalt sich geändert hat.
+        """
+
+        alte_eintraege = self.eintraege
+        if self.db_conn is None:
+            self.eintraege = {}
+        else:
+            # Erst hier, damit der Programmstart ohne geöffnete Datei sqlite3 nicht lädt
+            import sqlite3
+
+            try:
+                self.eintraege = self._zeitraum(self.erster_tag, self.zeilen * 7)
+            except sqlite3.Error as e:
+                self.eintraege = {}
+                wx.MessageBox(f"Fehler beim Laden der Einträge: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+
+        if nur_geaenderte:
+            self.markiere(index for index, tag in enumerate(self._sichtbare_tage())
+                          if alte_eintraege.get(tag.isoformat()) != self.eintraege.get(tag.isoformat()))
+        else:
+            self.markiere_alle()
+
+    def _zeitraum(self, erster_tag, tage):
+        """
+        Liefert die Einträge eines Zeitraums, bei Bedarf mit einer einzigen Abfrage aus der Datenbank.
+
+        Returns:
+            dict: DateKey -> (Anzahl, [(Time, Vorschau), ...]); Tage ohne Einträge fehlen.
+        """
+
+        if self.db_conn is None:
+            return {}
+        schluessel = (erster_tag, tage)
+        if schluessel in self.zeitraeume:
+            self.zeitraeume.move_to_end(schluessel)
+            return self.zeitraeume[schluessel]
+
+        letzter_tag = erster_tag + datetime.timedelta(days=tage - 1)
+        zusammengefuehrt = kalender_quellen.zusammengefuehrt(self.db_conn)
+        with messung.stoppuhr("Kalender: Zeitraum laden"):
+            cursor = self.db_conn.cursor()
+            cursor.execute(kalender_quellen.vereinige(self.db_conn, self.ABFRAGE) + self.SORTIERUNG,
+                           {"laenge": self.VORSCHAU_LAENGE, "anzahl": self.EINTRAEGE_JE_TAG[self.modus],
+                            "von": erster_tag.isoformat(), "bis": letzter_tag.isoformat()})
+            ergebnis = cursor.fetchall()
+            cursor.close()
+            termine = list(wiederholungen.vorkommen(self.db_conn, erster_tag, letzter_tag))
+        messung.zaehle("Zeilen: Kalender", len(ergebnis))
+        eintraege = {}
+        # Die Anzahl eines Kalenders steht in jeder seiner Zeilen eines Tages und zählt nur einmal
+        gezaehlt = set()
+        for datum_schluessel, anzahl, time, vorschau, time_key, _, quelle in ergebnis:
+            bisher, zeilen = eintraege.get(datum_schluessel, (0, []))
+            if (datum_schluessel, quelle) not in gezaehlt:
+                gezaehlt.add((datum_schluessel, quelle))
+                bisher += anzahl
+            if time is not None:
+                if zusammengefuehrt:
+                    vorschau = f"[{kalender_quellen.bezeichnung(self.db_conn, quelle)}] {vorschau or ''}"
+                zeilen.append((time_key, time, vorschau or ""))
+            eintraege[datum_schluessel] = (bisher, zeilen)
+        if termine or zusammengefuehrt:
+            # Serientermine mitzählen und nach der Uhrzeit zwischen die Einträge sortieren
+            for termin in termine:
+                anzahl, zeilen = eintraege.get(termin.date_key, (0, []))
+                zeilen.append((termin.time_key, termin.time,
+                               f"{wiederholungen.KENNZEICHEN} {(termin.additional_info or '')[:self.VORSCHAU_LAENGE]}"))
+                eintraege[termin.date_key] = (anzahl + 1, zeilen)
+            # Jeder Kalender liefert bis zu EINTRAEGE_JE_TAG Einträge je Tag
+            for anzahl, zeilen in eintraege.values():
+                zeilen.sort(key=lambda zeile: zeile[0])
+                del zeilen[self.EINTRAEGE_JE_TAG[self.modus]:]
+        eintraege = {datum_schluessel: (anzahl, [zeile[1:] for zeile in zeilen])
+                     for datum_schluessel, (anzahl, zeilen) in eintraege.items()}
+
+        self.zeitraeume[schluessel] = eintraege
+        while len(self.zeitraeume) > self.MAX_ZEITRAEUME:
+            self.zeitraeume.popitem(last=False)
+        return eintraege
+
+    def _sichtbare_tage(self):
+        """Liefert die sichtbaren Tage in Zellenreihenfolge."""
+
+        return [self.erster_tag + datetime.timedelta(days=index) for index in range(self.zeilen * 7)]
+
+    def on_eintraege_geaendert(self, db_conn, aktion, entry_id, alter_schluessel):
+        """
+        Liest den sichtbaren Zeitraum nach einer Änderung neu und zeichnet nur geänderte Zellen.
+
+        Gelesen wird erst nach dem aktuellen Ereignis, sodass viele Meldungen hintereinander
+        nur einmal neu laden.
+        """
+
+        if db_conn is self.db_conn:
+            self.zeitraeume.clear()
+            if not self.neu_laden_geplant:
+                self.neu_laden_geplant = True
+                wx.CallAfter(self.lade_neu)
+
+    def lade_neu(self):
+        """Liest den sichtbaren Zeitraum nach gesammelten Änderungsmeldungen neu."""
+
+        # Das Raster kann inzwischen zerstört worden sein
+        if not self:
+            return
+        self.neu_laden_geplant = False
+        if self.db_conn is not None:
+            self.lade_eintraege(nur_geaenderte=True)
+
+    # Auswahl und Modus
+
+    def setze_modus(self, modus):
+        """
+        Wechselt zwischen Monats- und Wochenansicht.
+
+        Args:
+            modus (str): MONAT oder WOCHE.
+        """
+
+        if modus != self.modus:
+            self.modus = modus
+            self.erster_tag = self._erster_tag(self.datum)
+            self.lade_eintraege()
+
+    def setze_datum(self, datum):
+        """
+        Wählt einen Tag aus, ohne `bei_auswahl` aufzurufen.
+
+        Liegt der Tag im sichtbaren Zeitraum, werden nur die alte und die neue Zelle neu
+        gezeichnet; sonst wird der passende Zeitraum geladen.
+
+        Args:
+            datum (datetime.date): Der auszuwählende Tag.
+        """
+
+        if datum == self.datum:
+            return
+        alter_index = self._index(self.datum)
+        self.datum = datum
+        erster_tag = self._erster_tag(datum)
+        if erster_tag != self.erster_tag:
+            self.erster_tag = erster_tag
+            self.lade_eintraege()
+        else:
+            self.markiere([alter_index, self._index(datum)])
+
+    def waehle(self, datum):
+        """Wählt einen Tag durch eine Benutzeraktion aus und meldet ihn über `bei_auswahl`."""
+
+        self.setze_datum(datum)
+        if self.bei_auswahl is not None:
+            self.bei_auswahl(datum)
+
+    def _index(self, datum):
+        """Liefert den Zellenindex eines Tages oder None, wenn er nicht sichtbar ist."""
+
+        index = (datum - self.erster_tag).days
+        return index if 0 <= index < self.zeilen * 7 else None
+
+    def _blaettere(self, richtung):
+        """Wechselt um einen Monat bzw. eine Woche vor oder zurück."""
+
+        if self.modus == WOCHE:
+            self.waehle(self.datum + datetime.timedelta(days=7 * richtung))
+            return
+        monat = self.datum.month - 1 + richtung
+        jahr = self.datum.year + monat // 12
+        monat = monat % 12 + 1
+        # Tag auf das Monatsende begrenzen, z. B. 31.01. -> 28.02.
+        naechster = datetime.date(jahr + monat // 12, monat % 12 + 1, 1) - datetime.timedelta(days=1)
+        self.waehle(datetime.date(jahr, monat, min(self.datum.day, naechster.day)))
+
+    # Zeichnen
+
+    def markiere(self, indizes):
+        """Markiert einzelne Zellen zum Neuzeichnen."""
+
+        for index in indizes:
+            if index is not None:
+                self.schmutzig.add(index)
+                self.RefreshRect(self._zellen_rechteck(index), eraseBackground=False)
+
+    def markiere_alle(self):
+        """Markiert das gesamte Raster einschließlich der Kopfzeile zum Neuzeichnen."""
+
+        self.kopf_schmutzig = True
+        self.schmutzig = set(range(self.zeilen * 7))
+        self.Refresh(eraseBackground=False)
+
+    def _zellen_rechteck(self, index):
+        """Liefert das Rechteck der Zelle mit dem angegebenen Index."""
+
+        breite, hoehe = self.GetClientSize()
+        zeile, spalte = divmod(index, 7)
+        x0 = spalte * breite // 7
+        x1 = (spalte + 1) * breite // 7
+        zeilen_hoehe = max(hoehe - self.KOPF_HOEHE, 0)
+        y0 = self.KOPF_HOEHE + zeile * zeilen_hoehe // self.zeilen
+        y1 = self.KOPF_HOEHE + (zeile + 1) * zeilen_hoehe // self.zeilen
+        return wx.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def on_size(self, event):
+        """Legt den Puffer in der neuen Größe an und zeichnet alles neu."""
+
+        breite, hoehe = self.GetClientSize()
+        self.puffer = wx.Bitmap(max(breite, 1), max(hoehe, 1))
+        self.markiere_alle()
+        event.Skip()
+
+    def on_paint(self, event):
+        """Zeichnet die markierten Zellen in den Puffer und überträgt ihn in das Fenster."""
+
+        if self.puffer is None:
+            breite, hoehe = self.GetClientSize()
+            self.puffer = wx.Bitmap(max(breite, 1), max(hoehe, 1))
+            self.kopf_schmutzig = True
+            self.schmutzig = set(range(self.zeilen * 7))
+        dc = wx.BufferedPaintDC(self, self.puffer)
+        if self.kopf_schmutzig:
+            self._zeichne_kopf(dc)
+            self.kopf_schmutzig = False
+        tage = self._sichtbare_tage()
+        for index in sorted(self.schmutzig):
+            if index < len(tage):
+                self._zeichne_zelle(dc, index, tage[index])
+        self.schmutzig.clear()
+
+    def _zeichne_kopf(self, dc):
+        """Zeichnet die Kopfzeile mit den Wochentagen."""
+
+        breite, _ = self.GetClientSize()
+        dc.SetBrush(wx.Brush(wx.SystemSettings.GetColour(wx.SYS_COLOUR_BTNFACE)))
+        dc.SetPen(wx.TRANSPARENT_PEN)
+        dc.DrawRectangle(0, 0, breite, self.KOPF_HOEHE)
+        dc.SetFont(self.GetFont())
+        dc.SetTextForeground(wx.SystemSettings.GetColour(wx.SYS_COLOUR_BTNTEXT))
+        for spalte, name in enumerate(self.WOCHENTAGE):
+            rechteck = wx.Rect(spalte * breite // 7, 0, breite // 7, self.KOPF_HOEHE)
+            dc.DrawLabel(name, rechteck, wx.ALIGN_CENTER)
+
+    def _zeichne_zelle(self, dc, index, tag):
+        """Zeichnet eine einzelne Tageszelle."""
+
+        rechteck = self._zellen_rechteck(index)
+        anzahl, zeilen = self.eintraege.get(tag.isoformat(), (0, []))
+        ausgewaehlt = tag == self.datum
+
+        if ausgewaehlt:
+            hintergrund = wx.SystemSettings.GetColour(wx.SYS_COLOUR_HIGHLIGHT)
+            text_farbe = wx.SystemSettings.GetColour(wx.SYS_COLOUR_HIGHLIGHTTEXT)
+        elif tag == datetime.date.today():
+            hintergrund = wx.Colour(255, 250, 205)
+            text_farbe = wx.BLACK
+        elif self.modus == MONAT and tag.month != self.datum.month:
+            hintergrund = wx.Colour(240, 240, 240)
+            text_farbe = wx.Colour(128, 128, 128)
+        else:
+            hintergrund = wx.WHITE
+            text_farbe = wx.BLACK
+
+        dc.SetBrush(wx.Brush(hintergrund))
+        dc.SetPen(wx.Pen(wx.Colour(200, 200, 200)))
+        dc.DrawRectangle(rechteck)
+
+        dc.SetClippingRegion(wx.Rect(rechteck).Deflate(2, 2))
+        dc.SetTextForeground(text_farbe)
+        font = self.GetFont()
+        dc.SetFont(font.Bold() if anzahl else font)
+        kopf = f"{tag.day}." if self.modus == MONAT else f"{self.WOCHENTAGE[tag.weekday()]} {tag.day}.{tag.month}."
+        _, zeilen_hoehe = dc.GetTextExtent(kopf)
+        dc.DrawText(kopf, rechteck.x + 3, rechteck.y + 2)
+        if anzahl:
+            zaehler = f"({anzahl})"
+            zaehler_breite, _ = dc.GetTextExtent(zaehler)
+            dc.DrawText(zaehler, rechteck.x + rechteck.width - zaehler_breite - 4, rechteck.y + 2)
+
+        dc.SetFont(font.Smaller())
+        y = rechteck.y + zeilen_hoehe + 4
+        for time, vorschau in zeilen:
+            if y >= rechteck.y + rechteck.height:
+                break
+            text = f"{time} {vorschau.splitlines()[0] if vorschau else ''}"
+            dc.DrawText(text, rechteck.x + 3, y)
+            y += dc.GetTextExtent(text)[1]
+        dc.DestroyClippingRegion()
+
+    # Bedienung
+
+    def on_left_down(self, event):
+        """Wählt den angeklickten Tag aus."""
+
+        self.SetFocus()
+        x, y = event.GetPosition()
+        breite, hoehe = self.GetClientSize()
+        if y < self.KOPF_HOEHE or breite <= 0 or hoehe <= self.KOPF_HOEHE:
+            return
+        spalte = min(x * 7 // breite, 6)
+        zeile = min((y - self.KOPF_HOEHE) * self.zeilen // (hoehe - self.KOPF_HOEHE), self.zeilen - 1)
+        self.waehle(self.erster_tag + datetime.timedelta(days=zeile * 7 + spalte))
+
+    def on_mouse_wheel(self, event):
+        """Blättert mit dem Mausrad einen Monat bzw. eine Woche weiter."""
+
+        self._blaettere(-1 if event.GetWheelRotation() > 0 else 1)
+
+    def on_key_down(self, event):
+        """Bewegt die Auswahl mit den Pfeiltasten und blättert mit Bild auf/ab."""
+
+        schritte = {wx.WXK_LEFT: -1, wx.WXK_RIGHT: 1, wx.WXK_UP: -7, wx.WXK_DOWN: 7}
+        taste = event.GetKeyCode()
+        if taste in schritte:
+            self.waehle(self.datum + datetime.timedelta(days=schritte[taste]))
+        elif taste == wx.WXK_PAGEUP:
+            self._blaettere(-1)
+        elif taste == wx.WXK_PAGEDOWN:
+            self._blaettere(1)
+        else:
+            event.Skip()
+
+    def on_destroy(self, event):
+        """Meldet das Raster von den Änderungsmeldungen ab."""
+
+        if event.GetEventObject() is self:
+            aenderungen.kuendige(self.on_eintraege_geaendert)
+        event.Skip()
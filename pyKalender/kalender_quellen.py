@@ -0,0 +1,269 @@
+# kalender_quellen.py
+"""
+Dieses Modul verwaltet weitere Kalenderdateien, die zur geöffneten Datenbank hinzugefügt werden.
+
+Jede weitere Datei wird mit `ATTACH DATABASE` unter einem eigenen Schema (`kal1`, `kal2`, ...)
+an dieselbe Verbindung gehängt, statt sie einzeln zu öffnen und vollständig zu laden. Ein
+Kalender wird über seine Nummer bezeichnet: 0 (`HAUPT`) für die geöffnete Datei, N für das
+Schema `kalN`. Ansichten lesen alle Kalender mit einer einzigen `UNION ALL`-Abfrage, die
+`vereinige` aus einer Vorlage je Kalender baut. Jeder Teil filtert über den Index auf `DateKey`
+seines Schemas; ist die Abfrage nach diesem Index sortiert, führt SQLite die Teile ohne
+zusätzliche Sortierung zusammen. Jede Zeile trägt die Nummer ihres Kalenders in der Spalte
+`Quelle`; eine Zahl statt des Schemanamens, da ein Text je Zeile das Lesen langer Listen
+spürbar verlangsamt.
+
+Geändert werden nur Einträge der geöffneten Datei (Schema `main`); Einträge weiterer Kalender
+werden nur angezeigt. Serientermine (`wiederholungen`) werden nur aus der geöffneten Datei gelesen.
+
+Das Modul hängt nicht von wx ab.
+"""
+
+import os
+
+import eintraege
+
+# Nummer der geöffneten Datei (Schema `main`)
+HAUPT = 0
+
+# Anweisungen, mit denen auch der AbfrageWorker die Kalender an seine Verbindung hängt
+ANHAENGEN = "ATTACH DATABASE ? AS {schema}"
+ABHAENGEN = "DETACH DATABASE {schema}"
+
+# Kalender je Verbindung: Nummer -> Bezeichnung, beginnend mit HAUPT
+_quellen = {}
+
+# Zuletzt vergebene Schemanummer je Verbindung; Nummern werden nicht wiederverwendet, damit
+# noch laufende Abfragen kein anderes Schema unter demselben Namen treffen
+_nummern = {}
+
+
+def _bezeichnung(db_datei):
+    """Liefert den Dateinamen ohne Endung als Bezeichnung eines Kalenders."""
+
+    return os.path.splitext(os.path.basename(db_datei))[0]
+
+
+def schema(quelle):
+    """
+    Liefert das Schema eines Kalenders für SQL-Anweisungen.
+
+    Args:
+        quelle (int): Die Nummer des Kalenders.
+
+    Returns:
+        str: "main" für HAUPT, sonst "kalN".
+    """
+
+    return "main" if quelle == HAUPT else f"kal{quelle}"
+
+
+def quellen(db_conn):
+    """
+    Liefert die Nummern aller Kalender einer Verbindung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        list: Die Nummern, beginnend mit HAUPT.
+    """
+
+    kalender = _quellen.get(db_conn)
+    return list(kalender) if kalender else [HAUPT]
+
+
+def weitere(db_conn):
+    """
+    Liefert die hinzugefügten Kalender einer Verbindung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        list: Tupel (Nummer, Bezeichnung) in der Reihenfolge des Hinzufügens.
+    """
+
+    return [(quelle, name) for quelle, name in _quellen.get(db_conn, {}).items() if quelle != HAUPT]
+
+
+def zusammengefuehrt(db_conn):
+    """Liefert True, wenn zur Verbindung weitere Kalender hinzugefügt sind."""
+
+    return len(_quellen.get(db_conn, ())) > 1
+
+
+def bezeichnung(db_conn, quelle):
+    """
+    Liefert die Bezeichnung eines Kalenders für die Anzeige.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        quelle (int): Die Nummer des Kalenders.
+
+    Returns:
+        str: Der Dateiname ohne Endung bzw. das Schema, wenn er nicht bekannt ist.
+    """
+
+    return _quellen.get(db_conn, {}).get(quelle) or schema(quelle)
+
+
+def datei(db_conn, quelle):
+    """
+    Liefert den Pfad der Datei, die als Kalender an die Verbindung gehängt ist.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        quelle (int): Die Nummer des Kalenders.
+
+    Returns:
+        str: Der Pfad oder None, wenn unter dem Schema keine Datei angehängt ist.
+    """
+
+    cursor = db_conn.cursor()
+    cursor.execute("PRAGMA database_list")
+    dateien = {name: pfad for _, name, pfad in cursor.fetchall()}
+    cursor.close()
+    return dateien.get(schema(quelle)) or None
+
+
+def anhaengen(db_conn, db_datei, quelle=None):
+    """
+    Hängt eine weitere Kalenderdatei an die Verbindung.
+
+    Die Datei muss bereits auf dem aktuellen Schema-Stand sein (`datenbank.migriere_schema`
+    mit einer eigenen Verbindung), da Migrationen nur das Schema `main` bearbeiten.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        db_datei (str): Der Pfad zur Kalenderdatei.
+        quelle (int): Die bisherige Nummer, wenn ein entfernter Kalender wieder angehängt
+            wird; None vergibt eine neue Nummer.
+
+    Returns:
+        int: Die Nummer des neuen Kalenders.
+
+    Raises:
+        ValueError: Wenn die Datei bereits geöffnet ist oder nicht auf dem aktuellen Schema-Stand ist.
+        sqlite3.Error: Wenn die Datei nicht angehängt werden kann.
+    """
+
+    import datenbank
+
+    cursor = db_conn.cursor()
+    try:
+        cursor.execute("PRAGMA database_list")
+        dateien = {name: datei for _, name, datei in cursor.fetchall()}
+        ziel = os.path.normcase(os.path.abspath(db_datei))
+        if any(datei and os.path.normcase(os.path.abspath(datei)) == ziel for datei in dateien.values()):
+            raise ValueError(f"Der Kalender '{_bezeichnung(db_datei)}' ist bereits geöffnet.")
+
+        if quelle is None:
+            quelle = _nummern.get(db_conn, 0) + 1
+        cursor.execute(ANHAENGEN.format(schema=schema(quelle)), (db_datei,))
+        try:
+            cursor.execute(f"PRAGMA {schema(quelle)}.user_version")
+            if cursor.fetchone()[0] < datenbank.SCHEMA_VERSION:
+                raise ValueError(f"Der Kalender '{_bezeichnung(db_datei)}' ist nicht auf dem aktuellen Stand.")
+        except Exception:
+            cursor.execute(ABHAENGEN.format(schema=schema(quelle)))
+            raise
+    finally:
+        cursor.close()
+
+    _nummern[db_conn] = max(_nummern.get(db_conn, 0), quelle)
+    kalender = _quellen.setdefault(db_conn, {HAUPT: _bezeichnung(dateien.get("main") or "main")})
+    kalender[quelle] = _bezeichnung(db_datei)
+    return quelle
+
+
+def entfernen(db_conn, quelle):
+    """
+    Hängt einen zuvor hinzugefügten Kalender wieder von der Verbindung ab.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        quelle (int): Die Nummer des Kalenders.
+
+    Raises:
+        ValueError: Wenn die Nummer kein hinzugefügter Kalender ist.
+        sqlite3.Error: Wenn der Kalender nicht abgehängt werden kann.
+    """
+
+    if quelle == HAUPT or quelle not in _quellen.get(db_conn, {}):
+        raise ValueError(f"Unbekannter Kalender: {quelle}")
+    db_conn.execute(ABHAENGEN.format(schema=schema(quelle)))
+    del _quellen[db_conn][quelle]
+
+
+def vergessen(db_conn):
+    """Verwirft die Kalender einer Verbindung vor dem Schließen."""
+
+    _quellen.pop(db_conn, None)
+    _nummern.pop(db_conn, None)
+
+
+def vereinige(db_conn, vorlage):
+    """
+    Baut aus einer Abfrage je Kalender eine `UNION ALL`-Abfrage über alle Kalender.
+
+    Ohne weitere Kalender ist das Ergebnis die Vorlage für das Schema `main` allein.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        vorlage (str): Ein SELECT, in dem `{schema}` durch das Schema und `{quelle}` durch die
+            Nummer des Kalenders ersetzt wird, z. B.
+            "SELECT ID, {quelle} AS Quelle FROM {schema}.Entries WHERE DateKey = :tag".
+            Parameter müssen benannt sein, da sie in jedem Teil vorkommen.
+
+    Returns:
+        str: Die Abfrage; ORDER BY und LIMIT hängt der Aufrufer an.
+    """
+
+    return " UNION ALL ".join(vorlage.format(schema=schema(quelle), quelle=quelle) for quelle in quellen(db_conn))
+
+
+def tageszaehler(db_conn, von, bis):
+    """
+    Liefert die Anzahl der Einträge je Tag aller Kalender aus den Tageszählern (`DayCounts`).
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        von (datetime.date): Der erste Tag.
+        bis (datetime.date): Der letzte Tag.
+
+    Returns:
+        dict: ISO-Datum -> Anzahl; Tage ohne Einträge fehlen.
+    """
+
+    query = ("SELECT DateKey, SUM(EntryCount) FROM ("
+             + vereinige(db_conn, "SELECT DateKey, EntryCount FROM {schema}.DayCounts WHERE DateKey BETWEEN :von AND :bis")
+             + ") GROUP BY DateKey")
+    cursor = db_conn.cursor()
+    cursor.execute(query, {"von": von.isoformat(), "bis": bis.isoformat()})
+    zaehler = dict(cursor.fetchall())
+    cursor.close()
+    return zaehler
+
+
+def lade(db_conn, quelle, entry_id):
+    """
+    Lädt einen Eintrag aus einem beliebigen Kalender.
+
+    Einträge der geöffneten Datei werden über `eintraege.lade` und dessen Cache gelesen.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        quelle (int): Die Nummer des Kalenders.
+        entry_id (int): Die ID des Eintrags in diesem Kalender.
+
+    Returns:
+        eintraege.Eintrag: Der Eintrag oder None, wenn er nicht existiert.
+    """
+
+    if quelle == HAUPT:
+        return eintraege.lade(db_conn, entry_id)
+    cursor = db_conn.cursor()
+    cursor.execute(f"SELECT {eintraege.SPALTEN} FROM {schema(quelle)}.Entries WHERE ID = ?", (entry_id,))
+    zeile = cursor.fetchone()
+    cursor.close()
+    return eintraege.Eintrag(*zeile) if zeile is not None else None
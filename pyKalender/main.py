@@ -4,10 +4,26 @@ Dieses Skript initialisiert und startet die Kalenderanwendung.
 
 Es erstellt eine Instanz der `MeinApp`-Klasse aus dem Modul `meinapp.py`
 und startet die Hauptereignisschleife von wxPython, um die Anwendung auszuführen.
+
+Die Dauer der Importe beim Start wird in `messung` erfasst (Einträge "Start: ..." im
+Performance-Dialog). Mit `--startzeit DATEI` schreibt die Anwendung nach dem ersten Zeichnen
+des Hauptfensters alle Messwerte als JSON in DATEI und beendet sich; `benchmark.startzeit`
+startet sie auf diese Weise mehrfach und prüft die Zeit bis zum Fenster.
 """
 
-import wx
-from meinapp import MeinApp
+from time import perf_counter
+
+# Bezugspunkt für alle Startzeiten; so früh wie möglich gesetzt
+BEGINN = perf_counter()
+
+import sys
+
+import messung
+
+with messung.stoppuhr("Start: Import wx"):
+    import wx
+with messung.stoppuhr("Start: Import Anwendung"):
+    from meinapp import MeinApp
 
 def main():
     """
@@ -18,7 +34,13 @@ def main():
     Returns:
         None
     """
-    app = MeinApp()
+
+    # Bewusst ohne argparse, das allein mehrere Millisekunden zum Laden braucht
+    startzeit_datei = None
+    if len(sys.argv) == 3 and sys.argv[1] == "--startzeit":
+        startzeit_datei = sys.argv[2]
+
+    app = MeinApp(beginn=BEGINN, startzeit_datei=startzeit_datei)
     app.MainLoop()
 
 if __name__ == "__main__":
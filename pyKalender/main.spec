@@ -1,5 +1,29 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Build-Modus über die Umgebungsvariable KALENDER_BUILD:
+#   standard     eine einzelne, mit UPX gepackte EXE (bisheriges Verhalten)
+#   schnellstart ein Verzeichnis dist/main mit main.exe, abgestimmt auf kurze Startzeit:
+#                - kein Entpacken aller Bibliotheken in ein Temp-Verzeichnis bei jedem Start
+#                  wie bei --onefile
+#                - kein UPX, dessen Entpacken beim Laden jeder DLL Zeit kostet und
+#                  Virenscanner zu einer erneuten Prüfung veranlasst
+#                - ohne Module der Standardbibliothek, die die Anwendung nicht verwendet,
+#                  damit das Archiv kleiner wird
+# Aufruf: set KALENDER_BUILD=schnellstart && pyinstaller main.spec
+# Prüfen: python -m benchmark.startzeit --programm dist\main\main.exe
+import os
+
+MODUS = os.environ.get('KALENDER_BUILD', 'standard').strip()
+if MODUS not in ('standard', 'schnellstart'):
+    raise SystemExit(f"Unbekannter Build-Modus KALENDER_BUILD={MODUS!r}, erwartet 'standard' oder 'schnellstart'")
+SCHNELLSTART = MODUS == 'schnellstart'
+
+# Standardbibliothek, die weder die Anwendung noch wxPython importiert
+NICHT_BENOETIGT = [
+    'tkinter', 'unittest', 'pydoc', 'pydoc_data', 'doctest', 'lib2to3', 'test',
+    'xmlrpc', 'ftplib', 'imaplib', 'poplib', 'smtplib', 'mailbox', 'turtle', 'turtledemo',
+    'idlelib', 'ensurepip', 'venv', 'distutils', 'setuptools', 'pip',
+]
 
 a = Analysis(
     ['main.py'],
@@ -10,30 +34,59 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=NICHT_BENOETIGT if SCHNELLSTART else [],
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=True,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    version='version.txt',
-)
+if SCHNELLSTART:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        version='version.txt',
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='main',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=True,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        version='version.txt',
+    )
@@ -0,0 +1,103 @@
+# mehrfachbearbeiten_dialog.py
+import wx
+import sqlite3
+
+import eintraege
+from importieren import parse_uhrzeit
+
+class MehrfachBearbeitungsDialog(wx.Dialog):
+    """
+    Ein Dialog, der mehrere Einträge auf einmal ändert: eine neue Uhrzeit setzen und/oder
+    Text an die zusätzlichen Informationen anhängen.
+
+    Alle Einträge werden mit `eintraege.aendern_mehrere` in einer Transaktion geändert und
+    lassen sich als ein Schritt rückgängig machen (siehe `journal`).
+
+    Attributes:
+        parent (wx.Window): Das übergeordnete Fenster, zu dem dieser Dialog gehört.
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        entry_ids (list): Die IDs der Einträge in der Datenbank.
+    """
+
+    def __init__(self, parent, db_conn, entry_ids):
+        """
+        Initialisiert den Dialog für die ausgewählten Einträge.
+
+        Args:
+            parent (wx.Window): Das übergeordnete Fenster, zu dem dieser Dialog gehört.
+            db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+            entry_ids (list): Die IDs der Einträge in der Datenbank.
+        """
+        super().__init__(parent, title=f"{len(entry_ids)} Einträge bearbeiten")
+
+        self.db_conn = db_conn
+        self.entry_ids = entry_ids
+
+        self.initialize_ui()
+
+    def initialize_ui(self):
+        """Initialisiert die Benutzeroberfläche des Dialogs."""
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # CheckBox und TextCtrl für die neue Uhrzeit; ohne Haken bleibt die Uhrzeit erhalten
+        self.time_checkbox = wx.CheckBox(self, label="Uhrzeit setzen:")
+        self.time_text = wx.TextCtrl(self, value="00:00")
+        self.time_text.Enable(False)
+        self.time_checkbox.Bind(wx.EVT_CHECKBOX, lambda event: self.time_text.Enable(event.IsChecked()))
+
+        # Label und Multiline-TextCtrl für den anzuhängenden Text
+        anhang_label = wx.StaticText(self, label="An die zusätzlichen Informationen anhängen:")
+        self.anhang_text = wx.TextCtrl(self, style=wx.TE_MULTILINE)
+
+        sizer.Add(self.time_checkbox, 0, wx.ALL | wx.EXPAND, 10)
+        sizer.Add(self.time_text, 0, wx.ALL | wx.EXPAND, 10)
+        sizer.Add(anhang_label, 0, wx.ALL | wx.EXPAND, 10)
+        sizer.Add(self.anhang_text, 1, wx.ALL | wx.EXPAND, 10)
+
+        # Button-Sizer für OK und Abbrechen
+        btn_sizer = self.CreateButtonSizer(wx.OK | wx.CANCEL)
+        sizer.Add(btn_sizer, 0, wx.ALIGN_CENTER | wx.ALL, 10)
+
+        self.Bind(wx.EVT_BUTTON, self.on_ok_button, id=wx.ID_OK)
+
+        self.SetSizerAndFit(sizer)
+
+    def update_entries(self):
+        """
+        Ändert alle Einträge mit einer Anweisung in einer Transaktion.
+
+        Returns:
+            bool: False, wenn die Eingaben ungültig sind und der Dialog offen bleiben soll.
+        """
+
+        time = None
+        if self.time_checkbox.GetValue():
+            # Prüft den Bereich und schreibt die Uhrzeit wie der Import als "HH:MM"; ein leeres
+            # Feld ergäbe dort 00:00 und würde alle Einträge unbemerkt auf Mitternacht setzen
+            text = self.time_text.GetValue().strip()
+            uhrzeit = parse_uhrzeit(text) if text else None
+            if uhrzeit is None:
+                wx.MessageBox("Ungültige Uhrzeit, erwartet wird z. B. 09:30.", "Fehler", wx.OK | wx.ICON_ERROR)
+                return False
+            time = uhrzeit[0]
+        anhang = self.anhang_text.GetValue().strip()
+
+        if time is None and not anhang:
+            wx.MessageBox("Bitte eine Uhrzeit oder einen Text zum Anhängen angeben.", "Information",
+                          wx.OK | wx.ICON_INFORMATION)
+            return False
+
+        try:
+            anzahl = eintraege.aendern_mehrere(self.db_conn, self.entry_ids, time=time, anhang=anhang)
+            wx.MessageBox(f"{anzahl} von {len(self.entry_ids)} Einträgen aktualisiert.", "Erfolg",
+                          wx.OK | wx.ICON_INFORMATION)
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Aktualisieren der Einträge: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+        return True
+
+    def on_ok_button(self, event):
+        """Event-Handler für den OK-Button"""
+
+        if self.update_entries():
+            self.EndModal(wx.ID_OK)
@@ -3,9 +3,15 @@
 Dieses Modul definiert die `MeinApp`-Klasse, die die gesamte Anwendung steuert.
 
 Die `MeinApp`-Klasse ist eine Unterklasse von `wx.App` und wird verwendet, um die Anwendung zu initialisieren und das Hauptfenster anzuzeigen.
+Dabei misst sie die Zeit bis zum ersten Zeichnen des Hauptfensters.
 """
 
+import sys
+from time import perf_counter
+
 import wx
+
+import messung
 from hauptfenster import HauptFenster
 
 class MeinApp(wx.App):
@@ -18,6 +24,22 @@ class MeinApp(wx.App):
         wx.App: Ein Anwendungsobjekt von wxPython.
     """
 
+    def __init__(self, beginn=None, startzeit_datei=None):
+        """
+        Initialisiert die Anwendung.
+
+        Args:
+            beginn (float): `perf_counter()` beim Programmstart; None misst ab dem Erstellen der App.
+            startzeit_datei (str): Datei, in die nach dem ersten Zeichnen die Messwerte
+                geschrieben werden, bevor sich die Anwendung beendet; None für den normalen Betrieb.
+        """
+
+        # Vor super().__init__ setzen, da wx.App dort bereits OnInit aufruft
+        self.beginn = beginn if beginn is not None else perf_counter()
+        self.startzeit_datei = startzeit_datei
+        self.gezeichnet = False
+        super().__init__()
+
     def OnInit(self):
         """
         Initialisiert die Anwendung und zeigt das Hauptfenster an.
@@ -26,6 +48,29 @@ class MeinApp(wx.App):
             bool: True, wenn die Initialisierung erfolgreich war, sonst False.
         """
 
-        self.hauptfenster = HauptFenster(None)
+        with messung.stoppuhr("Start: Hauptfenster erstellen"):
+            self.hauptfenster = HauptFenster(None)
         self.hauptfenster.Show()
+        messung.erfasse("Start: bis Show", perf_counter() - self.beginn)
+
+        # Wird vor dem Zeichen-Handler des Kalenderrasters aufgerufen, der danach über Skip folgt
+        self.hauptfenster.kalender.Bind(wx.EVT_PAINT, self.on_erstes_zeichnen)
         return True
+
+    def on_erstes_zeichnen(self, event):
+        """Erfasst nach dem ersten Zeichnen die Zeit bis zum sichtbaren Fenster."""
+
+        event.Skip()
+        if not self.gezeichnet:
+            self.gezeichnet = True
+            # Erst wenn die ausstehenden Ereignisse samt Zeichnen abgearbeitet sind
+            wx.CallAfter(self.start_abgeschlossen)
+
+    def start_abgeschlossen(self):
+        """Schließt die Startmessung ab und beendet im Modus `--startzeit` die Anwendung."""
+
+        messung.erfasse("Start: bis zum ersten Zeichnen", perf_counter() - self.beginn)
+        messung.zaehle("Start: geladene Module", len(sys.modules))
+        if self.startzeit_datei is not None:
+            messung.speichere_json(self.startzeit_datei)
+            self.hauptfenster.Close()
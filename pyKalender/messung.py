@@ -0,0 +1,229 @@
+# messung.py
+"""
+Dieses Modul sammelt Laufzeitmessungen der Anwendung; es hängt nicht von wx ab.
+
+- `stoppuhr(name)` misst einen Block, `erfasse(name, sekunden)` übernimmt eine bereits
+  gemessene Dauer. Je Name werden Anzahl, Summe und Maximum gehalten.
+- `zaehle(name, anzahl)` führt Zähler, z. B. für geladene Zeilen.
+- `verfolge(db_conn)` installiert für eine Verbindung die Trace- und Progress-Rückrufe von
+  `sqlite3`. Jede Anweisung wird gezählt; ihre Dauer reicht vom Start bis zum letzten
+  Progress-Rückruf (alle `PROGRESS_SCHRITTE` VM-Befehle). Anweisungen unterhalb dieser
+  Schrittzahl erscheinen daher mit 0 ms; bei stapelweise gelesenen Ergebnissen zählt die
+  Verarbeitung zwischen den Stapeln mit. Die VM-Schritte sind davon unabhängig ein Maß für
+  den Aufwand. Die Rückrufe kosten Zeit und sind deshalb nur aktiv, solange
+  `sql_verfolgung` gesetzt ist bzw. `verfolge` aufgerufen wurde.
+
+Alle Werte lassen sich mit `bericht` abfragen und mit `speichere_json` als Datei ablegen.
+Die Funktionen sind threadsicher, da auch der `AbfrageWorker` misst.
+"""
+
+import contextlib
+import datetime
+import re
+import threading
+from time import perf_counter
+
+# Anzahl der SQLite-VM-Befehle zwischen zwei Progress-Rückrufen
+PROGRESS_SCHRITTE = 1000
+
+# Höchstzahl unterschiedlicher SQL-Anweisungen im Bericht
+MAX_ANWEISUNGEN = 500
+
+# Literale in der (mit Parametern expandierten) SQL werden für die Gruppierung ersetzt
+_LITERALE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LEERRAUM = re.compile(r"\s+")
+
+_sperre = threading.Lock()
+_zeiten = {}
+_zaehler = {}
+_anweisungen = {}
+
+# Aktive Verfolgungen je Verbindung
+_verfolgungen = {}
+
+# Wird von der Oberfläche umgeschaltet; der AbfrageWorker übernimmt den Wert vor jedem Auftrag
+sql_verfolgung = False
+
+
+def erfasse(name, sekunden):
+    """
+    Übernimmt eine gemessene Dauer.
+
+    Args:
+        name (str): Der Name der Messung, z. B. "Liste: Seite laden".
+        sekunden (float): Die Dauer in Sekunden.
+    """
+
+    with _sperre:
+        werte = _zeiten.get(name)
+        if werte is None:
+            _zeiten[name] = [1, sekunden, sekunden]
+        else:
+            werte[0] += 1
+            werte[1] += sekunden
+            if sekunden > werte[2]:
+                werte[2] = sekunden
+
+
+@contextlib.contextmanager
+def stoppuhr(name):
+    """
+    Misst die Dauer des Blocks unter dem angegebenen Namen.
+
+    Args:
+        name (str): Der Name der Messung.
+    """
+
+    beginn = perf_counter()
+    try:
+        yield
+    finally:
+        erfasse(name, perf_counter() - beginn)
+
+
+def zaehle(name, anzahl=1):
+    """
+    Erhöht einen Zähler.
+
+    Args:
+        name (str): Der Name des Zählers, z. B. "Zeilen: Liste".
+        anzahl (int): Der Betrag, um den erhöht wird.
+    """
+
+    with _sperre:
+        _zaehler[name] = _zaehler.get(name, 0) + anzahl
+
+
+def _normalisiere(sql):
+    """Ersetzt Literale und Leerraum, sodass gleiche Anweisungen zusammengefasst werden."""
+
+    return _LEERRAUM.sub(" ", _LITERALE.sub("?", sql)).strip()
+
+
+def _erfasse_anweisung(sql, sekunden, schritte):
+    """Übernimmt Dauer und VM-Schritte einer abgeschlossenen SQL-Anweisung."""
+
+    sql = _normalisiere(sql)
+    with _sperre:
+        werte = _anweisungen.get(sql)
+        if werte is None:
+            if len(_anweisungen) >= MAX_ANWEISUNGEN:
+                sql = "(weitere Anweisungen)"
+                werte = _anweisungen.get(sql)
+            if werte is None:
+                werte = _anweisungen[sql] = [0, 0.0, 0.0, 0]
+        werte[0] += 1
+        werte[1] += sekunden
+        werte[3] += schritte
+        if sekunden > werte[2]:
+            werte[2] = sekunden
+
+
+class _Verfolgung:
+    """Zustand der Trace- und Progress-Rückrufe einer Verbindung."""
+
+    __slots__ = ("sql", "beginn", "letzter", "schritte")
+
+    def __init__(self):
+        self.sql = None
+        self.beginn = 0.0
+        self.letzter = 0.0
+        self.schritte = 0
+
+    def abschliessen(self):
+        """Erfasst die zuletzt gestartete Anweisung."""
+
+        if self.sql is not None:
+            _erfasse_anweisung(self.sql, self.letzter - self.beginn, self.schritte * PROGRESS_SCHRITTE)
+            self.sql = None
+
+    def trace(self, sql):
+        """Trace-Rückruf: eine neue Anweisung beginnt."""
+
+        self.abschliessen()
+        self.sql = sql
+        self.beginn = self.letzter = perf_counter()
+        self.schritte = 0
+
+    def progress(self):
+        """Progress-Rückruf: SQLite rechnet noch an der aktuellen Anweisung."""
+
+        self.letzter = perf_counter()
+        self.schritte += 1
+        # 0 bedeutet: Anweisung fortsetzen
+        return 0
+
+
+def verfolge(db_conn, aktiv=True):
+    """
+    Schaltet die SQL-Messung für eine Verbindung ein oder aus.
+
+    Muss im Thread der Verbindung aufgerufen werden.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        aktiv (bool): True zum Einschalten, False zum Ausschalten.
+    """
+
+    verfolgung = _verfolgungen.pop(db_conn, None)
+    if verfolgung is not None:
+        db_conn.set_trace_callback(None)
+        db_conn.set_progress_handler(None, PROGRESS_SCHRITTE)
+        verfolgung.abschliessen()
+    if aktiv:
+        verfolgung = _verfolgungen[db_conn] = _Verfolgung()
+        db_conn.set_trace_callback(verfolgung.trace)
+        db_conn.set_progress_handler(verfolgung.progress, PROGRESS_SCHRITTE)
+
+
+def zuruecksetzen():
+    """Verwirft alle bisherigen Messwerte."""
+
+    with _sperre:
+        _zeiten.clear()
+        _zaehler.clear()
+        _anweisungen.clear()
+
+
+def bericht():
+    """
+    Liefert alle Messwerte, die längsten zuerst.
+
+    Returns:
+        dict: Mit den Schlüsseln "zeiten" (Liste von dicts mit name, anzahl, summe_ms,
+            mittel_ms, max_ms), "zaehler" (dict Name → Wert) und "sql" (Liste von dicts mit
+            sql, anzahl, summe_ms, max_ms, schritte).
+    """
+
+    with _sperre:
+        zeiten = [
+            {"name": name, "anzahl": anzahl, "summe_ms": summe * 1000, "mittel_ms": summe * 1000 / anzahl,
+             "max_ms": maximum * 1000}
+            for name, (anzahl, summe, maximum) in _zeiten.items()
+        ]
+        zaehler = dict(sorted(_zaehler.items()))
+        anweisungen = [
+            {"sql": sql, "anzahl": anzahl, "summe_ms": summe * 1000, "max_ms": maximum * 1000, "schritte": schritte}
+            for sql, (anzahl, summe, maximum, schritte) in _anweisungen.items()
+        ]
+    zeiten.sort(key=lambda wert: wert["summe_ms"], reverse=True)
+    anweisungen.sort(key=lambda wert: (wert["summe_ms"], wert["schritte"]), reverse=True)
+    return {"zeiten": zeiten, "zaehler": zaehler, "sql": anweisungen}
+
+
+def speichere_json(datei):
+    """
+    Schreibt den Bericht mit Zeitstempel als JSON-Datei.
+
+    Args:
+        datei (str): Der Pfad der Zieldatei.
+
+    Raises:
+        OSError: Wenn die Datei nicht geschrieben werden kann.
+    """
+
+    import json
+
+    daten = {"zeitpunkt": datetime.datetime.now().isoformat(timespec="seconds"), **bericht()}
+    with open(datei, "w", encoding="utf-8") as f:
+        json.dump(daten, f, ensure_ascii=False, indent=2)
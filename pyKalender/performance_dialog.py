@@ -0,0 +1,163 @@
+# performance_dialog.py
+"""
+Modul zur Definition des Dialogfensters 'PerformanceDialog' mit den Laufzeitmessungen aus `messung`.
+
+Der Dialog zeigt die gemessenen Zeiten, die Zähler und, sofern die SQL-Messung eingeschaltet
+ist, die einzelnen SQL-Anweisungen an und aktualisiert sich jede Sekunde. Die Werte lassen
+sich als JSON-Datei speichern.
+"""
+
+import wx
+
+import messung
+
+
+class PerformanceDialog(wx.Dialog):
+    """Ein Dialogfenster mit den Laufzeitmessungen der Anwendung."""
+
+    # Aktualisierungsintervall in Millisekunden
+    INTERVALL = 1000
+
+    def __init__(self, parent, db_conn=None):
+        """
+        Initialisiert den Dialog.
+
+        :param parent: Das Elternfenster.
+        :param db_conn: Die Datenbankverbindung des Hauptfensters oder None; für sie wird die
+            SQL-Messung direkt umgeschaltet, der `AbfrageWorker` übernimmt sie selbst.
+        """
+
+        super().__init__(parent, title="Performance", size=(900, 650),
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+
+        self.db_conn = db_conn
+
+        self.initialize_ui()
+        self.aktualisiere()
+
+        self.timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, lambda event: self.aktualisiere(), self.timer)
+        self.timer.Start(self.INTERVALL)
+
+        self.Bind(wx.EVT_CHAR_HOOK, self.on_key_pressed)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+    def initialize_ui(self):
+        """Initialisiert die Benutzeroberfläche des Dialogs."""
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        oben = wx.BoxSizer(wx.HORIZONTAL)
+
+        self.zeiten_liste = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.zeiten_liste.InsertColumn(0, "Messung", width=220)
+        for spalte, titel in enumerate(("Anzahl", "Summe ms", "Mittel ms", "Max ms"), start=1):
+            self.zeiten_liste.InsertColumn(spalte, titel, width=80, format=wx.LIST_FORMAT_RIGHT)
+        oben.Add(self.zeiten_liste, 3, wx.ALL | wx.EXPAND, 5)
+
+        self.zaehler_liste = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.zaehler_liste.InsertColumn(0, "Zähler", width=160)
+        self.zaehler_liste.InsertColumn(1, "Wert", width=90, format=wx.LIST_FORMAT_RIGHT)
+        oben.Add(self.zaehler_liste, 1, wx.ALL | wx.EXPAND, 5)
+
+        sizer.Add(oben, 1, wx.ALL | wx.EXPAND, 5)
+
+        self.sql_checkbox = wx.CheckBox(self, label="SQL-Anweisungen messen (verlangsamt Abfragen leicht)")
+        self.sql_checkbox.SetValue(messung.sql_verfolgung)
+        self.sql_checkbox.Bind(wx.EVT_CHECKBOX, self.on_sql_umschalten)
+        sizer.Add(self.sql_checkbox, 0, wx.LEFT | wx.RIGHT, 10)
+
+        self.sql_liste = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.sql_liste.InsertColumn(0, "Anweisung", width=480)
+        for spalte, titel in enumerate(("Anzahl", "Summe ms", "Max ms", "VM-Schritte"), start=1):
+            self.sql_liste.InsertColumn(spalte, titel, width=85, format=wx.LIST_FORMAT_RIGHT)
+        sizer.Add(self.sql_liste, 1, wx.ALL | wx.EXPAND, 10)
+
+        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        zuruecksetzen_button = wx.Button(self, label="Zurücksetzen")
+        zuruecksetzen_button.Bind(wx.EVT_BUTTON, self.on_zuruecksetzen)
+        button_sizer.Add(zuruecksetzen_button, 0, wx.RIGHT, 10)
+        speichern_button = wx.Button(self, label="Als JSON speichern...")
+        speichern_button.Bind(wx.EVT_BUTTON, self.on_speichern)
+        button_sizer.Add(speichern_button, 0, wx.RIGHT, 10)
+        schliessen_button = wx.Button(self, wx.ID_CLOSE, label="Schließen")
+        schliessen_button.Bind(wx.EVT_BUTTON, lambda event: self.Close())
+        button_sizer.Add(schliessen_button, 0)
+        sizer.Add(button_sizer, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+
+        self.SetSizer(sizer)
+
+    @staticmethod
+    def _fuelle(liste, zeilen):
+        """Ersetzt den Inhalt einer Liste und behält die Bildlaufposition bei."""
+
+        oben = liste.GetTopItem()
+        liste.Freeze()
+        try:
+            liste.DeleteAllItems()
+            for werte in zeilen:
+                index = liste.InsertItem(liste.GetItemCount(), werte[0])
+                for spalte, wert in enumerate(werte[1:], start=1):
+                    liste.SetItem(index, spalte, wert)
+            if 0 < oben < liste.GetItemCount():
+                liste.EnsureVisible(liste.GetItemCount() - 1)
+                liste.EnsureVisible(oben)
+        finally:
+            liste.Thaw()
+
+    def aktualisiere(self):
+        """Liest die aktuellen Messwerte und zeigt sie an."""
+
+        daten = messung.bericht()
+        self._fuelle(self.zeiten_liste, [
+            (wert["name"], str(wert["anzahl"]), f"{wert['summe_ms']:.1f}", f"{wert['mittel_ms']:.2f}",
+             f"{wert['max_ms']:.1f}")
+            for wert in daten["zeiten"]
+        ])
+        self._fuelle(self.zaehler_liste, [(name, str(wert)) for name, wert in daten["zaehler"].items()])
+        self._fuelle(self.sql_liste, [
+            (wert["sql"], str(wert["anzahl"]), f"{wert['summe_ms']:.1f}", f"{wert['max_ms']:.1f}",
+             str(wert["schritte"]))
+            for wert in daten["sql"]
+        ])
+
+    def on_sql_umschalten(self, event):
+        """Schaltet die Messung der SQL-Anweisungen ein oder aus."""
+
+        messung.sql_verfolgung = self.sql_checkbox.GetValue()
+        if self.db_conn is not None:
+            messung.verfolge(self.db_conn, messung.sql_verfolgung)
+
+    def on_zuruecksetzen(self, event):
+        """Verwirft alle bisherigen Messwerte."""
+
+        messung.zuruecksetzen()
+        self.aktualisiere()
+
+    def on_speichern(self, event):
+        """Speichert die Messwerte als JSON-Datei."""
+
+        dialog = wx.FileDialog(self, message="Messwerte speichern", defaultFile="performance.json",
+                               wildcard="JSON-Dateien (*.json)|*.json",
+                               style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT)
+        if dialog.ShowModal() == wx.ID_OK:
+            try:
+                messung.speichere_json(dialog.GetPath())
+            except OSError as e:
+                wx.MessageBox(f"Fehler beim Speichern der Messwerte: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+        dialog.Destroy()
+
+    def on_key_pressed(self, event):
+        """Behandelt das Tastaturereignis für das Dialogfenster."""
+
+        if event.GetKeyCode() == wx.WXK_ESCAPE:
+            # ESC-Taste zum Schließen des Dialogfensters
+            self.Close()
+        else:
+            event.Skip()
+
+    def on_destroy(self, event):
+        """Hält den Aktualisierungs-Timer an."""
+
+        if event.GetEventObject() is self:
+            self.timer.Stop()
+        event.Skip()
@@ -26,4 +26,8 @@ rem https://stackoverflow.com/questions/14624245/what-does-a-version-file-look-l
 call .py\Scripts\activate.bat
 ::pyinstaller --onedir --noconsole --windowed --strip --upx-dir=%upx% main.py --version-file version.txt
 pyinstaller --onefile --noconsole --windowed --strip --upx-dir=%upx% main.py --version-file version.txt
+rem Auf kurze Startzeit abgestimmter Build als Verzeichnis dist\main (siehe main.spec),
+rem danach pruefen mit: python -m benchmark.startzeit --programm dist\main\main.exe
+::set KALENDER_BUILD=schnellstart
+::pyinstaller main.spec
 pause
\ No newline at end of file
@@ -0,0 +1,179 @@
+# statistik.py
+"""
+Dieses Modul sammelt Kennzahlen zur geöffneten Datenbank für die Ansicht 'Datenbank-Informationen'.
+
+Die Anzahl der Einträge und ihre Verteilung auf Tage und Monate werden aus der Tabelle
+`DayCounts` gelesen, die per Trigger fortgeschrieben wird (siehe `datenbank.migriere_schema`).
+Seitenzahlen stammen aus dem Dateikopf. Nur die Größen der Tabellen und Indizes erfordern
+einen Durchlauf über alle Seiten; diese Abfrage wird deshalb im `AbfrageWorker` ausgeführt.
+"""
+
+import os
+
+import datenbank
+
+# Abfrage der belegten Bytes je Tabelle und Index über die virtuelle Tabelle `dbstat`
+SPEICHER_ABFRAGE = (
+    "SELECT name, pgsize, ncell FROM dbstat WHERE aggregate = TRUE ORDER BY pgsize DESC, name"
+)
+
+
+def sammle_statistik(db_conn, db_datei):
+    """
+    Sammelt die Übersicht der Datenbank, ohne die Tabelle `Entries` zu durchlaufen.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        db_datei (str): Der Pfad zur SQLite-Datenbankdatei.
+
+    Returns:
+        list: Tupel (Bezeichnung, Wert) in Anzeigereihenfolge.
+    """
+
+    cursor = db_conn.cursor()
+    sqlite_version = cursor.execute("SELECT sqlite_version()").fetchone()[0]
+    page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+    page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+    freelist_count = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+    journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    # Einträge mit ungültigem Datum zählen mit, ihr Zähler unter '' aber nicht als Tag
+    anzahl, tage, erster_tag, letzter_tag = cursor.execute(
+        "SELECT COALESCE(SUM(EntryCount), 0), COUNT(NULLIF(DateKey, '')), "
+        "MIN(NULLIF(DateKey, '')), MAX(NULLIF(DateKey, '')) FROM DayCounts"
+    ).fetchone()
+    tabellen = [zeile[0] for zeile in cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+    indizes = cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'"
+    ).fetchone()[0]
+    cursor.close()
+
+    db_size_mb = os.path.getsize(db_datei) / (1024 * 1024)
+
+    return [
+        ("SQLite Version", sqlite_version),
+        ("Datenbank-Dateigröße", f"{db_size_mb:.2f} MB"),
+        ("Schema-Version", str(datenbank.schema_version(db_conn))),
+        ("Journal-Modus", journal_mode),
+        ("Seitengröße", f"{page_size} Bytes"),
+        ("Seiten", str(page_count)),
+        ("Freie Seiten", f"{freelist_count} ({freelist_count * page_size / 1024:.0f} KB)"),
+        ("Anzahl der Einträge", str(anzahl)),
+        ("Tage mit Einträgen", str(tage)),
+        ("Zeitraum", f"{formatiere_datum(erster_tag)} – {formatiere_datum(letzter_tag)}" if tage else "–"),
+        ("Tabellen", ", ".join(tabellen)),
+        ("Indizes", str(indizes)),
+    ]
+
+
+def monatsverteilung(db_conn):
+    """
+    Liefert die Anzahl der Einträge je Monat.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        list: Tupel (Monat als 'YYYY-MM', Anzahl), aufsteigend sortiert. Einträge mit
+        ungültigem Datum werden unter '' zusammengefasst.
+    """
+
+    cursor = db_conn.cursor()
+    cursor.execute(
+        "SELECT substr(DateKey, 1, 7) AS Monat, SUM(EntryCount) FROM DayCounts GROUP BY Monat ORDER BY Monat"
+    )
+    verteilung = cursor.fetchall()
+    cursor.close()
+    return verteilung
+
+
+def tagesverteilung(db_conn, monat):
+    """
+    Liefert die Anzahl der Einträge je Tag eines Monats.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        monat (str): Der Monat als 'YYYY-MM' oder '' für Einträge mit ungültigem Datum.
+
+    Returns:
+        list: Tupel (DateKey, Anzahl), aufsteigend sortiert.
+    """
+
+    cursor = db_conn.cursor()
+    if monat:
+        # Bereichsabfrage über den Primärschlüssel statt LIKE
+        cursor.execute("SELECT DateKey, EntryCount FROM DayCounts WHERE DateKey >= ? AND DateKey < ? ORDER BY DateKey",
+                       (f"{monat}-00", f"{monat}-99"))
+    else:
+        cursor.execute("SELECT DateKey, EntryCount FROM DayCounts WHERE DateKey = ''")
+    verteilung = cursor.fetchall()
+    cursor.close()
+    return verteilung
+
+
+def tageszaehler(db_conn, jahr, monat):
+    """
+    Liefert die Anzahl der Einträge je Tag eines Monats mit einer einzigen Bereichsabfrage.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        jahr (int): Das Jahr.
+        monat (int): Der Monat (1-12).
+
+    Returns:
+        dict: Tag des Monats -> Anzahl der Einträge; Tage ohne Einträge fehlen.
+    """
+
+    return {int(datum_schluessel[8:]): anzahl
+            for datum_schluessel, anzahl in tagesverteilung(db_conn, f"{jahr:04d}-{monat:02d}")}
+
+
+def speicher_verfuegbar(db_conn):
+    """
+    Prüft, ob SQLite mit der virtuellen Tabelle `dbstat` übersetzt wurde.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        bool: True, wenn `SPEICHER_ABFRAGE` ausgeführt werden kann.
+    """
+
+    cursor = db_conn.cursor()
+    cursor.execute("PRAGMA compile_options")
+    optionen = {zeile[0] for zeile in cursor.fetchall()}
+    cursor.close()
+    return "ENABLE_DBSTAT_VTAB" in optionen
+
+
+def formatiere_datum(datum_schluessel):
+    """
+    Wandelt einen Sortierschlüssel 'YYYY-MM-DD' oder 'YYYY-MM' in die Anzeigeform um.
+
+    Args:
+        datum_schluessel (str): Der Schlüssel aus `DateKey`.
+
+    Returns:
+        str: 'dd.mm.yyyy' bzw. 'mm.yyyy' oder 'ungültiges Datum' für ''.
+    """
+
+    if not datum_schluessel:
+        return "ungültiges Datum"
+    return ".".join(reversed(datum_schluessel.split("-")))
+
+
+def formatiere_groesse(bytes_anzahl):
+    """
+    Formatiert eine Größe in Bytes für die Anzeige.
+
+    Args:
+        bytes_anzahl (int): Die Größe in Bytes.
+
+    Returns:
+        str: Die Größe in KB oder MB.
+    """
+
+    if bytes_anzahl >= 1024 * 1024:
+        return f"{bytes_anzahl / (1024 * 1024):.2f} MB"
+    return f"{bytes_anzahl / 1024:.1f} KB"
@@ -0,0 +1,208 @@
+# statistik_dialog.py
+"""
+Modul zur Definition des Dialogfensters 'StatistikDialog' für die Datenbank-Informationen.
+
+Übersicht und Verteilung der Einträge werden aus den Tageszählern gelesen und nach jeder
+Änderung neu angezeigt. Die Größen der Tabellen und Indizes werden im `AbfrageWorker`
+ermittelt und nachgereicht, sobald sie vorliegen.
+"""
+
+import wx
+import sqlite3
+
+import aenderungen
+import statistik
+
+
+class StatistikDialog(wx.Dialog):
+    """Ein Dialogfenster mit Kennzahlen, Verteilung der Einträge und Speicherbelegung der Datenbank."""
+
+    def __init__(self, parent, db_conn, db_datei, worker=None):
+        """
+        Initialisiert den Dialog.
+
+        :param parent: Das Elternfenster.
+        :param db_conn: Die SQLite-Datenbankverbindung.
+        :param db_datei: Der Pfad zur SQLite-Datenbankdatei.
+        :param worker: Optionaler `AbfrageWorker` für die Speicherbelegung im Hintergrund.
+        """
+
+        super().__init__(parent, title="Datenbank-Informationen", size=(800, 600),
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+
+        self.db_conn = db_conn
+        self.db_datei = db_datei
+        self.worker = worker
+        self.auftrag = None
+        self.monate = []
+        self.speicher = []
+
+        self.initialize_ui()
+        self.aktualisiere()
+        self.lade_speicher()
+
+        aenderungen.abonniere(self.on_eintraege_geaendert)
+        self.Bind(wx.EVT_CHAR_HOOK, self.on_key_pressed)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+    def initialize_ui(self):
+        """Initialisiert die Benutzeroberfläche des Dialogs."""
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        oben = wx.BoxSizer(wx.HORIZONTAL)
+        unten = wx.BoxSizer(wx.HORIZONTAL)
+
+        self.uebersicht = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.uebersicht.InsertColumn(0, "Eigenschaft", width=160)
+        self.uebersicht.InsertColumn(1, "Wert", width=220)
+        oben.Add(self.uebersicht, 1, wx.ALL | wx.EXPAND, 5)
+
+        self.speicher_liste = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.speicher_liste.InsertColumn(0, "Tabelle / Index", width=200)
+        self.speicher_liste.InsertColumn(1, "Größe", width=90, format=wx.LIST_FORMAT_RIGHT)
+        self.speicher_liste.InsertColumn(2, "Zellen", width=80, format=wx.LIST_FORMAT_RIGHT)
+        oben.Add(self.speicher_liste, 1, wx.ALL | wx.EXPAND, 5)
+
+        self.monats_liste = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.monats_liste.InsertColumn(0, "Monat", width=140)
+        self.monats_liste.InsertColumn(1, "Einträge", width=90, format=wx.LIST_FORMAT_RIGHT)
+        self.monats_liste.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_monat_auswahl)
+        unten.Add(self.monats_liste, 1, wx.ALL | wx.EXPAND, 5)
+
+        self.tages_liste = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.tages_liste.InsertColumn(0, "Tag", width=140)
+        self.tages_liste.InsertColumn(1, "Einträge", width=90, format=wx.LIST_FORMAT_RIGHT)
+        unten.Add(self.tages_liste, 1, wx.ALL | wx.EXPAND, 5)
+
+        sizer.Add(oben, 1, wx.ALL | wx.EXPAND, 5)
+        sizer.Add(unten, 1, wx.LEFT | wx.RIGHT | wx.EXPAND, 5)
+
+        self.status_label = wx.StaticText(self, label="")
+        sizer.Add(self.status_label, 0, wx.ALL | wx.EXPAND, 10)
+
+        self.SetSizer(sizer)
+
+    def aktualisiere(self):
+        """Liest Übersicht und Monatsverteilung neu ein und behält die Auswahl des Monats bei."""
+
+        ausgewaehlt = self.ausgewaehlter_monat()
+        try:
+            kennzahlen = statistik.sammle_statistik(self.db_conn, self.db_datei)
+            self.monate = statistik.monatsverteilung(self.db_conn)
+        except (sqlite3.Error, OSError) as e:
+            wx.MessageBox(f"Fehler beim Abrufen der Datenbank-Informationen: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        self.uebersicht.DeleteAllItems()
+        for bezeichnung, wert in kennzahlen:
+            index = self.uebersicht.InsertItem(self.uebersicht.GetItemCount(), bezeichnung)
+            self.uebersicht.SetItem(index, 1, wert)
+
+        self.monats_liste.DeleteAllItems()
+        for monat, anzahl in self.monate:
+            index = self.monats_liste.InsertItem(self.monats_liste.GetItemCount(), statistik.formatiere_datum(monat))
+            self.monats_liste.SetItem(index, 1, str(anzahl))
+
+        monate = [monat for monat, _ in self.monate]
+        if ausgewaehlt in monate:
+            self.monats_liste.Select(monate.index(ausgewaehlt))
+            self.zeige_tage(ausgewaehlt)
+        else:
+            self.tages_liste.DeleteAllItems()
+
+    def ausgewaehlter_monat(self):
+        """Gibt den in der Monatsliste ausgewählten Monat als 'YYYY-MM' zurück oder None."""
+
+        index = self.monats_liste.GetFirstSelected()
+        if 0 <= index < len(self.monate):
+            return self.monate[index][0]
+        return None
+
+    def on_monat_auswahl(self, event):
+        """Zeigt die Tagesverteilung des ausgewählten Monats an."""
+
+        self.zeige_tage(self.ausgewaehlter_monat())
+
+    def zeige_tage(self, monat):
+        """
+        Füllt die Tagesliste für einen Monat.
+
+        :param monat: Der Monat als 'YYYY-MM' oder '' für Einträge mit ungültigem Datum.
+        """
+
+        self.tages_liste.DeleteAllItems()
+        if monat is None:
+            return
+        try:
+            tage = statistik.tagesverteilung(self.db_conn, monat)
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Abrufen der Datenbank-Informationen: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+        for datum_schluessel, anzahl in tage:
+            index = self.tages_liste.InsertItem(self.tages_liste.GetItemCount(), statistik.formatiere_datum(datum_schluessel))
+            self.tages_liste.SetItem(index, 1, str(anzahl))
+
+    def lade_speicher(self):
+        """Ermittelt die Größe der Tabellen und Indizes im Hintergrund."""
+
+        if self.worker is None or not statistik.speicher_verfuegbar(self.db_conn):
+            self.status_label.SetLabel("Speicherbelegung nicht verfügbar.")
+            return
+
+        if self.auftrag is not None:
+            self.worker.abbrechen(self.auftrag)
+        self.speicher = []
+        self.status_label.SetLabel("Speicherbelegung wird ermittelt...")
+        self.auftrag = self.worker.ausfuehren(
+            statistik.SPEICHER_ABFRAGE,
+            bei_stapel=self.on_speicher_geladen,
+            bei_ende=self.on_speicher_beendet,
+            bei_fehler=self.on_speicher_fehler,
+        )
+
+    def on_speicher_geladen(self, zeilen):
+        """Übernimmt die im Hintergrund ermittelten Größen."""
+
+        self.speicher.extend(zeilen)
+
+    def on_speicher_beendet(self, anzahl):
+        """Zeigt die Speicherbelegung nach Abschluss der Abfrage an."""
+
+        self.auftrag = None
+        self.speicher_liste.DeleteAllItems()
+        for name, groesse, zellen in self.speicher:
+            index = self.speicher_liste.InsertItem(self.speicher_liste.GetItemCount(), name)
+            self.speicher_liste.SetItem(index, 1, statistik.formatiere_groesse(groesse))
+            self.speicher_liste.SetItem(index, 2, str(zellen))
+        self.status_label.SetLabel("")
+
+    def on_speicher_fehler(self, fehler):
+        """Zeigt einen Fehler beim Ermitteln der Speicherbelegung in der Statuszeile an."""
+
+        self.auftrag = None
+        self.status_label.SetLabel(f"Fehler beim Ermitteln der Speicherbelegung: {str(fehler)}")
+
+    def on_eintraege_geaendert(self, db_conn, aktion, entry_id, alter_schluessel):
+        """Aktualisiert die Zähler nach einer Änderung; die Speicherbelegung bleibt bis zum nächsten Öffnen."""
+
+        if db_conn is self.db_conn:
+            self.aktualisiere()
+
+    def on_key_pressed(self, event):
+        """Behandelt das Tastaturereignis für das Dialogfenster."""
+
+        if event.GetKeyCode() == wx.WXK_ESCAPE:
+            # ESC-Taste zum Schließen des Dialogfensters
+            self.Close()
+        else:
+            event.Skip()  # Weitergabe des Ereignisses an das Standardverhalten
+
+    def on_destroy(self, event):
+        """Meldet den Dialog von den Änderungsmeldungen ab und bricht eine laufende Abfrage ab."""
+
+        if event.GetEventObject() is self:
+            aenderungen.kuendige(self.on_eintraege_geaendert)
+            if self.auftrag is not None:
+                self.worker.abbrechen(self.auftrag)
+                self.auftrag = None
+        event.Skip()
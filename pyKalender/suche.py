@@ -0,0 +1,113 @@
+# suche.py
+"""
+Dieses Modul enthält die Volltextsuche über die zusätzlichen Informationen der Einträge.
+
+Die Suche verwendet den FTS5-Index `Entries_fts` (siehe `datenbank.migriere_schema`) und
+liefert die Treffer nach Relevanz (bm25) sortiert mit einem Textausschnitt, in dem die
+Suchbegriffe markiert sind. Ohne FTS5 wird auf eine LIKE-Suche zurückgegriffen.
+"""
+
+# Markierung der Suchbegriffe im Textausschnitt
+TREFFER_ANFANG = "»"
+TREFFER_ENDE = "«"
+
+# Anzahl der Wörter im Textausschnitt
+AUSSCHNITT_WOERTER = 12
+
+
+def fts_ausdruck(text):
+    """
+    Wandelt eine Benutzereingabe in einen sicheren FTS5-Suchausdruck um.
+
+    Jedes Wort wird in Anführungszeichen gesetzt und als Präfix gesucht, sodass
+    Sonderzeichen keine FTS5-Syntaxfehler auslösen. Alle Wörter müssen vorkommen.
+
+    Args:
+        text (str): Die Eingabe aus dem Suchfeld.
+
+    Returns:
+        str: Der FTS5-Ausdruck oder "" bei leerer Eingabe.
+    """
+
+    woerter = [wort.replace('"', '""') for wort in text.split()]
+    return " ".join(f'"{wort}"*' for wort in woerter)
+
+
+def hat_suchindex(db_conn):
+    """
+    Prüft, ob die Datei den FTS5-Suchindex enthält.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+
+    Returns:
+        bool: True, wenn `Entries_fts` existiert.
+    """
+
+    cursor = db_conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Entries_fts'")
+    vorhanden = cursor.fetchone() is not None
+    cursor.close()
+    return vorhanden
+
+
+def suche_abfrage(db_conn, text, limit=200):
+    """
+    Erstellt die Suchabfrage, z. B. für die Ausführung im `AbfrageWorker`.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        text (str): Die Eingabe aus dem Suchfeld.
+        limit (int): Die maximale Anzahl der Treffer.
+
+    Returns:
+        tuple: (SQL-Abfrage, Parameter) oder None bei leerer Eingabe. Die Abfrage liefert
+        Tupel (ID, Date, DayOfWeek, Time, Ausschnitt), die besten Treffer zuerst.
+    """
+
+    ausdruck = fts_ausdruck(text)
+    if not ausdruck:
+        return None
+
+    if hat_suchindex(db_conn):
+        return (
+            "SELECT e.ID, e.Date, e.DayOfWeek, e.Time, "
+            f"snippet(Entries_fts, 0, ?, ?, '…', {AUSSCHNITT_WOERTER}) "
+            "FROM Entries_fts JOIN Entries e ON e.ID = Entries_fts.rowid "
+            "WHERE Entries_fts MATCH ? ORDER BY rank LIMIT ?",
+            (TREFFER_ANFANG, TREFFER_ENDE, ausdruck, limit)
+        )
+
+    # Ohne Suchindex: vollständiger Durchlauf, Ausschnitt um das erste Wort
+    woerter = text.split()
+    bedingungen = " AND ".join("instr(lower(AdditionalInfo), lower(?)) > 0" for _ in woerter)
+    return (
+        "SELECT ID, Date, DayOfWeek, Time, "
+        "substr(AdditionalInfo, max(instr(lower(AdditionalInfo), lower(?)) - 40, 1), 100) "
+        f"FROM Entries WHERE {bedingungen} ORDER BY DateKey, TimeKey, ID LIMIT ?",
+        (woerter[0], *woerter, limit)
+    )
+
+
+def suche(db_conn, text, limit=200):
+    """
+    Sucht Einträge, deren zusätzliche Informationen alle eingegebenen Wörter enthalten.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        text (str): Die Eingabe aus dem Suchfeld.
+        limit (int): Die maximale Anzahl der Treffer.
+
+    Returns:
+        list: Tupel (ID, Date, DayOfWeek, Time, Ausschnitt), die besten Treffer zuerst.
+    """
+
+    abfrage = suche_abfrage(db_conn, text, limit)
+    if abfrage is None:
+        return []
+
+    cursor = db_conn.cursor()
+    cursor.execute(*abfrage)
+    treffer = cursor.fetchall()
+    cursor.close()
+    return treffer
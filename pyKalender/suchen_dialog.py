@@ -0,0 +1,183 @@
+# suchen_dialog.py
+"""
+Modul zur Definition des Dialogfensters 'SuchenDialog' für die Volltextsuche in den Einträgen.
+
+Die Suche startet während der Eingabe mit kurzer Verzögerung und läuft im `AbfrageWorker`,
+sodass die Oberfläche auch bei häufigen Suchbegriffen bedienbar bleibt. Die Treffer werden
+nach Relevanz sortiert mit einem Textausschnitt angezeigt, in dem die Suchbegriffe markiert sind.
+"""
+
+import wx
+import sqlite3
+
+import eintraege
+import suche
+from eintraganzeigen import EntryContentDialog
+
+
+class SuchenDialog(wx.Dialog):
+    """Ein Dialogfenster zum Durchsuchen der zusätzlichen Informationen aller Einträge."""
+
+    # Verzögerung in Millisekunden zwischen der letzten Eingabe und dem Start der Suche
+    VERZOEGERUNG = 250
+
+    def __init__(self, parent, db_conn, worker=None):
+        """
+        Initialisiert den Dialog.
+
+        :param parent: Das Elternfenster.
+        :param db_conn: Die SQLite-Datenbankverbindung.
+        :param worker: Optionaler `AbfrageWorker` für die Suche im Hintergrund.
+        """
+
+        super().__init__(parent, title="Suchen", size=(700, 500),
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+
+        self.db_conn = db_conn
+        self.worker = worker
+        self.auftrag = None
+        self.verzoegerung = None
+        self.treffer_ids = []
+
+        self.initialize_ui()
+
+        self.Bind(wx.EVT_CHAR_HOOK, self.on_key_pressed)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+    def initialize_ui(self):
+        """Initialisiert die Benutzeroberfläche des Dialogs."""
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+
+        label = wx.StaticText(self, label="Suchbegriffe:")
+        sizer.Add(label, 0, wx.ALL | wx.EXPAND, 10)
+
+        self.such_text = wx.TextCtrl(self)
+        self.such_text.Bind(wx.EVT_TEXT, self.on_text_changed)
+        sizer.Add(self.such_text, 0, wx.LEFT | wx.RIGHT | wx.EXPAND, 10)
+
+        self.listview = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.listview.InsertColumn(0, "Datum", width=100)
+        self.listview.InsertColumn(1, "Wochentag", width=100)
+        self.listview.InsertColumn(2, "Uhrzeit", width=70)
+        self.listview.InsertColumn(3, "Treffer", width=400)
+        self.listview.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_item_activated)
+        sizer.Add(self.listview, 1, wx.ALL | wx.EXPAND, 10)
+
+        self.status_label = wx.StaticText(self, label="")
+        sizer.Add(self.status_label, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM | wx.EXPAND, 10)
+
+        self.SetSizer(sizer)
+
+    def on_text_changed(self, event):
+        """Startet die Suche kurz nach der letzten Eingabe."""
+
+        if self.verzoegerung is not None:
+            self.verzoegerung.Stop()
+        self.verzoegerung = wx.CallLater(self.VERZOEGERUNG, self.starte_suche)
+
+    def starte_suche(self):
+        """Führt die Suche für den aktuellen Suchtext aus."""
+
+        self.verzoegerung = None
+        if self.auftrag is not None:
+            self.worker.abbrechen(self.auftrag)
+            self.auftrag = None
+
+        try:
+            abfrage = suche.suche_abfrage(self.db_conn, self.such_text.GetValue())
+            if abfrage is None:
+                self.zeige_treffer([])
+                return
+
+            if self.worker is not None:
+                self.status_label.SetLabel("Suche läuft...")
+                self.auftrag = self.worker.ausfuehren(
+                    *abfrage,
+                    bei_stapel=self.on_treffer_geladen,
+                    bei_ende=self.on_suche_beendet,
+                    bei_fehler=self.on_suche_fehler,
+                )
+            else:
+                self.zeige_treffer(suche.suche(self.db_conn, self.such_text.GetValue()))
+        except sqlite3.Error as e:
+            self.on_suche_fehler(e)
+
+    def on_treffer_geladen(self, treffer):
+        """Übernimmt die im Hintergrund gefundenen Treffer."""
+
+        self.zeige_treffer(treffer)
+
+    def on_suche_beendet(self, anzahl):
+        """Beendet die Suche im Hintergrund; leere Ergebnisse werden hier angezeigt."""
+
+        self.auftrag = None
+        if anzahl == 0:
+            self.zeige_treffer([])
+
+    def on_suche_fehler(self, fehler):
+        """Zeigt einen Fehler bei der Suche in der Statuszeile an."""
+
+        self.auftrag = None
+        self.status_label.SetLabel(f"Fehler bei der Suche: {str(fehler)}")
+
+    def zeige_treffer(self, treffer):
+        """
+        Füllt die Trefferliste.
+
+        :param treffer: Tupel (ID, Date, DayOfWeek, Time, Ausschnitt) in Relevanzreihenfolge.
+        """
+
+        self.listview.DeleteAllItems()
+        self.treffer_ids = []
+        for entry_id, date, day_of_week, time, ausschnitt in treffer:
+            index = self.listview.InsertItem(self.listview.GetItemCount(), date)
+            self.listview.SetItem(index, 1, day_of_week)
+            self.listview.SetItem(index, 2, time)
+            self.listview.SetItem(index, 3, ausschnitt.replace("\n", " "))
+            self.treffer_ids.append(entry_id)
+        self.status_label.SetLabel(f"{len(treffer)} Treffer")
+
+    def on_item_activated(self, event):
+        """Zeigt den vollständigen Eintrag eines Treffers an."""
+
+        self.show_entry_contents(event.GetIndex())
+
+    def show_entry_contents(self, index):
+        """Öffnet ein Fenster mit dem vollständigen Inhalt des Treffers an der angegebenen Position."""
+
+        if index < 0 or index >= len(self.treffer_ids):
+            return
+
+        try:
+            eintrag = eintraege.lade(self.db_conn, self.treffer_ids[index])
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Fehler beim Laden des Eintrags: {str(e)}", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        if eintrag is None:
+            wx.MessageBox("Eintrag nicht gefunden.", "Fehler", wx.OK | wx.ICON_ERROR)
+            return
+
+        dialog = EntryContentDialog(self, title="Eintrag anzeigen", content=eintrag.inhalt())
+        dialog.Show()
+
+    def on_key_pressed(self, event):
+        """Behandelt das Tastaturereignis für das Dialogfenster."""
+
+        if event.GetKeyCode() == wx.WXK_ESCAPE:
+            # ESC-Taste zum Schließen des Dialogfensters
+            self.Close()
+        else:
+            event.Skip()  # Weitergabe des Ereignisses an das Standardverhalten
+
+    def on_destroy(self, event):
+        """Bricht eine laufende Suche beim Schließen ab."""
+
+        if event.GetEventObject() is self:
+            if self.verzoegerung is not None:
+                self.verzoegerung.Stop()
+            if self.auftrag is not None:
+                self.worker.abbrechen(self.auftrag)
+                self.auftrag = None
+        event.Skip()
@@ -0,0 +1,7 @@
+# tests/__init__.py
+"""
+Tests für die Datenbankpfade der Kalenderanwendung.
+
+Die Tests laufen wie die Benchmarks ohne wxPython und werden aus dem Verzeichnis
+`pyKalender` gestartet, z. B. `python -m unittest discover tests`.
+"""
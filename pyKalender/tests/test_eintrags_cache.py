@@ -0,0 +1,127 @@
+# tests/test_eintrags_cache.py
+"""
+Prüft das Nachführen der geladenen Seiten von `EintragsCache` nach Änderungen.
+
+Nach jeder Änderung müssen die geladenen Seiten genau den Zeilen entsprechen, die eine neue
+Abfrage an derselben Position liefert.
+"""
+
+import random
+import sqlite3
+import unittest
+
+import datenbank
+from benchmark.daten import zeilen
+from eintrags_cache import EintragsCache
+
+
+class KleinerCache(EintragsCache):
+    """Ein Cache mit kleinen Seiten, damit Änderungen oft über Seitengrenzen rutschen."""
+
+    SEITENGROESSE = 5
+    MAX_SEITEN = 4
+
+
+def _datenbank(anzahl, seed=1):
+    """Legt eine migrierte Datenbank im Speicher mit `anzahl` zufälligen Einträgen an."""
+
+    db_conn = sqlite3.connect(":memory:")
+    db_conn.execute("CREATE TABLE Entries (ID INTEGER PRIMARY KEY AUTOINCREMENT, Date TEXT, DayOfWeek TEXT, Time TEXT, AdditionalInfo TEXT)")
+    db_conn.executemany("INSERT INTO Entries (Date, DayOfWeek, Time, AdditionalInfo) VALUES (?, ?, ?, ?)",
+                        zeilen(anzahl, seed))
+    db_conn.commit()
+    datenbank.migriere_schema(db_conn)
+    return db_conn
+
+
+class EintragsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db_conn = _datenbank(40)
+
+    def tearDown(self):
+        self.db_conn.close()
+
+    def erwartet(self, cache):
+        """Liefert alle Zeilen der Liste aus einer neuen Abfrage."""
+
+        neu = KleinerCache(self.db_conn, cache.ab_datum)
+        return [neu.zeile(index) for index in range(neu.anzahl)]
+
+    def pruefe_seiten(self, cache):
+        """Vergleicht die geladenen Seiten, ohne weitere Seiten nachzuladen."""
+
+        erwartet = self.erwartet(cache)
+        self.assertEqual(cache.anzahl, len(erwartet))
+        groesse = cache.SEITENGROESSE
+        for seite, inhalt in cache.seiten.items():
+            self.assertTrue(inhalt, f"leere Seite {seite}")
+            self.assertEqual(inhalt, erwartet[seite * groesse:seite * groesse + len(inhalt)], f"Seite {seite}")
+            self.assertTrue(len(inhalt) == groesse or seite * groesse + len(inhalt) == cache.anzahl,
+                            f"Seite {seite} ist unvollständig")
+        for seite, anker in cache.anker.items():
+            self.assertEqual(anker, erwartet[seite * groesse + groesse - 1][:cache.laenge], f"Anker {seite}")
+
+    def einfuegen(self, cache, datum, zeit):
+        cursor = self.db_conn.execute(
+            "INSERT INTO Entries (Date, DayOfWeek, Time, AdditionalInfo) VALUES (?, '', ?, 'neu')", (datum, zeit))
+        cache.einfuegen(cache.lade_zeile(cursor.lastrowid))
+
+    def schluessel(self, entry_id):
+        return self.db_conn.execute("SELECT DateKey, TimeKey, ID FROM Entries WHERE ID = ?", (entry_id,)).fetchone()
+
+    def loeschen(self, cache, entry_id):
+        alter_schluessel = self.schluessel(entry_id)
+        self.db_conn.execute("DELETE FROM Entries WHERE ID = ?", (entry_id,))
+        cache.entferne(alter_schluessel)
+
+    def aendern(self, cache, entry_id, datum, zeit):
+        alter_schluessel = self.schluessel(entry_id)
+        self.db_conn.execute("UPDATE Entries SET Date = ?, Time = ? WHERE ID = ?", (datum, zeit, entry_id))
+        cache.entferne(alter_schluessel)
+        cache.einfuegen(cache.lade_zeile(entry_id))
+
+    def test_einfuegen_und_loeschen_auf_voller_letzter_seite(self):
+        self.db_conn.execute("DELETE FROM Entries WHERE ID > 5")
+        cache = KleinerCache(self.db_conn)
+        cache.zeile(0)
+        erste = cache.zeile(0)
+        self.einfuegen(cache, "01.01.1990", "00:30")
+        self.loeschen(cache, erste[2])
+        self.pruefe_seiten(cache)
+        self.assertEqual([cache.zeile(index) for index in range(cache.anzahl)], self.erwartet(cache))
+
+    def test_anfuegen_nur_an_die_letzte_seite(self):
+        cache = KleinerCache(self.db_conn)
+        for index in range(0, cache.anzahl, cache.SEITENGROESSE):
+            cache.zeile(index)
+        letzte = cache.zeile(cache.anzahl - 1)
+        self.loeschen(cache, letzte[2])
+        self.einfuegen(cache, "31.12.2099", "23:00")
+        self.einfuegen(cache, "31.12.2099", "23:30")
+        self.pruefe_seiten(cache)
+
+    def test_zufaellige_aenderungen(self):
+        for durchlauf in range(300):
+            rnd = random.Random(durchlauf)
+            ab_datum = rnd.choice([None, "2024-06-01"])
+            cache = KleinerCache(self.db_conn, ab_datum)
+            for _ in range(30):
+                aktion = rnd.random()
+                ids = [zeile[0] for zeile in self.db_conn.execute("SELECT ID FROM Entries")]
+                datum = f"{rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}.{rnd.choice([2023, 2024, 2025])}"
+                zeit = f"{rnd.randrange(24):02d}:{rnd.randrange(0, 60, 15):02d}"
+                if aktion < 0.3 and cache.anzahl:
+                    cache.zeile(rnd.randrange(cache.anzahl))
+                elif aktion < 0.55 or len(ids) < 5:
+                    self.einfuegen(cache, datum, zeit)
+                elif aktion < 0.8:
+                    self.loeschen(cache, rnd.choice(ids))
+                else:
+                    self.aendern(cache, rnd.choice(ids), datum, zeit)
+                self.pruefe_seiten(cache)
+            self.assertEqual([cache.zeile(index) for index in range(cache.anzahl)], self.erwartet(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,459 @@
+# wiederholungen.py
+"""
+Dieses Modul verwaltet Serientermine (täglich, wöchentlich, monatlich, jährlich); es hängt
+nicht von wx ab.
+
+Eine Serie wird einmal als Regel in der Tabelle `Recurrences` gespeichert, einzelne
+ausgelassene Termine in `RecurrenceExceptions`. Die Vorkommen werden nie in `Entries`
+geschrieben, sondern von `termine` bzw. `vorkommen` erst beim Anzeigen und nur für den
+angefragten Zeitraum erzeugt. Speicherbedarf und Ladezeit wachsen damit nicht mit der Zahl
+der Wiederholungen:
+
+- Tägliche und wöchentliche Serien springen rechnerisch zum ersten Termin im Zeitraum.
+- Monatliche und jährliche Serien überspringen Monate ohne passenden Tag (z. B. den 31.
+  im April oder den 29. Februar außerhalb von Schaltjahren), wie in iCalendar.
+- Eine Höchstzahl von Terminen (`Count`) zählt ausgelassene Termine mit; bei Serien mit
+  Anzahl wird das Datum des letzten Termins als `UntilKey` gespeichert, sodass die
+  Bereichsabfrage beendete Serien gar nicht erst lädt.
+
+Änderungen werden wie bei `eintraege` in einer Transaktion geschrieben und danach als
+`aenderungen.WIEDERHOLUNGEN` gemeldet.
+"""
+
+import datetime
+import heapq
+from collections import deque
+
+import aenderungen
+import eintraege
+
+TAEGLICH = "DAILY"
+WOECHENTLICH = "WEEKLY"
+MONATLICH = "MONTHLY"
+JAEHRLICH = "YEARLY"
+
+# Frequenz -> (Bezeichnung, Einheit im Plural)
+FREQUENZEN = {
+    TAEGLICH: ("Täglich", "Tage"),
+    WOECHENTLICH: ("Wöchentlich", "Wochen"),
+    MONATLICH: ("Monatlich", "Monate"),
+    JAEHRLICH: ("Jährlich", "Jahre"),
+}
+
+# Höchstzahl der Termine einer Serie mit Anzahl; `anlegen` berechnet den letzten Termin
+# durch Aufzählen, und eine so lange Serie ist praktisch eine Serie ohne Ende
+MAX_ANZAHL = 10000
+
+# Wird in Ansichten vor Serientermine gesetzt, um sie von einzelnen Einträgen zu unterscheiden
+KENNZEICHEN = "\u21bb"
+
+_SPALTEN = "ID, Frequency, Interval, StartKey, UntilKey, Count, Time, AdditionalInfo"
+
+_REGEL = f"SELECT {_SPALTEN} FROM Recurrences WHERE ID = ?"
+_REGELN_IM_ZEITRAUM = (
+    f"SELECT {_SPALTEN} FROM Recurrences "
+    "WHERE StartKey <= ? AND (UntilKey IS NULL OR UntilKey >= ?) ORDER BY ID"
+)
+_AUSNAHMEN_IM_ZEITRAUM = "SELECT RecurrenceID, DateKey FROM RecurrenceExceptions WHERE DateKey BETWEEN ? AND ?"
+_EINFUEGEN = (
+    "INSERT INTO Recurrences (Frequency, Interval, StartKey, UntilKey, Count, Time, AdditionalInfo) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_AUSNAHME_EINFUEGEN = "INSERT OR IGNORE INTO RecurrenceExceptions (RecurrenceID, DateKey) VALUES (?, ?)"
+_LOESCHEN = "DELETE FROM Recurrences WHERE ID = ?"
+
+
+def zeit_schluessel(time):
+    """
+    Wandelt eine Uhrzeit "H:MM" wie der Trigger für `Entries.TimeKey` in Minuten um.
+
+    Args:
+        time (str): Die Uhrzeit.
+
+    Returns:
+        int: Die Minuten seit Mitternacht; -1 bei ungültiger Uhrzeit.
+    """
+
+    stunden, trenner, minuten = (time or "").partition(":")
+    try:
+        return int(stunden) * 60 + int(minuten) if trenner else -1
+    except ValueError:
+        return -1
+
+
+class Regel:
+    """
+    Eine Wiederholungsregel der Tabelle `Recurrences`.
+
+    Attributes:
+        regel_id (int): Die ID der Regel.
+        frequenz (str): TAEGLICH, WOECHENTLICH, MONATLICH oder JAEHRLICH.
+        intervall (int): Der Abstand in Einheiten der Frequenz, z. B. 2 für alle zwei Wochen.
+        beginn (datetime.date): Der erste Termin.
+        ende (datetime.date): Der letzte mögliche Termin oder None.
+        anzahl (int): Die Höchstzahl der Termine oder None.
+        time (str): Die Uhrzeit im Format "HH:MM".
+        additional_info (str): Die zusätzlichen Informationen.
+        time_key (int): Die Minuten seit Mitternacht; -1 bei ungültiger Uhrzeit.
+        ausnahmen (set): ISO-Daten der ausgelassenen Termine im geladenen Zeitraum.
+    """
+
+    __slots__ = ("regel_id", "frequenz", "intervall", "beginn", "ende", "anzahl", "time",
+                 "additional_info", "time_key", "ausnahmen")
+
+    def __init__(self, regel_id, frequenz, intervall, beginn, ende, anzahl, time, additional_info, ausnahmen=()):
+        self.regel_id = regel_id
+        self.frequenz = frequenz
+        self.intervall = intervall
+        self.beginn = beginn
+        self.ende = ende
+        self.anzahl = anzahl
+        self.time = time
+        self.additional_info = additional_info
+        self.time_key = zeit_schluessel(time)
+        self.ausnahmen = set(ausnahmen)
+
+    @classmethod
+    def aus_zeile(cls, zeile):
+        """Erzeugt eine Regel aus einer Zeile mit den Spalten `_SPALTEN`."""
+
+        regel_id, frequenz, intervall, start_key, until_key, anzahl, time, additional_info = zeile
+        return cls(regel_id, frequenz, intervall, datetime.date.fromisoformat(start_key),
+                   datetime.date.fromisoformat(until_key) if until_key else None, anzahl, time, additional_info)
+
+    def __repr__(self):
+        return f"Regel({self.regel_id}, {self.frequenz!r}, {self.beginn.isoformat()!r})"
+
+    def beschreibung(self):
+        """Liefert die Regel als Text, z. B. "Alle 2 Wochen, bis 31.12.2026"."""
+
+        bezeichnung, einheiten = FREQUENZEN[self.frequenz]
+        if self.intervall == 1:
+            text = bezeichnung
+        else:
+            text = f"Alle {self.intervall} {einheiten}"
+        if self.anzahl is not None:
+            text += f", {self.anzahl} Termine"
+        elif self.ende is not None:
+            text += f", bis {eintraege.datum_text(self.ende)}"
+        return text
+
+
+class Vorkommen:
+    """
+    Ein einzelner Termin einer Serie; wird nur für die Anzeige erzeugt.
+
+    Die Attribute entsprechen denen von `eintraege.Eintrag`, sodass Ansichten beide gleich
+    darstellen können.
+    """
+
+    __slots__ = ("regel", "datum")
+
+    def __init__(self, regel, datum):
+        self.regel = regel
+        self.datum = datum
+
+    def __repr__(self):
+        return f"Vorkommen({self.regel.regel_id}, {self.datum.isoformat()!r})"
+
+    @property
+    def date(self):
+        """str: Das Datum im Format "TT.MM.JJJJ"."""
+
+        return eintraege.datum_text(self.datum)
+
+    @property
+    def day_of_week(self):
+        """str: Der Wochentag."""
+
+        return eintraege.WOCHENTAGE[self.datum.weekday()]
+
+    @property
+    def time(self):
+        """str: Die Uhrzeit der Serie."""
+
+        return self.regel.time
+
+    @property
+    def additional_info(self):
+        """str: Die zusätzlichen Informationen der Serie."""
+
+        return self.regel.additional_info
+
+    @property
+    def date_key(self):
+        """str: Das ISO-Datum."""
+
+        return self.datum.isoformat()
+
+    @property
+    def time_key(self):
+        """int: Die Minuten seit Mitternacht."""
+
+        return self.regel.time_key
+
+    def inhalt(self):
+        """Liefert den Termin als Text für die Anzeige, mit der Regel in der dritten Zeile."""
+
+        return f"{self.date}\n{self.day_of_week}, {self.time}\n{self.regel.beschreibung()}\n\n{self.additional_info}"
+
+
+def _monate(regel):
+    """Liefert die Anzahl der Monate zwischen zwei Terminen einer monatlichen oder jährlichen Serie."""
+
+    return regel.intervall * (12 if regel.frequenz == JAEHRLICH else 1)
+
+
+def termine(regel, von, bis):
+    """
+    Erzeugt die Termine einer Serie in einem Zeitraum.
+
+    Der Generator berechnet nur Termine ab `von`; bei Serien ohne Anzahl und bei täglichen und
+    wöchentlichen Serien wird dorthin gesprungen, statt ab dem Beginn zu zählen.
+
+    Args:
+        regel (Regel): Die Regel mit den Ausnahmen des Zeitraums.
+        von (datetime.date): Der erste Tag des Zeitraums.
+        bis (datetime.date): Der letzte Tag des Zeitraums.
+
+    Yields:
+        datetime.date: Die Termine in aufsteigender Reihenfolge ohne ausgelassene Termine.
+    """
+
+    ende = bis if regel.ende is None else min(bis, regel.ende)
+    if ende < regel.beginn or ende < von:
+        return
+
+    if regel.frequenz in (TAEGLICH, WOECHENTLICH):
+        schritt = regel.intervall * (7 if regel.frequenz == WOECHENTLICH else 1)
+        # Aufrunden: erster Termin am oder nach `von`
+        nummer = max(0, -(-(von - regel.beginn).days // schritt))
+        # Letzter Tag, der sich vom Beginn aus noch darstellen lässt (wie MAXYEAR unten)
+        max_tage = (datetime.date.max - regel.beginn).days
+        while regel.anzahl is None or nummer < regel.anzahl:
+            if nummer * schritt > max_tage:
+                return
+            datum = regel.beginn + datetime.timedelta(days=nummer * schritt)
+            if datum > ende:
+                return
+            if datum.isoformat() not in regel.ausnahmen:
+                yield datum
+            nummer += 1
+        return
+
+    schritt = _monate(regel)
+    erster_monat = regel.beginn.year * 12 + regel.beginn.month - 1
+    nummer = 0
+    if regel.anzahl is None:
+        # Ohne Anzahl muss nicht gezählt werden, welche Monate einen passenden Tag haben
+        nummer = max(0, -(-(von.year * 12 + von.month - 1 - erster_monat) // schritt))
+    gezaehlt = 0
+    while regel.anzahl is None or gezaehlt < regel.anzahl:
+        jahr, monat = divmod(erster_monat + nummer * schritt, 12)
+        monat += 1
+        nummer += 1
+        if jahr > datetime.MAXYEAR or datetime.date(jahr, monat, 1) > ende:
+            return
+        if regel.beginn.day > eintraege.tage_im_monat(jahr, monat):
+            # Monat ohne diesen Tag: kein Termin, zählt auch nicht zur Anzahl
+            continue
+        gezaehlt += 1
+        datum = datetime.date(jahr, monat, regel.beginn.day)
+        if datum > ende:
+            return
+        if datum >= von and datum.isoformat() not in regel.ausnahmen:
+            yield datum
+
+
+def lade(db_conn, regel_id):
+    """
+    Lädt eine Regel über ihre ID, ohne Ausnahmen.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        regel_id (int): Die ID der Regel.
+
+    Returns:
+        Regel: Die Regel oder None, wenn es sie nicht gibt.
+
+    Raises:
+        sqlite3.Error: Wenn das Lesen fehlschlägt.
+    """
+
+    zeile = db_conn.execute(_REGEL, (regel_id,)).fetchone()
+    return Regel.aus_zeile(zeile) if zeile is not None else None
+
+
+def lade_regeln(db_conn, von, bis):
+    """
+    Lädt alle Regeln, die im Zeitraum Termine haben können, samt ihren Ausnahmen im Zeitraum.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        von (datetime.date): Der erste Tag des Zeitraums.
+        bis (datetime.date): Der letzte Tag des Zeitraums.
+
+    Returns:
+        list: Die Regeln als `Regel`.
+
+    Raises:
+        sqlite3.Error: Wenn das Lesen fehlschlägt.
+    """
+
+    cursor = db_conn.cursor()
+    cursor.execute(_REGELN_IM_ZEITRAUM, (bis.isoformat(), von.isoformat()))
+    regeln = {zeile[0]: Regel.aus_zeile(zeile) for zeile in cursor.fetchall()}
+    if regeln:
+        cursor.execute(_AUSNAHMEN_IM_ZEITRAUM, (von.isoformat(), bis.isoformat()))
+        for regel_id, datum_schluessel in cursor.fetchall():
+            if regel_id in regeln:
+                regeln[regel_id].ausnahmen.add(datum_schluessel)
+    cursor.close()
+    return list(regeln.values())
+
+
+def _vorkommen_der_regel(regel, von, bis):
+    """Erzeugt die Vorkommen einer einzelnen Regel."""
+
+    for datum in termine(regel, von, bis):
+        yield Vorkommen(regel, datum)
+
+
+def vorkommen(db_conn, von, bis):
+    """
+    Erzeugt die Termine aller Serien in einem Zeitraum.
+
+    Die Regeln werden beim Aufruf mit einer Abfrage geladen; die Termine entstehen erst beim
+    Durchlaufen des Generators.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        von (datetime.date): Der erste Tag des Zeitraums.
+        bis (datetime.date): Der letzte Tag des Zeitraums.
+
+    Returns:
+        iterator: `Vorkommen` sortiert nach Datum, Uhrzeit und Regel.
+
+    Raises:
+        sqlite3.Error: Wenn das Lesen der Regeln fehlschlägt.
+    """
+
+    return heapq.merge(*(_vorkommen_der_regel(regel, von, bis) for regel in lade_regeln(db_conn, von, bis)),
+                       key=lambda termin: (termin.datum, termin.regel.time_key, termin.regel.regel_id))
+
+
+def tageszaehler(db_conn, von, bis):
+    """
+    Zählt die Termine aller Serien je Tag eines Zeitraums.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        von (datetime.date): Der erste Tag des Zeitraums.
+        bis (datetime.date): Der letzte Tag des Zeitraums.
+
+    Returns:
+        dict: ISO-Datum -> Anzahl der Termine; Tage ohne Termine fehlen.
+    """
+
+    zaehler = {}
+    for regel in lade_regeln(db_conn, von, bis):
+        for datum in termine(regel, von, bis):
+            schluessel = datum.isoformat()
+            zaehler[schluessel] = zaehler.get(schluessel, 0) + 1
+    return zaehler
+
+
+def anlegen(db_conn, frequenz, beginn, time, additional_info, intervall=1, ende=None, anzahl=None):
+    """
+    Legt eine Serie an und meldet die Änderung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        frequenz (str): TAEGLICH, WOECHENTLICH, MONATLICH oder JAEHRLICH.
+        beginn (datetime.date): Der erste Termin.
+        time (str): Die Uhrzeit im Format "HH:MM".
+        additional_info (str): Die zusätzlichen Informationen.
+        intervall (int): Der Abstand in Einheiten der Frequenz.
+        ende (datetime.date): Der letzte mögliche Termin oder None.
+        anzahl (int): Die Höchstzahl der Termine oder None.
+
+    Returns:
+        int: Die ID der neuen Regel.
+
+    Raises:
+        ValueError: Bei unbekannter Frequenz, Intervall oder Anzahl kleiner 1, einer Anzahl
+            über `MAX_ANZAHL` oder einem Ende vor dem Beginn.
+        sqlite3.Error: Wenn das Einfügen fehlschlägt.
+    """
+
+    if frequenz not in FREQUENZEN:
+        raise ValueError(f"Unbekannte Wiederholung: '{frequenz}'")
+    if intervall < 1:
+        raise ValueError("Das Intervall muss mindestens 1 sein")
+    if anzahl is not None and anzahl < 1:
+        raise ValueError("Die Anzahl der Termine muss mindestens 1 sein")
+    if anzahl is not None and anzahl > MAX_ANZAHL:
+        raise ValueError(f"Die Anzahl der Termine darf höchstens {MAX_ANZAHL} sein; ohne Anzahl läuft die Serie unbegrenzt")
+    if ende is not None and ende < beginn:
+        raise ValueError("Das Ende der Serie liegt vor ihrem Beginn")
+
+    if anzahl is not None:
+        # Letzten Termin als Ende speichern, damit die Bereichsabfrage die Serie danach auslässt
+        regel = Regel(None, frequenz, intervall, beginn, ende, anzahl, time, additional_info)
+        letzter = deque(termine(regel, beginn, ende or datetime.date.max), maxlen=1)
+        if letzter:
+            ende = letzter[0]
+
+    with eintraege.transaktion(db_conn):
+        regel_id = db_conn.execute(_EINFUEGEN, (
+            frequenz, intervall, beginn.isoformat(), ende.isoformat() if ende is not None else None,
+            anzahl, time, additional_info,
+        )).lastrowid
+        eintraege.melde(db_conn, aenderungen.WIEDERHOLUNGEN, None)
+    return regel_id
+
+
+def ausnahme_hinzufuegen(db_conn, regel_id, datum):
+    """
+    Lässt einen einzelnen Termin einer Serie aus und meldet die Änderung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        regel_id (int): Die ID der Regel.
+        datum (datetime.date): Der auszulassende Termin.
+
+    Returns:
+        bool: False, wenn es keine Regel mit dieser ID gab.
+
+    Raises:
+        sqlite3.Error: Wenn das Schreiben fehlschlägt.
+    """
+
+    with eintraege.transaktion(db_conn):
+        if db_conn.execute(_REGEL, (regel_id,)).fetchone() is None:
+            return False
+        db_conn.execute(_AUSNAHME_EINFUEGEN, (regel_id, datum.isoformat()))
+        eintraege.melde(db_conn, aenderungen.WIEDERHOLUNGEN, None)
+    return True
+
+
+def loeschen(db_conn, regel_id):
+    """
+    Löscht eine Serie samt Ausnahmen und meldet die Änderung.
+
+    Args:
+        db_conn (sqlite3.Connection): Die SQLite-Datenbankverbindung.
+        regel_id (int): Die ID der Regel.
+
+    Returns:
+        bool: False, wenn es keine Regel mit dieser ID gab.
+
+    Raises:
+        sqlite3.Error: Wenn das Löschen fehlschlägt.
+    """
+
+    with eintraege.transaktion(db_conn):
+        if db_conn.execute(_LOESCHEN, (regel_id,)).rowcount == 0:
+            return False
+        eintraege.melde(db_conn, aenderungen.WIEDERHOLUNGEN, None)
+    return True